@@ -0,0 +1,174 @@
+"""
+PERFORMANCE ANALYTICS MODULE
+============================
+Batched performance metrics over many equity curves at once.
+
+Inputs are (bars x curves) panels, like the panels in panel_indicators.py:
+wide DataFrames with one column per curve, or 2D NumPy arrays (a 1D array
+is a single curve). Curves of different lengths are NaN-padded. Every metric
+is computed for all curves in one vectorized pass; results come back as a
+DataFrame indexed by the input's columns, or a dict of 1D arrays for array
+inputs.
+
+Internally curves are laid out one per row so each curve is reduced along
+contiguous memory; a curve's metrics therefore do not depend on which other
+curves share its batch.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Tuple, Union
+
+Panel = Union[pd.DataFrame, np.ndarray]
+
+TRADING_DAYS = 252
+
+EQUITY_METRICS = ['total_return_pct', 'max_drawdown', 'max_drawdown_pct', 'sharpe_ratio', 'sortino_ratio']
+TRADE_METRICS = [
+    'total_trades', 'winning_trades', 'losing_trades', 'win_rate', 'profit_factor', 'avg_trade_pnl',
+    'avg_winning_trade', 'avg_losing_trade', 'largest_win', 'largest_loss'
+]
+
+
+def _rows(panel: Panel) -> np.ndarray:
+    """(curves x bars) C-contiguous float copy of a (bars x curves) panel."""
+    values = panel.to_numpy(dtype=float) if isinstance(panel, pd.DataFrame) else np.asarray(panel, dtype=float)
+    if values.ndim == 1:
+        values = values[:, None]
+    return np.ascontiguousarray(values.T)
+
+
+def _out(metrics: Dict[str, np.ndarray], panel: Panel):
+    """Return metrics in the caller's input form."""
+    if isinstance(panel, pd.DataFrame):
+        return pd.DataFrame(metrics, index=panel.columns)
+    return metrics
+
+
+def _sum(values: np.ndarray) -> np.ndarray:
+    """Per-row sum, added strictly left to right so that zero padding never changes it."""
+    if values.shape[1] == 0:
+        return np.zeros(len(values))
+    return np.cumsum(values, axis=1)[:, -1]
+
+
+def _mean_std(values: np.ndarray, valid: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Per-row count, mean and sample standard deviation of the valid entries."""
+    count = valid.sum(axis=1)
+    with np.errstate(invalid='ignore', divide='ignore'):
+        mean = _sum(np.where(valid, values, 0.0)) / count
+        deviation = np.where(valid, values - mean[:, None], 0.0)
+        std = np.sqrt(_sum(deviation * deviation) / (count - 1))
+    return count, mean, std
+
+
+def drawdown_panel(equity: Panel) -> Tuple[Panel, Panel]:
+    """
+    Drawdown of every curve from its running peak.
+
+    Returns:
+        (drawdown in currency, drawdown in %) panels shaped like equity
+    """
+    rows = _rows(equity)
+    peak = np.fmax.accumulate(rows, axis=1)
+    drawdown = rows - peak
+    drawdown_pct = (drawdown / peak) * 100
+    if isinstance(equity, pd.DataFrame):
+        return (pd.DataFrame(drawdown.T, index=equity.index, columns=equity.columns),
+                pd.DataFrame(drawdown_pct.T, index=equity.index, columns=equity.columns))
+    if np.ndim(equity) == 1:
+        return drawdown[0], drawdown_pct[0]
+    return drawdown.T, drawdown_pct.T
+
+
+def equity_metrics(equity: Panel, periods_per_year: int = TRADING_DAYS):
+    """
+    Return and risk metrics of every equity curve.
+
+    Sharpe and Sortino are annualized from per-bar returns with a zero risk-free
+    rate; Sortino divides by the standard deviation of the negative returns.
+    Both are 0 when their deviation is 0 or undefined.
+
+    Args:
+        equity: (bars x curves) portfolio values, NaN-padded
+        periods_per_year: Bars per year used to annualize
+
+    Returns:
+        EQUITY_METRICS per curve
+    """
+    rows = _rows(equity)
+    peak = np.fmax.accumulate(rows, axis=1)
+    drawdown = rows - peak
+    with np.errstate(invalid='ignore', divide='ignore'):
+        drawdown_pct = (drawdown / peak) * 100
+        returns = rows[:, 1:] / rows[:, :-1] - 1
+
+    valid = ~np.isnan(returns)
+    count, mean, std = _mean_std(returns, valid)
+    negative = valid & (returns < 0)
+    negative_count, _, downside = _mean_std(returns, negative)
+    scale = np.sqrt(periods_per_year)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        sharpe = np.where((count > 0) & (std > 0), mean / std * scale, 0.0)
+        sortino = np.where((negative_count > 0) & (downside > 0), mean / downside * scale, 0.0)
+
+    finite = ~np.isnan(rows)
+    first = rows[np.arange(len(rows)), finite.argmax(axis=1)]
+    last = rows[np.arange(len(rows)), rows.shape[1] - 1 - finite[:, ::-1].argmax(axis=1)]
+
+    return _out({
+        'total_return_pct': (last / first - 1) * 100,
+        'max_drawdown': np.fmin.reduce(drawdown, axis=1),
+        'max_drawdown_pct': np.fmin.reduce(drawdown_pct, axis=1),
+        'sharpe_ratio': sharpe,
+        'sortino_ratio': sortino,
+    }, equity)
+
+
+def trade_metrics(pnls: Panel):
+    """
+    Trade statistics of every curve's closed trades.
+
+    Follows the backtest report conventions: profit factor is gross profit over
+    gross loss, with a gross loss of 1 when no trade lost; averages and extremes
+    are 0 when there is nothing to average.
+
+    Args:
+        pnls: (trades x curves) trade PnL, NaN-padded
+
+    Returns:
+        TRADE_METRICS per curve
+    """
+    rows = _rows(pnls)
+    valid = ~np.isnan(rows)
+    wins = valid & (rows > 0)
+    losses = valid & (rows < 0)
+    total, winning, losing = valid.sum(axis=1), wins.sum(axis=1), losses.sum(axis=1)
+
+    gross_profit = _sum(np.where(wins, rows, 0.0))
+    gross_loss = np.where(losing > 0, np.abs(_sum(np.where(losses, rows, 0.0))), 1.0)
+
+    with np.errstate(invalid='ignore', divide='ignore'):
+        metrics = {
+            'total_trades': total,
+            'winning_trades': winning,
+            'losing_trades': losing,
+            'win_rate': np.where(total > 0, winning / total * 100, 0.0),
+            'profit_factor': np.where(gross_loss > 0, gross_profit / gross_loss, 0.0),
+            'avg_trade_pnl': np.where(total > 0, _sum(np.where(valid, rows, 0.0)) / total, 0.0),
+            'avg_winning_trade': np.where(winning > 0, gross_profit / winning, 0.0),
+            'avg_losing_trade': np.where(losing > 0, _sum(np.where(losses, rows, 0.0)) / losing, 0.0),
+            'largest_win': np.where(total > 0, np.fmax.reduce(rows, axis=1, initial=-np.inf), 0.0),
+            'largest_loss': np.where(total > 0, np.fmin.reduce(rows, axis=1, initial=np.inf), 0.0),
+        }
+    return _out(metrics, pnls)
+
+
+def pad_columns(series) -> np.ndarray:
+    """(max length x n) array of 1D arrays, NaN-padded at the end."""
+    series = [np.asarray(s, dtype=float) for s in series]
+    panel = np.full((max((len(s) for s in series), default=0), len(series)), np.nan)
+    for j, s in enumerate(series):
+        panel[:len(s), j] = s
+    return panel
@@ -11,7 +11,6 @@ UPDATES:
 """
 
 import streamlit as st
-import yfinance as yf
 import pandas as pd
 import numpy as np
 import json
@@ -26,9 +25,18 @@ import plotly.graph_objects as go
 from plotly.subplots import make_subplots
 
 from nifty500_stocks import NIFTY_500_STOCKS, get_all_stocks, get_all_sectors, search_stocks
-from indicators import calculate_all_metrics, calculate_rsi, calculate_macd, calculate_bollinger_bands
-from backtesting import BacktestEngine, AVAILABLE_STRATEGIES
+from indicators import MetricContext, calculate_all_metrics, calculate_rsi, calculate_macd, calculate_bollinger_bands
+from backtesting import BacktestEngine, BacktestResult, AVAILABLE_STRATEGIES
 from system_prompt import SYSTEM_INSTRUCTION
+from screener_engine import run_pipeline, PipelineStats
+from market_data import DEFAULT_CHUNK_SIZE
+from ohlcv_store import get_default_store
+from data_providers import get_provider
+from history_cache import get_history_cache
+from nse_calendar import cache_epoch
+from singleflight import get_default_group
+from backtest_jobs import get_job_manager
+from result_cache import get_result_cache
 
 # =============================================================================
 # CONFIG
@@ -135,7 +143,7 @@ st.markdown("""
 """, unsafe_allow_html=True)
 
 # Session state
-for key in ['watchlist', 'backtest_results', 'groq_api_key', 'gemini_api_key', 'selected_model', 'screener_results', 'agentic_backtest']:
+for key in ['watchlist', 'backtest_results', 'groq_api_key', 'gemini_api_key', 'selected_model', 'screener_results', 'agentic_backtest', 'backtest_job']:
     if key not in st.session_state:
         if key in ['watchlist', 'backtest_results']:
             st.session_state[key] = []
@@ -150,8 +158,16 @@ if 'selected_model' not in st.session_state:
 # =============================================================================
 # MARKET DATA - PROPERLY STRUCTURED
 # =============================================================================
-@st.cache_data(ttl=300)
 def fetch_market_regime_data() -> Dict[str, Any]:
+    """Fetch market-wide data, recomputed only when a new bar could exist."""
+    return _fetch_market_regime_data(cache_epoch(intraday_ttl=300))
+
+@st.cache_data(max_entries=4)
+def _fetch_market_regime_data(epoch: str) -> Dict[str, Any]:
+    """Fetch market-wide data, shared by sessions that miss the cache together."""
+    return get_default_group().do(('market_regime', epoch), _compute_market_regime_data)
+
+def _compute_market_regime_data() -> Dict[str, Any]:
     """Fetch market-wide data for regime classification."""
     data = {
         'india_vix': None,
@@ -161,39 +177,37 @@ def fetch_market_regime_data() -> Dict[str, Any]:
     }
     
     try:
+        # Market breadth from Nifty 50 components
+        sample = ['RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS', 'ICICIBANK.NS',
+                 'SBIN.NS', 'BHARTIARTL.NS', 'ITC.NS', 'KOTAKBANK.NS', 'LT.NS',
+                 'HINDUNILVR.NS', 'BAJFINANCE.NS', 'AXISBANK.NS', 'MARUTI.NS', 'TITAN.NS']
+        
+        # One batched download for VIX, Nifty and the breadth sample
+        frames = load_history(["^INDIAVIX", "^NSEI"] + sample, period="5d")
+        
         # India VIX
-        vix = yf.Ticker("^INDIAVIX")
-        vix_hist = vix.history(period="5d")
-        if not vix_hist.empty:
+        vix_hist = frames.get("^INDIAVIX")
+        if vix_hist is not None and not vix_hist.empty:
             data['india_vix'] = round(vix_hist['Close'].iloc[-1], 2)
         
         # Nifty 50
-        nifty = yf.Ticker("^NSEI")
-        nifty_hist = nifty.history(period="5d")
-        if not nifty_hist.empty:
+        nifty_hist = frames.get("^NSEI")
+        if nifty_hist is not None and not nifty_hist.empty:
             data['nifty_level'] = round(nifty_hist['Close'].iloc[-1], 2)
             if len(nifty_hist) >= 2:
                 data['nifty_change'] = round(
                     ((nifty_hist['Close'].iloc[-1] / nifty_hist['Close'].iloc[-2]) - 1) * 100, 2
                 )
         
-        # Market breadth from Nifty 50 components
         advances = 0
         declines = 0
-        sample = ['RELIANCE.NS', 'TCS.NS', 'HDFCBANK.NS', 'INFY.NS', 'ICICIBANK.NS',
-                 'SBIN.NS', 'BHARTIARTL.NS', 'ITC.NS', 'KOTAKBANK.NS', 'LT.NS',
-                 'HINDUNILVR.NS', 'BAJFINANCE.NS', 'AXISBANK.NS', 'MARUTI.NS', 'TITAN.NS']
-        
         for ticker in sample:
-            try:
-                hist = yf.Ticker(ticker).history(period="2d")
-                if len(hist) >= 2:
-                    if hist['Close'].iloc[-1] > hist['Close'].iloc[-2]:
-                        advances += 1
-                    else:
-                        declines += 1
-            except:
-                pass
+            hist = frames.get(ticker)
+            if hist is not None and len(hist) >= 2:
+                if hist['Close'].iloc[-1] > hist['Close'].iloc[-2]:
+                    advances += 1
+                else:
+                    declines += 1
         
         if advances + declines > 0:
             data['market_breadth'] = round(advances / (advances + declines), 2)
@@ -378,19 +392,39 @@ def calculate_price_sentiment(df: pd.DataFrame, metrics: Dict) -> Dict:
 # =============================================================================
 # STOCK DATA FETCHING
 # =============================================================================
-@st.cache_data(ttl=60)
+def _load_from_provider(tickers: List[str], period: str) -> Dict[str, pd.DataFrame]:
+    """Load OHLCV history from the active provider (through the disk store if remote)."""
+    provider = get_provider()
+    if provider.remote:
+        return get_default_store().refresh(tickers, period, provider)
+    return provider.download(tickers, period=period)
+
+def load_history(tickers: List[str], period: str) -> Dict[str, pd.DataFrame]:
+    """Load OHLCV history; all periods share one cached superset per ticker."""
+    return get_history_cache().get(tickers, period, _load_from_provider)
+
+# No st.cache_data TTL here: the history cache refreshes on the NSE calendar
+# Both run on screener worker threads, which have no Streamlit script context,
+# so failures are printed and callers report missing data on the script thread
 def fetch_stock_data(ticker: str, period: str = "6mo") -> Optional[pd.DataFrame]:
     """Fetch stock data with error handling."""
     try:
-        stock = yf.Ticker(ticker)
-        df = stock.history(period=period)
-        if df.empty:
+        df = load_history([ticker], period=period).get(ticker)
+        if df is None or df.empty:
             return None
         return df
     except Exception as e:
-        st.error(f"Error fetching {ticker}: {str(e)}")
+        print(f"Error fetching {ticker}: {str(e)}")
         return None
 
+def fetch_stock_data_bulk(tickers: List[str], period: str = "6mo") -> Dict[str, pd.DataFrame]:
+    """Fetch stock data for many tickers with batched downloads."""
+    try:
+        return load_history(tickers, period=period)
+    except Exception as e:
+        print(f"Error fetching {len(tickers)} tickers: {str(e)}")
+        return {}
+
 # =============================================================================
 # MULTI-AGENT DECISION ENGINE
 # =============================================================================
@@ -638,72 +672,164 @@ Keep it professional, data-driven, and actionable.
 # =============================================================================
 # STOCK SCREENER
 # =============================================================================
+# Metrics the STRESS and ACCUMULATE filters read; tickers they reject are dropped
+# after computing only these, before the full scoring pass
+REGIME_FILTER_METRICS = {
+    'STRESS': ['realized_volatility_20d'],
+    'ACCUMULATE': ['rsi_14', 'cci_20'],
+}
+
+def regime_rejects(regime_code: str, metrics: Dict) -> bool:
+    """Metric-only regime filters (the TREND filter needs the full recommendation)."""
+    if regime_code == 'STRESS':
+        # High VIX: Look for defensive, low volatility
+        return metrics.get('realized_volatility_20d', 100) > 30
+    if regime_code == 'ACCUMULATE':
+        # Low VIX: Look for breakout setups that are not already extended
+        return metrics.get('rsi_14', 50) > 60 or metrics.get('cci_20', 0) > 100
+    return False
+
+def screen_ticker(ticker: str, df: pd.DataFrame, regime: Dict) -> Optional[Dict]:
+    """Score one ticker and apply regime-specific filters (None if filtered out)."""
+    if df is None or len(df) < 30:
+        return None
+    
+    # Survivors of the pre-filter reuse its indicators in the full pass
+    context = MetricContext(df)
+    regime_code = regime.get('code', 'UNKNOWN')
+    if regime_code in REGIME_FILTER_METRICS:
+        prefilter = calculate_all_metrics(df, ticker, metrics=REGIME_FILTER_METRICS[regime_code], context=context)
+        if not prefilter or regime_rejects(regime_code, prefilter):
+            return None
+    
+    metrics = calculate_all_metrics(df, ticker, context=context)
+    if not metrics:
+        return None
+    
+    sentiment = calculate_price_sentiment(df, metrics)
+    recommendation = multi_agent_decision(metrics, regime, sentiment)
+    
+    # Apply the regime filter that needs the recommendation
+    if regime_code == 'TREND':
+        # Trending market: Look for momentum
+        if recommendation['final_recommendation'] != 'BUY':
+            return None
+    
+    return {
+        'ticker': ticker,
+        'name': NIFTY_500_STOCKS.get(ticker, {}).get('name', ticker),
+        'sector': NIFTY_500_STOCKS.get(ticker, {}).get('sector', 'Unknown'),
+        'price': metrics.get('current_price', 0),
+        'change_1d': metrics.get('price_change_1d', 0),
+        'rsi': metrics.get('rsi_14', 0),
+        'cci': metrics.get('cci_20', 0),
+        'volume_ratio': metrics.get('volume_ratio', 0),
+        'signal': recommendation['final_recommendation'],
+        'trend': recommendation['trend'],
+        'score': recommendation['weighted_score'],
+        'sentiment': sentiment['overall'],
+        'risk': recommendation['sentinel_risk']
+    }
+
 def run_screener(sector: str, regime: Dict) -> List[Dict]:
-    """Run technical screener with regime-aware filters."""
+    """Run technical screener with regime-aware filters over the full universe."""
     
     stocks = get_all_stocks() if sector == "All Sectors" else [
         s for s in get_all_stocks() if NIFTY_500_STOCKS.get(s, {}).get('sector') == sector
     ]
     
-    results = []
     progress_bar = st.progress(0)
     status_text = st.empty()
     
-    for idx, ticker in enumerate(stocks[:50]):  # Limit to 50 for performance
-        try:
-            status_text.text(f"Screening {ticker}... ({idx+1}/{min(50, len(stocks))})")
-            progress_bar.progress((idx + 1) / min(50, len(stocks)))
-            
-            df = fetch_stock_data(ticker, period="3mo")
-            if df is None or len(df) < 30:
-                continue
-            
-            metrics = calculate_all_metrics(df, ticker)
-            if not metrics:
-                continue
-            
-            sentiment = calculate_price_sentiment(df, metrics)
-            recommendation = multi_agent_decision(metrics, regime, sentiment)
-            
-            # Apply regime-specific filters
-            regime_code = regime.get('code', 'UNKNOWN')
-            
-            if regime_code == 'STRESS':
-                # High VIX: Look for defensive, low volatility
-                if metrics.get('realized_volatility_20d', 100) > 30:
-                    continue
-            elif regime_code == 'TREND':
-                # Trending market: Look for momentum
-                if recommendation['final_recommendation'] != 'BUY':
-                    continue
-            elif regime_code == 'ACCUMULATE':
-                # Low VIX: Look for breakout setups
-                if metrics.get('rsi_14', 50) > 60:
-                    continue
-            
-            results.append({
-                'ticker': ticker,
-                'name': NIFTY_500_STOCKS.get(ticker, {}).get('name', ticker),
-                'sector': NIFTY_500_STOCKS.get(ticker, {}).get('sector', 'Unknown'),
-                'price': metrics.get('current_price', 0),
-                'change_1d': metrics.get('price_change_1d', 0),
-                'rsi': metrics.get('rsi_14', 0),
-                'volume_ratio': metrics.get('volume_ratio', 0),
-                'signal': recommendation['final_recommendation'],
-                'trend': recommendation['trend'],
-                'score': recommendation['weighted_score'],
-                'sentiment': sentiment['overall'],
-                'risk': recommendation['sentinel_risk']
-            })
-            
-        except Exception as e:
-            continue
+    def update_progress(done: int, total: int, ticker: str):
+        status_text.text(f"Screening {ticker}... ({done}/{total})")
+        progress_bar.progress(done / total)
+    
+    # Batched downloads are serialised inside market_data, so a single fetch
+    # worker keeps the next chunk downloading while the current one is scored
+    stats = PipelineStats()
+    results = run_pipeline(
+        stocks,
+        fetch_fn=lambda chunk: fetch_stock_data_bulk(chunk, period="3mo"),
+        score_fn=lambda ticker, df: screen_ticker(ticker, df, regime),
+        fetch_workers=1,
+        progress_callback=update_progress,
+        stats=stats,
+        batch_size=DEFAULT_CHUNK_SIZE
+    )
     
     progress_bar.empty()
     status_text.empty()
+    st.caption(f"Screened {stats.fetched}/{stats.total} stocks in {stats.elapsed:.1f}s")
+    if stats.fetched < stats.total:
+        st.warning(f"Could not fetch data for {stats.total - stats.fetched} of {stats.total} stocks")
     
     return sorted(results, key=lambda x: x['score'], reverse=True)
 
+# =============================================================================
+# BACKTESTING
+# =============================================================================
+BACKTEST_POLL_SECONDS = 1.0
+
+def submit_backtest(ticker: str, period: str, strategies: List[str], capital: float):
+    """Start a background backtest, or reuse the job for identical inputs and data."""
+    # The history cache refreshes only when the NSE calendar epoch changes, so the
+    # epoch versions the bars without loading them on the script thread
+    epoch = cache_epoch(intraday_ttl=get_history_cache().intraday_ttl)
+    key = ('backtest', ticker, period, tuple(strategies), float(capital), epoch)
+    
+    def run(progress):
+        df = load_history([ticker], period=period).get(ticker)
+        if df is None or len(df) < 30:
+            raise ValueError(f"Not enough data for {ticker}")
+        engine = BacktestEngine(initial_capital=capital, result_cache=get_result_cache())
+        return engine.compare_strategies(df, strategies, ticker, progress_callback=progress)
+    
+    return get_job_manager().submit(key, run)
+
+@st.fragment(run_every=BACKTEST_POLL_SECONDS)
+def show_backtest_progress(job_key):
+    """Poll a running job without rerunning the rest of the app."""
+    job = get_job_manager().get(job_key)
+    if job is None or not job.active:
+        st.rerun()  # Full rerun renders the results and stops polling
+    total = job.total or "?"
+    st.progress(job.progress, text=f"Backtesting... {job.done}/{total} strategies")
+
+def show_backtest_results(results: List[BacktestResult]):
+    """Comparison table, equity curves and trade lists."""
+    first = results[0]
+    st.caption(f"{first.ticker} | {first.start_date} → {first.end_date} | "
+               f"Buy & hold benchmark: {first.benchmark_return:+.2f}%")
+    
+    summary = pd.DataFrame([{
+        'Strategy': r.strategy_name,
+        'Return %': r.total_return_pct,
+        'Annualized %': r.annualized_return,
+        'Sharpe': r.sharpe_ratio,
+        'Sortino': r.sortino_ratio,
+        'Max DD %': r.max_drawdown_pct,
+        'Trades': r.total_trades,
+        'Win Rate %': r.win_rate,
+        'Profit Factor': r.profit_factor
+    } for r in results]).sort_values('Return %', ascending=False)
+    st.dataframe(summary, use_container_width=True, hide_index=True)
+    
+    fig = go.Figure()
+    for r in results:
+        fig.add_trace(go.Scatter(x=r.equity_curve.index, y=r.equity_curve, name=r.strategy_name))
+    fig.update_layout(height=450, title="Equity Curve", yaxis_title="Portfolio Value (₹)",
+                      hovermode='x unified')
+    st.plotly_chart(fig, use_container_width=True)
+    
+    for r in results:
+        with st.expander(f"{r.strategy_name} — {r.total_trades} trades"):
+            if r.trades:
+                st.dataframe(pd.DataFrame([t.__dict__ for t in r.trades]), use_container_width=True,
+                             hide_index=True)
+            else:
+                st.write("No trades")
+
 # =============================================================================
 # CHARTING
 # =============================================================================
@@ -936,6 +1062,7 @@ def main():
                     'price': 'Price',
                     'change_1d': '1D%',
                     'rsi': 'RSI',
+                    'cci': 'CCI',
                     'volume_ratio': 'Vol Ratio',
                     'signal': 'Signal',
                     'trend': 'Trend',
@@ -950,6 +1077,7 @@ def main():
                         'Price': '₹{:.2f}',
                         '1D%': '{:+.2f}%',
                         'RSI': '{:.1f}',
+                        'CCI': '{:.0f}',
                         'Vol Ratio': '{:.2f}x',
                         'Score': '{:.3f}'
                     }),
@@ -963,19 +1091,33 @@ def main():
     # ========== TAB 3: BACKTEST ==========
     with tab3:
         st.subheader("📈 Strategy Backtesting")
-        st.info("⚠️ Backtesting feature available - configure parameters below")
         
         col1, col2 = st.columns(2)
         with col1:
             bt_ticker = st.text_input("Ticker for Backtest", value="RELIANCE.NS")
-            bt_strategy = st.selectbox("Strategy", AVAILABLE_STRATEGIES)
+            bt_strategies = st.multiselect("Strategies", AVAILABLE_STRATEGIES,
+                                           default=["Buy and Hold", "SMA Crossover (20/50)"])
         
         with col2:
             bt_period = st.selectbox("Period", ["1y", "2y", "3y", "5y"])
             bt_capital = st.number_input("Initial Capital (₹)", value=100000, step=10000)
         
         if st.button("🚀 Run Backtest", type="primary"):
-            st.info("Backtesting engine ready - full implementation available")
+            if not bt_strategies:
+                st.error("Select at least one strategy")
+            else:
+                job = submit_backtest(bt_ticker, bt_period, bt_strategies, bt_capital)
+                st.session_state.backtest_job = job.key
+        
+        # Runs continue in the background across reruns; show the latest one
+        job = get_job_manager().get(st.session_state.backtest_job) if st.session_state.backtest_job else None
+        if job is not None:
+            if job.active:
+                show_backtest_progress(job.key)
+            elif job.error:
+                st.error(f"Backtest failed: {job.error}")
+            elif job.result:
+                show_backtest_results(job.result)
     
     # ========== TAB 4: WATCHLIST ==========
     with tab4:
@@ -992,9 +1134,15 @@ def main():
         
         if st.session_state.watchlist:
             st.write("Current Watchlist:")
+            quotes = fetch_stock_data_bulk(list(st.session_state.watchlist), period="5d")
             for ticker in st.session_state.watchlist:
                 col1, col2 = st.columns([4, 1])
-                col1.write(ticker)
+                hist = quotes.get(ticker)
+                if hist is not None and len(hist) >= 2:
+                    change = ((hist['Close'].iloc[-1] / hist['Close'].iloc[-2]) - 1) * 100
+                    col1.write(f"{ticker} — ₹{hist['Close'].iloc[-1]:,.2f} ({change:+.2f}%)")
+                else:
+                    col1.write(ticker)
                 if col2.button("❌", key=f"remove_{ticker}"):
                     st.session_state.watchlist.remove(ticker)
                     st.rerun()
@@ -0,0 +1,118 @@
+"""
+BACKTEST JOBS MODULE
+====================
+Background execution of backtests for the Streamlit app.
+
+Streamlit reruns the whole script on every widget change, so long runs
+cannot happen inline. Jobs run on a process-wide thread pool instead; the
+script submits a job, stores its key in session state and polls it on
+later reruns. Finished jobs are kept in an LRU keyed on everything that
+determines the result (ticker, period, strategies, capital and the data
+version, i.e. the NSE calendar epoch the history was loaded in),
+so changing a widget and changing it back shows the earlier result
+immediately instead of recomputing it.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Hashable, Optional
+
+DEFAULT_JOB_WORKERS = 2
+DEFAULT_MAX_FINISHED = 32
+
+PENDING, RUNNING, DONE, FAILED = "pending", "running", "done", "failed"
+
+
+@dataclass
+class Job:
+    """State of one background job, read by the polling script."""
+    key: Hashable
+    status: str = PENDING
+    done: int = 0
+    total: int = 0
+    result: Any = None
+    error: Optional[str] = None
+    submitted: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+
+    @property
+    def progress(self) -> float:
+        """Fraction complete (0.0 - 1.0)."""
+        if self.status == DONE:
+            return 1.0
+        return self.done / self.total if self.total else 0.0
+
+    @property
+    def active(self) -> bool:
+        return self.status in (PENDING, RUNNING)
+
+
+class BacktestJobManager:
+    """Runs keyed jobs in the background and keeps the latest finished ones."""
+
+    def __init__(self, workers: int = DEFAULT_JOB_WORKERS, max_finished: int = DEFAULT_MAX_FINISHED):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="backtest")
+        self._jobs: "OrderedDict[Hashable, Job]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.max_finished = max_finished
+
+    def submit(self, key: Hashable, fn: Callable[[Callable[[int, int], None]], Any]) -> Job:
+        """
+        Start fn in the background unless a job with the same key exists.
+
+        Args:
+            key: Everything the result depends on
+            fn: Called as fn(progress) where progress(done, total) reports progress
+
+        Returns:
+            The running or finished Job for key
+        """
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None and job.status != FAILED:
+                self._jobs.move_to_end(key)
+                return job
+            job = self._jobs[key] = Job(key)
+            self._evict()
+
+        def progress(done: int, total: int):
+            job.done, job.total = done, total
+
+        def run():
+            job.status = RUNNING
+            try:
+                job.result = fn(progress)
+                job.status = DONE
+            except Exception as e:
+                job.error = str(e)
+                job.status = FAILED
+            finally:
+                job.finished = time.time()
+
+        self._executor.submit(run)
+        return job
+
+    def get(self, key: Hashable) -> Optional[Job]:
+        """Job for key, if submitted and not yet evicted."""
+        with self._lock:
+            job = self._jobs.get(key)
+            if job is not None:
+                self._jobs.move_to_end(key)
+            return job
+
+    def _evict(self):
+        # Drop the least recently used finished jobs; running jobs are never dropped
+        finished = [key for key, job in self._jobs.items() if not job.active]
+        for key in finished[:max(0, len(finished) - self.max_finished)]:
+            del self._jobs[key]
+
+
+_job_manager = BacktestJobManager()
+
+
+def get_job_manager() -> BacktestJobManager:
+    """Process-wide job manager shared by all Streamlit sessions."""
+    return _job_manager
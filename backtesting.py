@@ -6,9 +6,29 @@ Simple but powerful backtesting engine for strategy validation.
 
 import pandas as pd
 import numpy as np
-from typing import Dict, List, Any, Optional, Tuple
-from dataclasses import dataclass
-from indicators import calculate_rsi, calculate_macd, calculate_sma, calculate_ema, calculate_bollinger_bands
+from typing import Callable, Dict, List, Any, Optional, Tuple
+from dataclasses import dataclass, fields
+from analytics import drawdown_panel, equity_metrics, pad_columns, trade_metrics
+from indicator_cache import IndicatorCache
+from result_cache import ResultCache, result_key, with_ticker
+from strategy_registry import (  # Templates re-exported for the optimizer and walk-forward
+    NAMED_STRATEGIES, STRATEGY_REGISTRY, STRATEGY_TEMPLATES, StrategyTemplate, evaluate_strategies
+)
+
+# Result detail levels for run_backtest / run_signals / compare_strategies
+FULL, COMPACT, SUMMARY = "full", "compact", "summary"
+
+# One row per trade, same values as TradeResult (prices/PnL already rounded)
+TRADE_DTYPE = np.dtype([
+    ('entry_date', 'datetime64[D]'),
+    ('exit_date', 'datetime64[D]'),
+    ('entry_price', 'f8'),
+    ('exit_price', 'f8'),
+    ('position', 'i1'),         # 1 = LONG, -1 = SHORT
+    ('pnl', 'f8'),
+    ('pnl_pct', 'f8'),
+    ('holding_days', 'i4'),
+])
 
 
 @dataclass
@@ -24,6 +44,65 @@ class TradeResult:
     holding_days: int
 
 
+def trade_ledger(trades: List[TradeResult]) -> np.ndarray:
+    """Structured TRADE_DTYPE array of a list of trades."""
+    ledger = np.empty(len(trades), dtype=TRADE_DTYPE)
+    for j, t in enumerate(trades):
+        ledger[j] = (t.entry_date, t.exit_date, t.entry_price, t.exit_price,
+                     1 if t.position_type == 'LONG' else -1, t.pnl, t.pnl_pct, t.holding_days)
+    return ledger
+
+
+def ledger_trades(ledger: np.ndarray) -> List[TradeResult]:
+    """TradeResult list of a TRADE_DTYPE ledger."""
+    entry_dates = np.datetime_as_string(ledger['entry_date'], unit='D').tolist()
+    exit_dates = np.datetime_as_string(ledger['exit_date'], unit='D').tolist()
+    holding_days = ledger['holding_days'].tolist()
+    return [
+        TradeResult(
+            entry_date=entry_dates[j],
+            exit_date=exit_dates[j],
+            entry_price=ledger['entry_price'][j],
+            exit_price=ledger['exit_price'][j],
+            position_type='LONG' if ledger['position'][j] == 1 else 'SHORT',
+            pnl=ledger['pnl'][j],
+            pnl_pct=ledger['pnl_pct'][j],
+            holding_days=holding_days[j]
+        )
+        for j in range(len(ledger))
+    ]
+
+
+def buy_and_hold_equity(close, initial_capital: float) -> np.ndarray:
+    """
+    Portfolio value of holding from the first close on, without commission.
+    
+    The running product of bar-to-bar close ratios, multiplied in bar order
+    (the same values as compounding the daily returns one bar at a time).
+    """
+    close = np.asarray(close, dtype=float)
+    if not len(close):
+        return np.empty(0)
+    growth = np.empty(len(close))
+    growth[0] = initial_capital
+    growth[1:] = close[1:] / close[:-1]
+    return np.cumprod(growth)
+
+
+def _bar_dates(index: pd.DatetimeIndex) -> np.ndarray:
+    """Calendar date (in the index's own timezone) of each bar as datetime64[D]."""
+    if index.tz is not None:
+        index = index.tz_localize(None)
+    return index.values.astype('datetime64[D]')
+
+
+def _sample_positions(n: int, points: Optional[int]) -> np.ndarray:
+    """Evenly spaced positions in range(n) keeping the first and last bar (all bars if points is None)."""
+    if points is None or points >= n:
+        return np.arange(n)
+    return np.unique(np.linspace(0, n - 1, max(points, 2)).round().astype(np.intp))
+
+
 @dataclass
 class BacktestResult:
     """Complete backtest results."""
@@ -56,80 +135,126 @@ class BacktestResult:
     drawdown_curve: pd.Series
     benchmark_return: float
 
+    def compact(self, curve_points: Optional[int] = None, summary_only: bool = False) -> 'CompactBacktestResult':
+        """
+        Compact copy of this result.
+
+        Args:
+            curve_points: Keep this many evenly spaced equity points (None keeps every bar)
+            summary_only: Drop the trade ledger and equity curve, keeping only the metrics
+        """
+        summary = {f.name: getattr(self, f.name) for f in fields(CompactBacktestResult)
+                   if f.name not in ('ledger', 'equity', 'equity_dates')}
+        if summary_only:
+            return CompactBacktestResult(**summary)
+        keep = _sample_positions(len(self.equity_curve), curve_points)
+        return CompactBacktestResult(
+            **summary,
+            ledger=trade_ledger(self.trades),
+            equity=self.equity_curve.to_numpy(dtype=float)[keep],
+            equity_dates=_bar_dates(self.equity_curve.index)[keep]
+        )
+
+
+@dataclass
+class CompactBacktestResult:
+    """
+    Backtest metrics with an array-backed trade ledger and optional equity curve.
+
+    A few KB per result instead of a TradeResult list and two full pandas
+    curves; meant for sweeps that keep thousands of results (universe
+    backtests, optimizers, caches). trades, equity_curve and drawdown_curve
+    rebuild the BacktestResult views on demand.
+    """
+    strategy_name: str
+    ticker: str
+    start_date: str
+    end_date: str
+    initial_capital: float
+    final_capital: float
+    total_return: float
+    total_return_pct: float
+    annualized_return: float
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    max_drawdown: float
+    max_drawdown_pct: float
+    sharpe_ratio: float
+    sortino_ratio: float
+    profit_factor: float
+    avg_trade_pnl: float
+    avg_winning_trade: float
+    avg_losing_trade: float
+    largest_win: float
+    largest_loss: float
+    avg_holding_period: float
+    benchmark_return: float
+    ledger: Optional[np.ndarray] = None         # TRADE_DTYPE rows (None in summary-only results)
+    equity: Optional[np.ndarray] = None         # Portfolio value, every bar or downsampled
+    equity_dates: Optional[np.ndarray] = None   # datetime64[D] date of each equity point
+
+    @property
+    def trades(self) -> List[TradeResult]:
+        return ledger_trades(self.ledger) if self.ledger is not None else []
+
+    @property
+    def equity_curve(self) -> pd.Series:
+        if self.equity is None:
+            return pd.Series(dtype=float)
+        return pd.Series(self.equity, index=pd.DatetimeIndex(self.equity_dates, name='Date'))
+
+    @property
+    def drawdown_curve(self) -> pd.Series:
+        """Drawdown % of the stored equity points (coarser than max_drawdown_pct when downsampled)."""
+        equity = self.equity_curve
+        rolling_max = equity.cummax()
+        return (equity - rolling_max) / rolling_max * 100
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held in the ledger and curve arrays."""
+        return sum(a.nbytes for a in (self.ledger, self.equity, self.equity_dates) if a is not None)
+
 
 class BacktestEngine:
     """
     Simple backtesting engine for technical strategies.
     """
     
-    def __init__(self, initial_capital: float = 100000, commission: float = 0.001):
+    def __init__(self, initial_capital: float = 100000, commission: float = 0.001,
+                 result_cache: Optional[ResultCache] = None):
         """
         Initialize backtesting engine.
         
         Args:
             initial_capital: Starting capital in INR
             commission: Commission per trade (0.1% = 0.001)
+            result_cache: Serve run_backtest results already computed for the
+                same bars, strategy definition, capital and commission
         """
         self.initial_capital = initial_capital
         self.commission = commission
+        self.result_cache = result_cache
     
-    def _calculate_signals(self, df: pd.DataFrame, strategy: str) -> pd.DataFrame:
+    def _calculate_signals(self, df: pd.DataFrame, strategy: str,
+                           indicators: Optional[IndicatorCache] = None) -> pd.DataFrame:
         """Generate buy/sell signals based on strategy."""
         signals = pd.DataFrame(index=df.index)
         signals['signal'] = 0
         
-        close = df['Close']
-        high = df['High']
-        low = df['Low']
-        volume = df['Volume']
-        
-        if strategy == "SMA Crossover (20/50)":
-            sma_fast = calculate_sma(close, 20)
-            sma_slow = calculate_sma(close, 50)
-            signals['signal'] = np.where(sma_fast > sma_slow, 1, -1)
-            
-        elif strategy == "EMA Crossover (12/26)":
-            ema_fast = calculate_ema(close, 12)
-            ema_slow = calculate_ema(close, 26)
-            signals['signal'] = np.where(ema_fast > ema_slow, 1, -1)
-            
-        elif strategy == "RSI Mean Reversion":
-            rsi = calculate_rsi(close, 14)
-            signals['signal'] = np.where(rsi < 30, 1, np.where(rsi > 70, -1, 0))
-            
-        elif strategy == "MACD Signal":
-            macd = calculate_macd(close)
-            signals['signal'] = np.where(macd['histogram'] > 0, 1, -1)
-            
-        elif strategy == "Bollinger Band Bounce":
-            bb = calculate_bollinger_bands(close)
-            signals['signal'] = np.where(close < bb['lower'], 1, 
-                                        np.where(close > bb['upper'], -1, 0))
-            
-        elif strategy == "Golden Cross (50/200)":
-            sma_50 = calculate_sma(close, 50)
-            sma_200 = calculate_sma(close, 200)
-            signals['signal'] = np.where(sma_50 > sma_200, 1, -1)
-            
-        elif strategy == "Triple EMA (5/13/26)":
-            ema_5 = calculate_ema(close, 5)
-            ema_13 = calculate_ema(close, 13)
-            ema_26 = calculate_ema(close, 26)
-            signals['signal'] = np.where((ema_5 > ema_13) & (ema_13 > ema_26), 1,
-                                        np.where((ema_5 < ema_13) & (ema_13 < ema_26), -1, 0))
-            
-        elif strategy == "Volume Breakout":
-            avg_vol = volume.rolling(20).mean()
-            sma_20 = calculate_sma(close, 20)
-            signals['signal'] = np.where((close > sma_20) & (volume > 1.5 * avg_vol), 1,
-                                        np.where((close < sma_20) & (volume > 1.5 * avg_vol), -1, 0))
+        if strategy in STRATEGY_REGISTRY:
+            signals['signal'] = evaluate_strategies(df, [strategy], indicators)[strategy]
             
         elif strategy == "Buy and Hold":
             signals['signal'] = 1  # Always long
             
         return signals
     
-    def run_backtest(self, df: pd.DataFrame, strategy: str, ticker: str = "UNKNOWN") -> BacktestResult:
+    def run_backtest(self, df: pd.DataFrame, strategy: str, ticker: str = "UNKNOWN",
+                     vectorized: bool = True, indicators: Optional[IndicatorCache] = None,
+                     detail: str = FULL, curve_points: Optional[int] = None):
         """
         Run backtest for a given strategy.
         
@@ -137,17 +262,166 @@ class BacktestEngine:
             df: DataFrame with OHLCV data
             strategy: Strategy name
             ticker: Stock ticker symbol
+            vectorized: Simulate with array operations; False runs the
+                per-bar reference loop (identical results, much slower)
+            indicators: IndicatorCache for df shared with other runs
+            detail: FULL for a BacktestResult, COMPACT for a CompactBacktestResult
+                with trade ledger and equity curve, SUMMARY for metrics only
+            curve_points: Downsample a COMPACT equity curve to this many points
             
         Returns:
-            BacktestResult object with complete metrics
+            BacktestResult (or CompactBacktestResult) with complete metrics
         """
+        if self.result_cache is None:
+            return self._run_backtest(df, strategy, ticker, vectorized, indicators, detail, curve_points)
+        
+        key = result_key(df, strategy, self.initial_capital, self.commission, detail, curve_points)
+        result = self.result_cache.get(key)
+        if result is None:
+            result = self._run_backtest(df, strategy, ticker, vectorized, indicators, detail, curve_points)
+            self.result_cache.put(key, result)
+        return with_ticker(result, ticker)
+    
+    def _run_backtest(self, df: pd.DataFrame, strategy: str, ticker: str, vectorized: bool,
+                      indicators: Optional[IndicatorCache], detail: str,
+                      curve_points: Optional[int]):
+        """run_backtest without the result cache."""
         # Special handling for Buy and Hold
         if strategy == "Buy and Hold":
-            return self._run_buy_and_hold(df, ticker)
+            result = self._run_buy_and_hold(df, ticker)
+            return result if detail == FULL else result.compact(curve_points, detail == SUMMARY)
         
         # Generate signals for other strategies
-        signals = self._calculate_signals(df, strategy)
+        signals = self._calculate_signals(df, strategy, indicators)
         
+        if vectorized:
+            capital, ledger, equity = self._simulate(df, signals['signal'])
+        else:
+            capital, trades, equity = self._simulate_loop(df, signals['signal'])
+            ledger = trade_ledger(trades)
+        return self._summarize(df.index, df['Close'].to_numpy(), [strategy], ticker, [(capital, ledger, equity)],
+                               detail, curve_points)[0]
+    
+    def run_signals(self, df: pd.DataFrame, signal, strategy_name: str = "Custom",
+                    ticker: str = "UNKNOWN", detail: str = FULL, curve_points: Optional[int] = None):
+        """
+        Backtest a precomputed signal series.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            signal: Per-bar signal aligned with df (1 = long, -1 = short, 0 = no change)
+            strategy_name: Name reported in the result
+            ticker: Stock ticker symbol
+            detail: FULL, COMPACT or SUMMARY (see run_backtest)
+            curve_points: Downsample a COMPACT equity curve to this many points
+            
+        Returns:
+            BacktestResult (or CompactBacktestResult) with complete metrics
+        """
+        capital, ledger, equity = self._simulate(df, signal)
+        return self._summarize(df.index, df['Close'].to_numpy(), [strategy_name], ticker, [(capital, ledger, equity)],
+                               detail, curve_points)[0]
+    
+    def run_signal_batch(self, df: pd.DataFrame, signals: List, strategy_name: str = "Custom",
+                         ticker: str = "UNKNOWN", detail: str = SUMMARY,
+                         curve_points: Optional[int] = None) -> List:
+        """
+        Backtest many precomputed signal series on the same bars.
+        
+        Each signal is simulated on its own, then all equity curves and trade
+        lists are scored together in one pass of the analytics kernels, which
+        is what makes grid searches cheap.
+        
+        Args:
+            df: DataFrame with OHLCV data
+            signals: Per-bar signals aligned with df
+            strategy_name: Name reported in every result
+            ticker: Stock ticker symbol
+            detail: FULL, COMPACT or SUMMARY (see run_backtest)
+            curve_points: Downsample COMPACT equity curves to this many points
+            
+        Returns:
+            One result per signal, in order
+        """
+        runs = [self._simulate(df, signal) for signal in signals]
+        return self._summarize(df.index, df['Close'].to_numpy(), [strategy_name] * len(runs), ticker, runs,
+                               detail, curve_points)
+    
+    def _simulate(self, df: pd.DataFrame, signal: pd.Series) -> Tuple[float, np.ndarray, np.ndarray]:
+        """
+        Vectorized trade simulation, equivalent to _simulate_loop.
+        
+        A bar where the signal changes to a non-zero value closes the open
+        position and opens a new one in the signal's direction, so trades run
+        from one such bar to the next. Entries, exits and the equity curve are
+        array operations; only the compounding of capital from trade to trade
+        is a loop, over trades rather than bars. Trades come back as a
+        TRADE_DTYPE ledger.
+        """
+        close = df['Close'].to_numpy()
+        sig = np.asarray(signal)
+        n = len(close)
+        
+        equity = np.full(n, float(self.initial_capital))
+        triggers = np.flatnonzero((sig[1:] != sig[:-1]) & (sig[1:] != 0)) + 1
+        if len(triggers) == 0:
+            return self.initial_capital, np.empty(0, dtype=TRADE_DTYPE), equity
+        
+        positions = sig[triggers]
+        is_long = positions == 1
+        prices = close[triggers]
+        entry_prices = np.where(is_long, prices * (1 + self.commission), prices * (1 - self.commission))
+        # Every trade but the last exits at the next trigger; the last exits at the final close
+        exit_prices = np.append(
+            np.where(is_long[:-1], prices[1:] * (1 - self.commission), prices[1:] * (1 + self.commission)),
+            close[-1]
+        )
+        
+        capital = self.initial_capital
+        start_capital = np.empty(len(triggers))
+        pnls = np.empty(len(triggers))
+        for j in range(len(triggers)):
+            start_capital[j] = capital
+            entry_price, exit_price = entry_prices[j], exit_prices[j]
+            if is_long[j]:
+                pnl = (exit_price - entry_price) * (capital / entry_price)
+            else:
+                pnl = (entry_price - exit_price) * (capital / entry_price)
+            pnls[j] = pnl
+            capital += pnl
+        
+        # pnl_pct is relative to capital before the trade, except for the final
+        # close, which is measured against capital after it
+        pnl_base = start_capital.copy()
+        pnl_base[-1] = capital
+        pnl_pcts = (pnls / pnl_base) * 100
+        
+        # Mark each bar to market against the trade open at its close
+        active = np.searchsorted(triggers, np.arange(triggers[0], n), side='right') - 1
+        held = close[triggers[0]:]
+        bar_capital = start_capital[active]
+        bar_entry = entry_prices[active]
+        shares = bar_capital / bar_entry
+        equity[triggers[0]:] = np.where(
+            is_long[active],
+            bar_capital + (held - bar_entry) * shares,
+            bar_capital + (bar_entry - held) * shares
+        )
+        
+        exits = np.append(triggers[1:], n - 1)
+        ledger = np.empty(len(triggers), dtype=TRADE_DTYPE)
+        ledger['entry_date'] = _bar_dates(df.index[triggers])
+        ledger['exit_date'] = _bar_dates(df.index[exits])
+        ledger['entry_price'] = np.round(entry_prices, 2)
+        ledger['exit_price'] = np.round(exit_prices, 2)
+        ledger['position'] = np.where(is_long, 1, -1)
+        ledger['pnl'] = np.round(pnls, 2)
+        ledger['pnl_pct'] = np.round(pnl_pcts, 2)
+        ledger['holding_days'] = (df.index[exits] - df.index[triggers]).days
+        return capital, ledger, equity
+    
+    def _simulate_loop(self, df: pd.DataFrame, signal: pd.Series) -> Tuple[float, List[TradeResult], List[float]]:
+        """Per-bar reference simulation, kept to check _simulate against."""
         # Initialize tracking variables
         capital = self.initial_capital
         position = 0  # 1 = long, -1 = short, 0 = flat
@@ -162,9 +436,8 @@ class BacktestEngine:
         for i in range(1, len(df)):
             current_date = df.index[i]
             current_price = close.iloc[i]
-            current_signal = signals['signal'].iloc[i]
-            prev_signal = signals['signal'].iloc[i-1]
-            
+            current_signal = signal.iloc[i]
+            prev_signal = signal.iloc[i-1]
             # Check for signal change
             if current_signal != prev_signal and current_signal != 0:
                 # Close existing position if any
@@ -233,97 +506,95 @@ class BacktestEngine:
                 holding_days=(df.index[-1] - entry_date).days
             ))
         
-        # Create equity curve
-        equity_curve = pd.Series(equity, index=df.index[:len(equity)])
+        return capital, trades, equity
+    
+    def _summarize(self, index: pd.DatetimeIndex, close, strategies: List[str], ticker: str,
+                   runs: List[Tuple[float, np.ndarray, Any]], detail: str = FULL,
+                   curve_points: Optional[int] = None) -> List:
+        """
+        Performance metrics for simulated strategies, scored as one batch.
         
-        # Calculate drawdown
-        rolling_max = equity_curve.expanding().max()
-        drawdown = equity_curve - rolling_max
-        drawdown_pct = (drawdown / rolling_max) * 100
+        Only the first and last close are read, so close may be an array or
+        a (first, last) pair when the full series is not at hand.
+        """
         
-        # Calculate metrics
-        total_return = capital - self.initial_capital
-        total_return_pct = (total_return / self.initial_capital) * 100
+        # Drawdown, Sharpe/Sortino and trade statistics for every run at once
+        equities = np.column_stack([np.asarray(equity, dtype=float) for _, _, equity in runs])
+        curves = equity_metrics(equities)
+        stats = trade_metrics(pad_columns([ledger['pnl'] for _, ledger, _ in runs]))
         
         # Annualized return
-        days = (df.index[-1] - df.index[0]).days
+        days = (index[-1] - index[0]).days
         years = days / 365.25
-        annualized_return = ((capital / self.initial_capital) ** (1 / years) - 1) * 100 if years > 0 else 0
-        
-        # Trade statistics
-        total_trades = len(trades)
-        winning_trades = len([t for t in trades if t.pnl > 0])
-        losing_trades = len([t for t in trades if t.pnl < 0])
-        win_rate = (winning_trades / total_trades * 100) if total_trades > 0 else 0
-        
-        # PnL statistics
-        pnls = [t.pnl for t in trades]
-        winning_pnls = [t.pnl for t in trades if t.pnl > 0]
-        losing_pnls = [t.pnl for t in trades if t.pnl < 0]
-        
-        avg_trade_pnl = np.mean(pnls) if pnls else 0
-        avg_winning_trade = np.mean(winning_pnls) if winning_pnls else 0
-        avg_losing_trade = np.mean(losing_pnls) if losing_pnls else 0
-        largest_win = max(pnls) if pnls else 0
-        largest_loss = min(pnls) if pnls else 0
-        
-        # Profit factor
-        gross_profit = sum(winning_pnls) if winning_pnls else 0
-        gross_loss = abs(sum(losing_pnls)) if losing_pnls else 1
-        profit_factor = gross_profit / gross_loss if gross_loss > 0 else 0
-        
-        # Sharpe Ratio
-        returns = equity_curve.pct_change().dropna()
-        sharpe_ratio = (returns.mean() / returns.std() * np.sqrt(252)) if len(returns) > 0 and returns.std() > 0 else 0
-        
-        # Sortino Ratio
-        negative_returns = returns[returns < 0]
-        sortino_ratio = (returns.mean() / negative_returns.std() * np.sqrt(252)) if len(negative_returns) > 0 and negative_returns.std() > 0 else 0
-        
-        # Average holding period
-        avg_holding_period = np.mean([t.holding_days for t in trades]) if trades else 0
         
         # Benchmark return (buy and hold)
-        benchmark_return = ((close.iloc[-1] / close.iloc[0]) - 1) * 100
+        benchmark_return = ((close[-1] / close[0]) - 1) * 100
+        start_date, end_date = index[0].strftime('%Y-%m-%d'), index[-1].strftime('%Y-%m-%d')
         
-        return BacktestResult(
-            strategy_name=strategy,
-            ticker=ticker,
-            start_date=df.index[0].strftime('%Y-%m-%d'),
-            end_date=df.index[-1].strftime('%Y-%m-%d'),
-            initial_capital=self.initial_capital,
-            final_capital=round(capital, 2),
-            total_return=round(total_return, 2),
-            total_return_pct=round(total_return_pct, 2),
-            annualized_return=round(annualized_return, 2),
-            total_trades=total_trades,
-            winning_trades=winning_trades,
-            losing_trades=losing_trades,
-            win_rate=round(win_rate, 2),
-            max_drawdown=round(drawdown.min(), 2),
-            max_drawdown_pct=round(drawdown_pct.min(), 2),
-            sharpe_ratio=round(sharpe_ratio, 2),
-            sortino_ratio=round(sortino_ratio, 2),
-            profit_factor=round(profit_factor, 2),
-            avg_trade_pnl=round(avg_trade_pnl, 2),
-            avg_winning_trade=round(avg_winning_trade, 2),
-            avg_losing_trade=round(avg_losing_trade, 2),
-            largest_win=round(largest_win, 2),
-            largest_loss=round(largest_loss, 2),
-            avg_holding_period=round(avg_holding_period, 1),
-            trades=trades,
-            equity_curve=equity_curve,
-            drawdown_curve=drawdown_pct,
-            benchmark_return=round(benchmark_return, 2)
-        )
+        results = []
+        for j, (strategy, (capital, ledger, equity)) in enumerate(zip(strategies, runs)):
+            total_return = capital - self.initial_capital
+            total_return_pct = (total_return / self.initial_capital) * 100
+            annualized_return = ((capital / self.initial_capital) ** (1 / years) - 1) * 100 if years > 0 else 0
+            
+            # Average holding period
+            avg_holding_period = np.mean(ledger['holding_days']) if len(ledger) else 0
+            
+            summary = dict(
+                strategy_name=strategy,
+                ticker=ticker,
+                start_date=start_date,
+                end_date=end_date,
+                initial_capital=self.initial_capital,
+                final_capital=round(capital, 2),
+                total_return=round(total_return, 2),
+                total_return_pct=round(total_return_pct, 2),
+                annualized_return=round(annualized_return, 2),
+                total_trades=len(ledger),
+                winning_trades=int(stats['winning_trades'][j]),
+                losing_trades=int(stats['losing_trades'][j]),
+                win_rate=round(stats['win_rate'][j], 2),
+                max_drawdown=round(curves['max_drawdown'][j], 2),
+                max_drawdown_pct=round(curves['max_drawdown_pct'][j], 2),
+                sharpe_ratio=round(curves['sharpe_ratio'][j], 2),
+                sortino_ratio=round(curves['sortino_ratio'][j], 2),
+                profit_factor=round(stats['profit_factor'][j], 2),
+                avg_trade_pnl=round(stats['avg_trade_pnl'][j], 2),
+                avg_winning_trade=round(stats['avg_winning_trade'][j], 2),
+                avg_losing_trade=round(stats['avg_losing_trade'][j], 2),
+                largest_win=round(stats['largest_win'][j], 2),
+                largest_loss=round(stats['largest_loss'][j], 2),
+                avg_holding_period=round(avg_holding_period, 1),
+                benchmark_return=round(benchmark_return, 2)
+            )
+            
+            equity = np.asarray(equity, dtype=float)
+            if detail == SUMMARY:
+                results.append(CompactBacktestResult(**summary))
+            elif detail == COMPACT:
+                keep = _sample_positions(len(equity), curve_points)
+                results.append(CompactBacktestResult(**summary, ledger=ledger, equity=equity[keep],
+                                                     equity_dates=_bar_dates(index)[keep]))
+            else:
+                results.append(BacktestResult(
+                    **summary,
+                    trades=ledger_trades(ledger),
+                    equity_curve=pd.Series(equity, index=index),
+                    drawdown_curve=pd.Series(drawdown_panel(equity)[1], index=index)
+                ))
+        return results
     
     def _run_buy_and_hold(self, df: pd.DataFrame, ticker: str) -> BacktestResult:
         """Special method for Buy and Hold strategy."""
-        close = df['Close']
-        
+        equity_values = buy_and_hold_equity(df['Close'].to_numpy(), self.initial_capital)
+        return self._buy_and_hold_result(df.index, df['Close'].to_numpy(), equity_values, ticker)
+    
+    def _buy_and_hold_result(self, index: pd.DatetimeIndex, close, equity_values,
+                             ticker: str) -> BacktestResult:
+        """Buy and Hold metrics from its equity curve (close: array or (first, last) pair)."""
         # Simple buy at start, sell at end
-        entry_price = close.iloc[0] * (1 + self.commission)
-        exit_price = close.iloc[-1] * (1 - self.commission)
+        entry_price = close[0] * (1 + self.commission)
+        exit_price = close[-1] * (1 - self.commission)
         
         # Calculate returns
         total_return_pct = ((exit_price / entry_price) - 1) * 100
@@ -331,30 +602,20 @@ class BacktestEngine:
         total_return = final_capital - self.initial_capital
         
         # Days and annualized return
-        days = (df.index[-1] - df.index[0]).days
+        days = (index[-1] - index[0]).days
         years = days / 365.25
         annualized_return = ((final_capital / self.initial_capital) ** (1 / years) - 1) * 100 if years > 0 else 0
         
-        # Equity curve (daily portfolio value)
-        equity_values = [self.initial_capital]
-        for i in range(1, len(df)):
-            daily_return = close.iloc[i] / close.iloc[i-1]
-            equity_values.append(equity_values[-1] * daily_return)
-        equity_curve = pd.Series(equity_values, index=df.index[:len(equity_values)])
-        
-        # Drawdown
-        rolling_max = equity_curve.expanding().max()
-        drawdown = equity_curve - rolling_max
-        drawdown_pct = (drawdown / rolling_max) * 100
+        equity_curve = pd.Series(equity_values, index=index[:len(equity_values)])
         
-        # Sharpe ratio
-        returns = equity_curve.pct_change().dropna()
-        sharpe_ratio = (returns.mean() / returns.std() * np.sqrt(252)) if len(returns) > 0 and returns.std() > 0 else 0
+        # Drawdown, Sharpe and Sortino ratios
+        curves = equity_metrics(equity_curve.to_numpy())
+        drawdown_pct = pd.Series(drawdown_panel(equity_curve.to_numpy())[1], index=equity_curve.index)
         
         # Single trade
         trade = TradeResult(
-            entry_date=df.index[0].strftime('%Y-%m-%d'),
-            exit_date=df.index[-1].strftime('%Y-%m-%d'),
+            entry_date=index[0].strftime('%Y-%m-%d'),
+            exit_date=index[-1].strftime('%Y-%m-%d'),
             entry_price=round(entry_price, 2),
             exit_price=round(exit_price, 2),
             position_type='LONG',
@@ -366,8 +627,8 @@ class BacktestEngine:
         return BacktestResult(
             strategy_name="Buy and Hold",
             ticker=ticker,
-            start_date=df.index[0].strftime('%Y-%m-%d'),
-            end_date=df.index[-1].strftime('%Y-%m-%d'),
+            start_date=index[0].strftime('%Y-%m-%d'),
+            end_date=index[-1].strftime('%Y-%m-%d'),
             initial_capital=self.initial_capital,
             final_capital=round(final_capital, 2),
             total_return=round(total_return, 2),
@@ -377,10 +638,10 @@ class BacktestEngine:
             winning_trades=1 if total_return > 0 else 0,
             losing_trades=0 if total_return > 0 else 1,
             win_rate=100.0 if total_return > 0 else 0.0,
-            max_drawdown=round(drawdown.min(), 2),
-            max_drawdown_pct=round(drawdown_pct.min(), 2),
-            sharpe_ratio=round(sharpe_ratio, 2),
-            sortino_ratio=round(sharpe_ratio, 2),  # Simplified
+            max_drawdown=round(curves['max_drawdown'][0], 2),
+            max_drawdown_pct=round(curves['max_drawdown_pct'][0], 2),
+            sharpe_ratio=round(curves['sharpe_ratio'][0], 2),
+            sortino_ratio=round(curves['sortino_ratio'][0], 2),
             profit_factor=999.0 if total_return > 0 else 0.0,
             avg_trade_pnl=round(total_return, 2),
             avg_winning_trade=round(total_return, 2) if total_return > 0 else 0,
@@ -394,12 +655,19 @@ class BacktestEngine:
             benchmark_return=round(total_return_pct, 2)
         )
     
-    def compare_strategies(self, df: pd.DataFrame, strategies: List[str], ticker: str = "UNKNOWN") -> List[BacktestResult]:
+    def compare_strategies(self, df: pd.DataFrame, strategies: List[str], ticker: str = "UNKNOWN",
+                           progress_callback: Optional[Callable[[int, int], None]] = None,
+                           detail: str = FULL, curve_points: Optional[int] = None) -> List[BacktestResult]:
         """Run backtest for multiple strategies and return comparison."""
+        # Indicators shared between strategies (SMA20, EMA26, ...) are computed once
+        indicators = IndicatorCache(df)
         results = []
         for strategy in strategies:
-            result = self.run_backtest(df, strategy, ticker)
+            result = self.run_backtest(df, strategy, ticker, indicators=indicators,
+                                       detail=detail, curve_points=curve_points)
             results.append(result)
+            if progress_callback:
+                progress_callback(len(results), len(strategies))
         return results
 
 
@@ -0,0 +1,661 @@
+"""
+THROUGHPUT BENCHMARKS
+=====================
+Reproducible end-to-end benchmarks on the offline data provider, so they run
+the same way on an air-gapped box as on a laptop.
+
+Usage:
+    python benchmarks.py                 # all benchmarks
+    python benchmarks.py screener        # one benchmark
+    OFFLINE_DATA_DIR=data/ohlcv python benchmarks.py backtest
+"""
+
+import argparse
+import dataclasses
+import hashlib
+import os
+import pickle
+import tempfile
+import time
+from collections import Counter
+from typing import Callable, Dict
+
+import numpy as np
+import pandas as pd
+
+from analytics import equity_metrics
+from backtesting import BacktestEngine, AVAILABLE_STRATEGIES, COMPACT, FULL, SUMMARY, buy_and_hold_equity
+from backtest_jobs import DONE, BacktestJobManager
+from data_providers import OfflineProvider, YFinanceProvider
+from indicator_cache import IndicatorCache
+from indicator_graph import IndicatorGraph
+from indicators import METRIC_NAMES, calculate_all_metrics, calculate_cci, calculate_mfi, calculate_rsi, calculate_adx
+from market_data import DEFAULT_CHUNK_SIZE, YFINANCE_PERIODS, period_start, to_wide_panel
+from nifty500_stocks import get_all_stocks
+from ohlcv_store import OHLCVStore
+from optimizer import expand_grid, optimize_strategy
+from resumable_backtest import ResumableBacktest
+from result_cache import ResultCache
+from walk_forward import walk_forward
+from panel_indicators import panel_rsi, panel_adx, panel_atr, panel_cci, panel_mfi, panel_obv, panel_vwap
+from screener_engine import run_pipeline, PipelineStats
+from strategy_registry import (
+    NAMED_STRATEGIES, STRATEGY_REGISTRY, STRATEGY_TEMPLATES, StrategySpec, compile_strategies, evaluate_strategies
+)
+from streaming_indicators import StreamingMetrics
+from universe_backtest import run_universe_backtest
+
+
+def _provider() -> OfflineProvider:
+    return OfflineProvider(data_dir=os.environ.get('OFFLINE_DATA_DIR'))
+
+
+def _timed(fn: Callable, repeat: int = 1) -> float:
+    """Best wall-clock time of fn() over repeat runs."""
+    best = float('inf')
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def bench_screener(tickers: int = 501):
+    """Full-universe screener pass: batched fetch + metric scoring."""
+    provider = _provider()
+    universe = get_all_stocks()[:tickers]
+    stats = PipelineStats()
+
+    run_pipeline(
+        universe,
+        fetch_fn=lambda chunk: provider.download(chunk, period="3mo"),
+        score_fn=lambda ticker, df: calculate_all_metrics(df.copy(), ticker),
+        fetch_workers=1,
+        stats=stats,
+        batch_size=DEFAULT_CHUNK_SIZE
+    )
+    print(f"screener: {stats.scored}/{stats.total} tickers in {stats.elapsed:.2f}s "
+          f"({stats.total / stats.elapsed:.0f} tickers/s)")
+
+
+def bench_backtest(tickers: int = 20, period: str = "5y"):
+    """Every strategy on a sample of tickers."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    engine = BacktestEngine()
+
+    def run_all():
+        for ticker, df in frames.items():
+            engine.compare_strategies(df, AVAILABLE_STRATEGIES, ticker)
+
+    elapsed = _timed(run_all)
+    runs = len(frames) * len(AVAILABLE_STRATEGIES)
+    print(f"backtest: {runs} runs ({len(frames)} tickers x {len(AVAILABLE_STRATEGIES)} strategies, "
+          f"{period}) in {elapsed:.2f}s ({runs / elapsed:.1f} runs/s)")
+
+
+def bench_universe(tickers: int = 501, period: str = "5y"):
+    """Every strategy across the universe on the process pool."""
+    universe = get_all_stocks()[:tickers]
+    result = run_universe_backtest(universe, AVAILABLE_STRATEGIES, period=period, provider=_provider())
+    runs = len(result.summary)
+    print(f"universe: {runs} runs ({len(universe)} tickers x {len(AVAILABLE_STRATEGIES)} strategies, "
+          f"{period}, {os.cpu_count()} CPU(s)) in {result.elapsed:.2f}s ({runs / result.elapsed:.0f} runs/s)")
+
+
+def bench_optimizer(period: str = "5y"):
+    """SMA crossover grid, fast 5-50 x slow 20-250, on one ticker."""
+    df = _provider().history('RELIANCE.NS', period=period)
+    result = optimize_strategy(df, "SMA Crossover", grid={'fast': range(5, 51), 'slow': range(20, 251)})
+    points = len(result.table)
+    print(f"optimizer: {points} grid points ({period}), {result.indicators_computed} indicator series, "
+          f"{os.cpu_count()} CPU(s) in {result.elapsed:.2f}s ({points / result.elapsed:.0f} points/s), "
+          f"best {result.best_params}")
+
+
+def bench_walk_forward(period: str = "max"):
+    """Rolling 2y/6mo walk-forward of the SMA crossover default grid on one ticker."""
+    df = _provider().history('RELIANCE.NS', period=period)
+    result = walk_forward(df, "SMA Crossover")
+    print(f"walk_forward: {len(result.folds)} folds over {len(df)} bars, {os.cpu_count()} CPU(s) in "
+          f"{result.elapsed:.2f}s, OOS return {result.oos_return_pct}%, efficiency {result.efficiency}")
+
+
+def _moving_averages(fn: Callable) -> Counter:
+    """Rolling and EWM means computed while fn() runs, counted per (kind, window, input data)."""
+    counts = Counter()
+    originals = {cls: cls.mean for cls in (pd.api.typing.Rolling, pd.api.typing.ExponentialMovingWindow)}
+
+    def counting(cls):
+        def mean(self, *args, **kwargs):
+            window = self.span if cls is pd.api.typing.ExponentialMovingWindow else self.window
+            data = hashlib.blake2b(np.ascontiguousarray(self.obj.to_numpy(dtype=float)).tobytes()).hexdigest()
+            counts[cls.__name__, window, data] += 1
+            return originals[cls](self, *args, **kwargs)
+        return mean
+
+    try:
+        for cls in originals:
+            cls.mean = counting(cls)
+        fn()
+    finally:
+        for cls, mean in originals.items():
+            cls.mean = mean
+    return counts
+
+
+def bench_compare(tickers: int = 20, period: str = "5y"):
+    """compare_strategies with the shared indicator memo vs one memo per strategy."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    engine = BacktestEngine()
+    strategies = AVAILABLE_STRATEGIES
+
+    df = next(iter(frames.values()))
+    shared = IndicatorCache(df)
+    counts = _moving_averages(lambda: [engine._calculate_signals(df, strategy, shared) for strategy in strategies])
+    repeated = [key[:2] for key, n in counts.items() if n > 1]
+    assert not repeated, f"moving averages computed more than once: {repeated}"
+    separate = 0
+    for strategy in strategies:
+        own = IndicatorCache(df)
+        engine._calculate_signals(df, strategy, own)
+        separate += own.computed
+
+    def per_strategy():
+        for ticker, df in frames.items():
+            for strategy in strategies:
+                engine._calculate_signals(df, strategy)
+
+    def memoized():
+        for ticker, df in frames.items():
+            indicators = IndicatorCache(df)
+            for strategy in strategies:
+                engine._calculate_signals(df, strategy, indicators)
+
+    t_separate = _timed(per_strategy, repeat=3)
+    t_shared = _timed(memoized, repeat=3)
+    print(f"compare: {len(strategies)} strategies compute {separate} indicators separately, "
+          f"{shared.computed} shared ({len(counts)} distinct moving averages, each once); signals for {len(frames)} tickers: {t_separate * 1000:.0f}ms -> "
+          f"{t_shared * 1000:.0f}ms ({t_separate / t_shared:.1f}x)")
+
+
+# The hand-written NumPy signals the templates replaced, kept to check the expressions
+_TEMPLATE_REFERENCES: Dict[str, Callable[..., np.ndarray]] = {
+    "SMA Crossover": lambda ind, fast, slow: np.where(ind.get('sma', fast) > ind.get('sma', slow), 1, -1),
+    "EMA Crossover": lambda ind, fast, slow: np.where(ind.get('ema', fast) > ind.get('ema', slow), 1, -1),
+    "RSI Mean Reversion": lambda ind, period, oversold, overbought: np.where(
+        ind.get('rsi', period) < oversold, 1, np.where(ind.get('rsi', period) > overbought, -1, 0)),
+    "MACD Signal": lambda ind, fast, slow, signal: np.where(
+        ind.get('macd', fast, slow, signal)['histogram'] > 0, 1, -1),
+    "Bollinger Band Bounce": lambda ind, period, std_dev: np.where(
+        ind.df['Close'] < ind.get('bollinger', period, std_dev)['lower'], 1,
+        np.where(ind.df['Close'] > ind.get('bollinger', period, std_dev)['upper'], -1, 0)),
+    "Triple EMA": lambda ind, fast, mid, slow: np.where(
+        (ind.get('ema', fast) > ind.get('ema', mid)) & (ind.get('ema', mid) > ind.get('ema', slow)), 1,
+        np.where((ind.get('ema', fast) < ind.get('ema', mid)) & (ind.get('ema', mid) < ind.get('ema', slow)), -1, 0)),
+    "Volume Breakout": lambda ind, period, multiplier: np.where(
+        (ind.df['Close'] > ind.get('sma', period)) & (ind.df['Volume'] > multiplier * ind.get('volume_sma', period)), 1,
+        np.where((ind.df['Close'] < ind.get('sma', period))
+                 & (ind.df['Volume'] > multiplier * ind.get('volume_sma', period)), -1, 0)),
+}
+
+
+def _check_strategy_definitions(df: pd.DataFrame):
+    """Built-in strategies, their templates and the reference signals must all agree."""
+    indicators = IndicatorCache(df)
+    assert set(_TEMPLATE_REFERENCES) == set(STRATEGY_TEMPLATES)
+    for template, spec in STRATEGY_TEMPLATES.items():
+        points = expand_grid(template, spec.default_grid)
+        for params, signal in zip(points, spec.signals(indicators, points)):
+            expected = _TEMPLATE_REFERENCES[template](indicators, **params)
+            assert np.array_equal(signal, expected), f"{template} {params}: template signal differs from reference"
+
+    assert set(NAMED_STRATEGIES) <= set(STRATEGY_REGISTRY)
+    for name, (template, params) in NAMED_STRATEGIES.items():
+        registered, derived = STRATEGY_REGISTRY[name], STRATEGY_TEMPLATES[template].spec(name, **params)
+        assert (registered.long, registered.short) == (derived.long, derived.short), f"{name} diverged from {template}"
+        expected = _TEMPLATE_REFERENCES[template](indicators, **params)
+        assert np.array_equal(evaluate_strategies(df, [name])[name], expected), f"{name} signal differs"
+
+
+def bench_strategies(period: str = "5y"):
+    """Hundreds of expression strategies: one merged program vs compiling each alone."""
+    df = _provider().history('RELIANCE.NS', period=period)
+    _check_strategy_definitions(df)
+    specs = [
+        StrategySpec(f"sma {fast}/{slow} rsi<{cap}",
+                     f"sma(close, {fast}) > sma(close, {slow}) and rsi(close) < {cap}",
+                     f"sma(close, {fast}) < sma(close, {slow})")
+        for fast in (5, 10, 15, 20, 30, 40) for slow in (50, 100, 150, 200, 250) for cap in range(60, 100, 4)
+    ]
+    program = compile_strategies(specs)
+    alone = [compile_strategies([spec]) for spec in specs]
+
+    t_batch = _timed(lambda: program.evaluate(df), repeat=3)
+    t_alone = _timed(lambda: [p.evaluate(df) for p in alone], repeat=3)
+    print(f"strategies: {len(specs)} expression strategies ({period}): {program.total_nodes} nodes -> "
+          f"{len(program.steps)} steps; one at a time {t_alone * 1000:.0f}ms, batched {t_batch * 1000:.0f}ms "
+          f"({t_alone / t_batch:.0f}x)")
+
+
+def _mfi_reference(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series,
+                   period: int = 14) -> pd.Series:
+    """The original per-row MFI loop, kept to check the vectorized version."""
+    typical_price = (high + low + close) / 3
+    raw_money_flow = typical_price * volume
+
+    positive_flow = pd.Series(0.0, index=close.index)
+    negative_flow = pd.Series(0.0, index=close.index)
+
+    for i in range(1, len(typical_price)):
+        if typical_price.iloc[i] > typical_price.iloc[i-1]:
+            positive_flow.iloc[i] = raw_money_flow.iloc[i]
+        elif typical_price.iloc[i] < typical_price.iloc[i-1]:
+            negative_flow.iloc[i] = raw_money_flow.iloc[i]
+
+    positive_mf = positive_flow.rolling(window=period).sum()
+    negative_mf = negative_flow.rolling(window=period).sum()
+    negative_mf_safe = negative_mf.replace(0, np.finfo(float).eps)
+    mfi = 100 - (100 / (1 + positive_mf / negative_mf_safe))
+    return mfi.fillna(50).clip(0, 100)
+
+
+def _cci_reference(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
+    """The original rolling().apply(lambda) CCI, kept to check the strided version."""
+    typical_price = (high + low + close) / 3
+    sma_tp = typical_price.rolling(window=period).mean()
+    mean_deviation = typical_price.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean())
+    mean_deviation_safe = mean_deviation.replace(0, np.finfo(float).eps)
+    cci = (typical_price - sma_tp) / (0.015 * mean_deviation_safe)
+    return cci.fillna(0)
+
+
+def _compare(name: str, reference: Callable, candidate: Callable, frames: Dict[str, pd.DataFrame],
+             exact: bool = True):
+    """Check candidate against reference on every frame, then time both."""
+    for df in frames.values():
+        expected, actual = reference(df), candidate(df)
+        if exact:
+            pd.testing.assert_series_equal(actual, expected, check_exact=True)
+        else:
+            pd.testing.assert_series_equal(actual, expected, rtol=1e-9, atol=1e-9)
+
+    t_ref = _timed(lambda: [reference(df) for df in frames.values()])
+    t_new = _timed(lambda: [candidate(df) for df in frames.values()], repeat=3)
+    bars = sum(len(df) for df in frames.values())
+    print(f"{name}: {len(frames)} ticker(s), {bars} bars: reference {t_ref * 1000:.1f}ms, "
+          f"vectorized {t_new * 1000:.1f}ms ({t_ref / t_new:.0f}x)")
+
+
+def bench_mfi(tickers: int = 500):
+    """Vectorized MFI vs the per-row loop on 5y of bars and on a full panel."""
+    provider = _provider()
+    args = lambda df: (df['High'], df['Low'], df['Close'], df['Volume'])
+    single = provider.download(['RELIANCE.NS'], period="5y")
+    panel = provider.download(get_all_stocks()[:tickers], period="5y")
+
+    _compare("mfi 5y", lambda df: _mfi_reference(*args(df)), lambda df: calculate_mfi(*args(df)), single)
+    _compare("mfi panel", lambda df: _mfi_reference(*args(df)), lambda df: calculate_mfi(*args(df)), panel)
+
+
+def bench_cci(tickers: int = 500):
+    """Strided-window CCI vs rolling().apply on 5y of bars and on a full panel."""
+    provider = _provider()
+    args = lambda df: (df['High'], df['Low'], df['Close'])
+    single = provider.download(['RELIANCE.NS'], period="5y")
+    panel = provider.download(get_all_stocks()[:tickers], period="5y")
+
+    _compare("cci 5y", lambda df: _cci_reference(*args(df)), lambda df: calculate_cci(*args(df)),
+             single, exact=False)
+    _compare("cci panel", lambda df: _cci_reference(*args(df)), lambda df: calculate_cci(*args(df)),
+             panel, exact=False)
+
+
+def bench_panel(tickers: int = 500, period: str = "1y"):
+    """One panel pass vs a per-ticker loop of the single-series indicators."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    high, low, close, volume = (to_wide_panel(frames, field) for field in ('High', 'Low', 'Close', 'Volume'))
+
+    def per_ticker():
+        for df in frames.values():
+            calculate_rsi(df['Close'])
+            calculate_adx(df['High'], df['Low'], df['Close'])
+            calculate_cci(df['High'], df['Low'], df['Close'])
+            calculate_mfi(df['High'], df['Low'], df['Close'], df['Volume'])
+
+    def panel():
+        panel_rsi(close)
+        panel_adx(high, low, close)
+        panel_cci(high, low, close)
+        panel_mfi(high, low, close, volume)
+
+    t_loop = _timed(per_ticker)
+    t_panel = _timed(panel, repeat=3)
+    print(f"panel: rsi+adx+cci+mfi on {len(frames)} tickers ({period}): per-ticker {t_loop * 1000:.0f}ms, "
+          f"panel {t_panel * 1000:.0f}ms ({t_loop / t_panel:.0f}x)")
+
+
+def bench_graph(tickers: int = 500, period: str = "1y"):
+    """Indicators sharing intermediates: separate panel calls vs one IndicatorGraph pass."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    panels = {field: to_wide_panel(frames, field) for field in ('High', 'Low', 'Close', 'Volume')}
+    high, low, close, volume = (panels[field] for field in ('High', 'Low', 'Close', 'Volume'))
+    indicators = ['rsi', 'obv', 'atr', 'adx', 'cci', 'mfi', 'vwap']
+
+    def separate():
+        return {
+            'rsi': panel_rsi(close), 'obv': panel_obv(close, volume),
+            'atr': panel_atr(high, low, close), 'adx': panel_adx(high, low, close),
+            'cci': panel_cci(high, low, close), 'mfi': panel_mfi(high, low, close, volume),
+            'vwap': panel_vwap(high, low, close, volume),
+        }
+
+    expected, graph = separate(), IndicatorGraph(panels)
+    for name, value in graph.evaluate(indicators).items():
+        pd.testing.assert_frame_equal(value, expected[name], check_exact=True)
+
+    t_separate = _timed(separate, repeat=3)
+    t_graph = _timed(lambda: IndicatorGraph(panels).evaluate(indicators), repeat=3)
+    print(f"graph: {', '.join(indicators)} on {len(frames)} tickers ({period}), {graph.computed} nodes, "
+          f"identical: separate {t_separate * 1000:.0f}ms, graph {t_graph * 1000:.0f}ms "
+          f"({t_separate / t_graph:.2f}x)")
+
+
+def bench_streaming(tickers: int = 500, period: str = "1y"):
+    """End-of-day update: one new bar per ticker, full recompute vs streaming state."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    states = {ticker: StreamingMetrics.from_history(df.iloc[:-1]) for ticker, df in frames.items()}
+
+    t_full = _timed(lambda: [calculate_all_metrics(df.copy(), ticker) for ticker, df in frames.items()])
+    # Each run advances a fresh copy of the seeded state by the last bar
+    snapshots = {ticker: state.to_dict() for ticker, state in states.items()}
+    t_stream = _timed(lambda: [StreamingMetrics.from_dict(snapshots[ticker]).update(df.iloc[-1])
+                               for ticker, df in frames.items()], repeat=3)
+    print(f"streaming: {len(frames)} tickers, 1 new bar: full recompute {t_full * 1000:.0f}ms, "
+          f"streaming {t_stream * 1000:.0f}ms ({t_full / t_stream:.0f}x, "
+          f"{t_stream / len(frames) * 1e6:.0f}us/ticker incl. state restore)")
+
+
+def _same(a, b) -> bool:
+    """Equality that treats NaN as equal to NaN, through lists and dataclasses."""
+    if dataclasses.is_dataclass(a):
+        return type(a) is type(b) and _same(dataclasses.astuple(a), dataclasses.astuple(b))
+    if isinstance(a, (list, tuple)):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b or (a != a and b != b)
+
+
+def _assert_same_result(expected, actual):
+    """Field-by-field equality of two BacktestResults (curves compared as values)."""
+    for field in dataclasses.fields(expected):
+        a, b = getattr(expected, field.name), getattr(actual, field.name)
+        if isinstance(a, pd.Series):
+            pd.testing.assert_series_equal(b, a, check_exact=True, check_dtype=False, check_freq=False)
+        else:
+            assert _same(a, b), f"{expected.strategy_name} {field.name}: {a!r} != {b!r}"
+
+
+def bench_selective_metrics(tickers: int = 500, period: str = "1y",
+                            metrics=('realized_volatility_20d', 'rsi_14', 'cci_20')):
+    """Regime pre-filter pass: every metric (and df columns) vs only the metrics the filter reads."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+
+    for ticker, df in frames.items():
+        full = calculate_all_metrics(df.copy(), ticker)
+        selected = calculate_all_metrics(df, ticker, metrics=list(metrics))
+        assert all(_same(selected[name], full[name]) for name in metrics), ticker
+        assert list(df.columns) == ['Open', 'High', 'Low', 'Close', 'Volume'], ticker
+
+    t_full = _timed(lambda: [calculate_all_metrics(df.copy(), ticker) for ticker, df in frames.items()])
+    t_selected = _timed(lambda: [calculate_all_metrics(df, ticker, metrics=list(metrics))
+                                 for ticker, df in frames.items()], repeat=3)
+    print(f"selective_metrics: {len(frames)} tickers, {len(metrics)}/{len(METRIC_NAMES)} metrics: "
+          f"all {t_full * 1000:.0f}ms, selected {t_selected * 1000:.0f}ms ({t_full / t_selected:.1f}x)")
+
+
+def bench_simulation(tickers: int = 20, period: str = "5y"):
+    """Vectorized trade simulation vs the per-bar reference loop."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    engine = BacktestEngine()
+    strategies = [s for s in AVAILABLE_STRATEGIES if s != "Buy and Hold"]
+
+    for ticker, df in frames.items():
+        for strategy in strategies:
+            _assert_same_result(engine.run_backtest(df, strategy, ticker, vectorized=False),
+                                engine.run_backtest(df, strategy, ticker))
+
+    signals = {(ticker, strategy): engine._calculate_signals(df, strategy)['signal']
+               for ticker, df in frames.items() for strategy in strategies}
+
+    def simulate(fn):
+        for (ticker, _), signal in signals.items():
+            fn(frames[ticker], signal)
+
+    t_loop = _timed(lambda: simulate(engine._simulate_loop))
+    t_vec = _timed(lambda: simulate(engine._simulate), repeat=3)
+    print(f"simulation: {len(signals)} runs ({period}), identical results: loop {t_loop * 1000:.0f}ms, "
+          f"vectorized {t_vec * 1000:.0f}ms ({t_loop / t_vec:.0f}x)")
+
+
+def bench_results(tickers: int = 20, period: str = "5y"):
+    """Retained size and speed of full, compact and summary-only backtest results."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    engine = BacktestEngine()
+
+    def run_all(detail, curve_points=None):
+        return [result for ticker, df in frames.items()
+                for result in engine.compare_strategies(df, AVAILABLE_STRATEGIES, ticker,
+                                                        detail=detail, curve_points=curve_points)]
+
+    for label, detail, curve_points in [("full", FULL, None), ("compact", COMPACT, None),
+                                        ("compact/252", COMPACT, 252), ("summary", SUMMARY, None)]:
+        results = run_all(detail, curve_points)
+        elapsed = _timed(lambda: run_all(detail, curve_points), repeat=3)
+        size = np.mean([len(pickle.dumps(result)) for result in results])
+        print(f"results {label}: {size / 1024:.1f} KB/result, {len(results)} runs in {elapsed * 1000:.0f}ms")
+
+
+def bench_resume(tickers: int = 50, period: str = "5y"):
+    """Nightly re-run: one new bar per ticker and strategy, full backtest vs resumed state."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    engine = BacktestEngine()
+
+    snapshots = {}
+    for ticker, df in frames.items():
+        for strategy in AVAILABLE_STRATEGIES:
+            state = ResumableBacktest.from_history(df.iloc[:-1], strategy, ticker, engine)
+            snapshots[ticker, strategy] = state.to_dict()
+            state.update(df)
+            _assert_same_result(engine.run_backtest(df, strategy, ticker), state.result())
+
+    t_full = _timed(lambda: [engine.run_backtest(frames[ticker], strategy, ticker, detail=SUMMARY)
+                             for ticker, strategy in snapshots])
+
+    def resume():
+        for (ticker, strategy), snapshot in snapshots.items():
+            state = ResumableBacktest.from_dict(snapshot)
+            state.update(frames[ticker].iloc[-1:])
+            state.result(SUMMARY)
+
+    t_resume = _timed(resume, repeat=3)
+    print(f"resume: {len(snapshots)} runs ({period}), 1 new bar, identical results: "
+          f"full {t_full * 1000:.0f}ms, resumed {t_resume * 1000:.0f}ms ({t_full / t_resume:.1f}x)")
+
+
+def _yfinance_stand_in(provider: OfflineProvider) -> Callable[..., pd.DataFrame]:
+    """yf.download replayed from provider, rejecting the period names yfinance rejects."""
+    def download(tickers, period=None, interval="1d", start=None, end=None, **kwargs):
+        if period is not None and period not in YFINANCE_PERIODS:
+            raise ValueError(f"Period {period!r} is invalid")  # yfinance raises YFInvalidPeriodError
+        frames = provider.download(tickers, period=period or "max", interval=interval, start=start, end=end)
+        return pd.concat(frames, axis=1) if frames else pd.DataFrame()
+    return download
+
+
+def bench_backtest_job(tickers: int = 20, period: str = "3y"):
+    """Backtest tab jobs on a cold store, fetched through YFinanceProvider for a period yfinance cannot name."""
+    offline = _provider()
+    provider = YFinanceProvider(downloader=_yfinance_stand_in(offline))
+    universe = get_all_stocks()[:tickers]
+    jobs = BacktestJobManager()
+    engine = BacktestEngine()
+
+    with tempfile.TemporaryDirectory() as root:
+        store = OHLCVStore(root)
+
+        def submit(ticker):
+            def run(progress):
+                df = store.refresh([ticker], period, provider).get(ticker)
+                if df is None or len(df) < 30:
+                    raise ValueError(f"Not enough data for {ticker}")
+                return engine.compare_strategies(df, AVAILABLE_STRATEGIES, ticker, progress_callback=progress)
+            return jobs.submit(('backtest', ticker, period), run)
+
+        def run_all():
+            submitted = [submit(ticker) for ticker in universe]
+            while any(job.active for job in submitted):
+                time.sleep(0.01)
+            return submitted
+
+        t_jobs = _timed(run_all)
+        for job in run_all():
+            ticker = job.key[1]
+            assert job.status == DONE, (ticker, job.error)
+            df = offline.download([ticker], start=period_start(period))[ticker]
+            for a, b in zip(engine.compare_strategies(df, AVAILABLE_STRATEGIES, ticker), job.result):
+                _assert_same_result(a, b)
+    print(f"backtest_job: {len(universe)} tickers x {len(AVAILABLE_STRATEGIES)} strategies ({period}, cold store) "
+          f"in {t_jobs:.2f}s, identical to the offline history")
+
+
+def bench_result_cache(tickers: int = 20, period: str = "5y"):
+    """Repeated backtests: recomputed vs served from the memory and disk tiers of the result cache."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+
+    def run_all(engine):
+        return [result for ticker, df in frames.items()
+                for result in engine.compare_strategies(df, AVAILABLE_STRATEGIES, ticker)]
+
+    with tempfile.TemporaryDirectory() as root:
+        cached = BacktestEngine(result_cache=ResultCache(root=root, max_entries=10000))
+        expected = run_all(BacktestEngine())
+        t_cold = _timed(lambda: run_all(cached))
+        for a, b in zip(expected, run_all(cached)):
+            _assert_same_result(a, b)
+        t_memory = _timed(lambda: run_all(cached), repeat=3)
+        # A fresh cache on the same directory: another session, or after a restart
+        t_disk = _timed(lambda: run_all(BacktestEngine(result_cache=ResultCache(root=root))), repeat=3)
+
+        # Bars that differ from the cached run (here: one bar fewer) hash to a new key
+        misses = cached.result_cache.misses
+        cached.run_backtest(next(iter(frames.values())).iloc[:-1], AVAILABLE_STRATEGIES[1])
+        assert cached.result_cache.misses == misses + 1
+
+    print(f"result_cache: {len(expected)} runs ({period}): compute + store {t_cold * 1000:.0f}ms, "
+          f"memory {t_memory * 1000:.1f}ms, disk {t_disk * 1000:.0f}ms")
+
+
+def _buy_and_hold_reference(close: pd.Series, initial_capital: float):
+    """The original bar-by-bar Buy and Hold equity loop, kept to check the vectorized curve."""
+    equity_values = [initial_capital]
+    for i in range(1, len(close)):
+        daily_return = close.iloc[i] / close.iloc[i-1]
+        equity_values.append(equity_values[-1] * daily_return)
+    return equity_values
+
+
+def bench_buy_and_hold(tickers: int = 100, period: str = "max"):
+    """Buy and Hold benchmark equity: per-bar loop vs cumulative product."""
+    provider = _provider()
+    frames = provider.download(get_all_stocks()[:tickers], period=period)
+    closes = [df['Close'] for df in frames.values()]
+
+    for close in closes:
+        assert np.array_equal(buy_and_hold_equity(close.to_numpy(), 100000),
+                              np.array(_buy_and_hold_reference(close, 100000)), equal_nan=True)
+
+    t_loop = _timed(lambda: [_buy_and_hold_reference(close, 100000) for close in closes])
+    t_vec = _timed(lambda: [buy_and_hold_equity(close.to_numpy(), 100000) for close in closes], repeat=3)
+    bars = sum(len(close) for close in closes)
+    print(f"buy_and_hold: {len(closes)} tickers, {bars} bars, identical curves: loop {t_loop * 1000:.0f}ms, "
+          f"cumprod {t_vec * 1000:.1f}ms ({t_loop / t_vec:.0f}x)")
+
+
+def _curve_metrics_reference(equity: pd.Series) -> Dict[str, float]:
+    """The original one-curve pandas metrics, kept to check the batched kernel."""
+    rolling_max = equity.expanding().max()
+    drawdown_pct = (equity - rolling_max) / rolling_max * 100
+    returns = equity.pct_change().dropna()
+    negative_returns = returns[returns < 0]
+    return {
+        'max_drawdown_pct': drawdown_pct.min(),
+        'sharpe_ratio': returns.mean() / returns.std() * np.sqrt(252) if returns.std() > 0 else 0,
+        'sortino_ratio': returns.mean() / negative_returns.std() * np.sqrt(252) if negative_returns.std() > 0 else 0,
+    }
+
+
+def bench_metrics(curves: int = 2000, bars: int = 1260):
+    """Risk metrics of many equity curves: one pandas pass per curve vs the batched kernel."""
+    rng = np.random.default_rng(7)
+    panel = pd.DataFrame(100000 * np.cumprod(1 + rng.normal(0.0004, 0.015, (bars, curves)), axis=0),
+                         index=pd.bdate_range('2020-01-01', periods=bars))
+
+    batched = equity_metrics(panel)
+    for column in panel.columns[:200]:
+        for metric, value in _curve_metrics_reference(panel[column]).items():
+            assert np.isclose(batched.at[column, metric], value, rtol=1e-9), (column, metric)
+
+    t_loop = _timed(lambda: [_curve_metrics_reference(panel[column]) for column in panel.columns])
+    t_batch = _timed(lambda: equity_metrics(panel), repeat=3)
+    print(f"metrics: {curves} curves x {bars} bars: per curve {t_loop * 1000:.0f}ms, "
+          f"batched {t_batch * 1000:.0f}ms ({t_loop / t_batch:.0f}x)")
+
+
+BENCHMARKS: Dict[str, Callable] = {
+    'screener': bench_screener,
+    'backtest': bench_backtest,
+    'compare': bench_compare,
+    'strategies': bench_strategies,
+    'simulation': bench_simulation,
+    'universe': bench_universe,
+    'optimizer': bench_optimizer,
+    'walk_forward': bench_walk_forward,
+    'mfi': bench_mfi,
+    'cci': bench_cci,
+    'panel': bench_panel,
+    'streaming': bench_streaming,
+    'results': bench_results,
+    'metrics': bench_metrics,
+    'resume': bench_resume,
+    'result_cache': bench_result_cache,
+    'backtest_job': bench_backtest_job,
+    'buy_and_hold': bench_buy_and_hold,
+    'selective_metrics': bench_selective_metrics,
+    'graph': bench_graph,
+}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline throughput benchmarks")
+    parser.add_argument('names', nargs='*', help=f"Benchmarks to run: {', '.join(BENCHMARKS)} (default: all)")
+    args = parser.parse_args()
+
+    unknown = [name for name in args.names if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"unknown benchmark(s): {', '.join(unknown)}")
+
+    for name in args.names or BENCHMARKS:
+        BENCHMARKS[name]()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,219 @@
+"""
+MARKET DATA PROVIDERS
+=====================
+Pluggable sources of OHLCV history.
+
+- YFinanceProvider: live data through batched yf.download calls
+- OfflineProvider: replays local Parquet/CSV files or deterministic
+  synthetic bars, for reproducible benchmarks without network access
+
+The active provider is chosen with the MARKET_DATA_PROVIDER environment
+variable ("yfinance" or "offline"); OFFLINE_DATA_DIR points the offline
+provider at a directory of files.
+"""
+
+import os
+import threading
+import zlib
+from abc import ABC, abstractmethod
+from typing import Callable, Dict, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from market_data import fetch_ohlcv_bulk, slice_period, ticker_filename, DEFAULT_CHUNK_SIZE, OHLCV_COLUMNS
+
+
+class MarketDataProvider(ABC):
+    """Base class for OHLCV sources; subclasses implement download()."""
+
+    name = "base"
+    remote = False  # True if fetches cost a network round-trip
+
+    @abstractmethod
+    def download(self, tickers: Sequence[str], period: str = "6mo", interval: str = "1d",
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        """
+        Fetch OHLCV history for many tickers.
+
+        Args:
+            tickers: Ticker symbols
+            period: yfinance period string ("5d", "3mo", "1y", ...)
+            interval: Bar interval
+            start: Fetch bars from this date onwards instead of a whole period
+            end: With start, stop before this date (exclusive)
+
+        Returns:
+            Dict of ticker -> DataFrame; tickers without data are left out
+        """
+
+    def history(self, ticker: str, period: str = "6mo", interval: str = "1d",
+                start: Optional[pd.Timestamp] = None,
+                end: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """Fetch OHLCV history for one ticker (None if unavailable)."""
+        return self.download([ticker], period=period, interval=interval, start=start, end=end).get(ticker)
+
+
+class YFinanceProvider(MarketDataProvider):
+    """Live Yahoo Finance data via batched downloads."""
+
+    name = "yfinance"
+    remote = True
+
+    def __init__(self, chunk_size: int = DEFAULT_CHUNK_SIZE,
+                 downloader: Optional[Callable[..., pd.DataFrame]] = None):
+        """
+        Args:
+            chunk_size: Maximum tickers per download request
+            downloader: yf.download-compatible callable (a local stand-in in benchmarks)
+        """
+        self.chunk_size = chunk_size
+        self.downloader = downloader
+
+    def download(self, tickers: Sequence[str], period: str = "6mo", interval: str = "1d",
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        return fetch_ohlcv_bulk(tickers, period=period, interval=interval, chunk_size=self.chunk_size,
+                                downloader=self.downloader, start=start, end=end)
+
+
+class OfflineProvider(MarketDataProvider):
+    """
+    Replay provider for air-gapped runs.
+
+    Looks for <ticker>.parquet (the OHLCVStore layout) or <ticker>.csv in
+    data_dir. Tickers without a file get synthetic daily bars: a geometric
+    random walk seeded from (seed, ticker), so every run sees identical data.
+    """
+
+    name = "offline"
+
+    def __init__(self, data_dir: Optional[str] = None, synthetic: bool = True,
+                 end_date: str = "2026-01-30", history_days: int = 2520, seed: int = 7):
+        """
+        Args:
+            data_dir: Directory of Parquet/CSV files (optional)
+            synthetic: Generate bars for tickers without a file
+            end_date: Last synthetic bar date (fixed for reproducibility)
+            history_days: Number of synthetic daily bars per ticker
+            seed: Base random seed for synthetic data
+        """
+        self.data_dir = data_dir
+        self.synthetic = synthetic
+        self.end_date = pd.Timestamp(end_date)
+        self.history_days = history_days
+        self.seed = seed
+        self._frames = {}
+        self._dates = None
+        self._lock = threading.Lock()
+
+    def __getstate__(self):
+        # Worker processes rebuild the frame cache lazily
+        state = self.__dict__.copy()
+        state['_frames'] = {}
+        state['_dates'] = None
+        del state['_lock']
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self._lock = threading.Lock()
+
+    def download(self, tickers: Sequence[str], period: str = "6mo", interval: str = "1d",
+                 start: Optional[pd.Timestamp] = None,
+                 end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+        if interval != "1d":
+            raise ValueError(f"OfflineProvider only serves daily bars, not {interval}")
+
+        frames = {}
+        for ticker in dict.fromkeys(tickers):
+            df = self._load(ticker)
+            if df is None or df.empty:
+                continue
+            if start is not None:
+                first = df.index.searchsorted(pd.Timestamp(start))
+                last = df.index.searchsorted(pd.Timestamp(end)) if end is not None else len(df)
+                df = df.iloc[first:last]
+            else:
+                df = slice_period(df, period)
+            if not df.empty:
+                frames[ticker] = df
+        return frames
+
+    def _load(self, ticker: str) -> Optional[pd.DataFrame]:
+        with self._lock:
+            if ticker in self._frames:
+                return self._frames[ticker]
+
+        df = self._read_file(ticker)
+        if df is None and self.synthetic:
+            df = self._synthesize(ticker)
+
+        with self._lock:
+            self._frames[ticker] = df
+        return df
+
+    def _read_file(self, ticker: str) -> Optional[pd.DataFrame]:
+        if not self.data_dir:
+            return None
+
+        parquet_path = os.path.join(self.data_dir, ticker_filename(ticker, 'parquet'))
+        csv_path = os.path.join(self.data_dir, ticker_filename(ticker, 'csv'))
+
+        if os.path.exists(parquet_path):
+            df = pd.read_parquet(parquet_path)
+        elif os.path.exists(csv_path):
+            df = pd.read_csv(csv_path, index_col=0, parse_dates=True)
+        else:
+            return None
+        return df[[col for col in OHLCV_COLUMNS if col in df.columns]].sort_index()
+
+    def _synthesize(self, ticker: str) -> pd.DataFrame:
+        rng = np.random.default_rng([self.seed, zlib.crc32(ticker.encode())])
+        n = self.history_days
+        if self._dates is None:
+            # Shared by every synthetic ticker
+            self._dates = pd.bdate_range(end=self.end_date, periods=n, name='Date')
+        dates = self._dates
+
+        drift = rng.uniform(-0.0002, 0.0008)
+        vol = rng.uniform(0.01, 0.03)
+        start_price = rng.uniform(50, 5000)
+
+        log_returns = rng.normal(drift, vol, n)
+        close = start_price * np.exp(np.cumsum(log_returns))
+        open_ = np.concatenate([[start_price], close[:-1]]) * (1 + rng.normal(0, vol / 4, n))
+        high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, vol / 2, n)))
+        low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, vol / 2, n)))
+        volume = np.round(rng.lognormal(13, 0.5, n))
+
+        return pd.DataFrame({
+            'Open': open_, 'High': high, 'Low': low, 'Close': close, 'Volume': volume
+        }, index=dates)
+
+
+_provider = None
+_provider_lock = threading.Lock()
+
+
+def get_provider() -> MarketDataProvider:
+    """Process-wide provider selected by MARKET_DATA_PROVIDER."""
+    global _provider
+    with _provider_lock:
+        if _provider is None:
+            name = os.environ.get('MARKET_DATA_PROVIDER', 'yfinance').lower()
+            if name == 'offline':
+                _provider = OfflineProvider(data_dir=os.environ.get('OFFLINE_DATA_DIR'))
+            elif name == 'yfinance':
+                _provider = YFinanceProvider()
+            else:
+                raise ValueError(f"Unknown MARKET_DATA_PROVIDER: {name}")
+        return _provider
+
+
+def set_provider(provider: MarketDataProvider):
+    """Replace the process-wide provider (benchmarks, load tests)."""
+    global _provider
+    with _provider_lock:
+        _provider = provider
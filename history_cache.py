@@ -0,0 +1,116 @@
+"""
+HISTORY CACHE MODULE
+====================
+In-memory period-superset cache of OHLCV history.
+
+Only the longest history requested so far is kept per ticker. A "3mo"
+request after a "5y" request is a zero-copy slice of the 5y frame, and a
+"5y" request after a "3mo" request extends the stored history instead of
+starting over. Entries are refreshed according to the NSE calendar, so
+nothing is refetched between the close and the next session.
+"""
+
+import threading
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Sequence
+
+import pandas as pd
+
+from market_data import period_start, slice_period
+from nse_calendar import is_stale, now_ist, DEFAULT_INTRADAY_TTL
+from singleflight import SingleFlight
+
+
+@dataclass
+class _Entry:
+    df: pd.DataFrame
+    period: str          # Longest period loaded for the ticker
+    covered_from: pd.Timestamp
+    fetched_at: datetime
+
+
+class HistoryCache:
+    """
+    Keeps the longest fetched history per ticker.
+
+    The loader is called as loader(tickers, period) and returns a dict of
+    ticker -> DataFrame; loading through the OHLCVStore means a longer period
+    only downloads the missing older bars. Concurrent loads of the same
+    (ticker, period) are coalesced into one loader call.
+    """
+
+    def __init__(self, intraday_ttl: float = DEFAULT_INTRADAY_TTL):
+        self.intraday_ttl = intraday_ttl
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = threading.Lock()
+        self._inflight = SingleFlight()
+
+    def get(self, tickers: Sequence[str], period: str,
+            loader: Callable[[List[str], str], Dict[str, pd.DataFrame]]) -> Dict[str, pd.DataFrame]:
+        """
+        Return history for tickers covering period, loading only what is missing.
+
+        Args:
+            tickers: Ticker symbols
+            period: yfinance period string
+            loader: Fetches (tickers, period) -> dict of frames
+
+        Returns:
+            Dict of ticker -> DataFrame (slices of the cached superset)
+        """
+        required_from = period_start(period)
+        now = now_ist()
+        to_load: Dict[str, List[str]] = {}
+
+        with self._lock:
+            for ticker in dict.fromkeys(tickers):
+                entry = self._entries.get(ticker)
+                if entry is None or entry.covered_from > required_from:
+                    to_load.setdefault(period, []).append(ticker)
+                elif is_stale(entry.fetched_at, now, self.intraday_ttl):
+                    # Stale: reload the whole superset so it stays the longest copy
+                    to_load.setdefault(entry.period, []).append(ticker)
+
+        for load_period, group in to_load.items():
+            load_from = period_start(load_period)
+
+            def load(keys: List[tuple]) -> Dict[tuple, bool]:
+                frames = loader([ticker for ticker, _ in keys], load_period)
+                with self._lock:
+                    for ticker, df in frames.items():
+                        self._store(ticker, df, load_period, load_from, now)
+                return {(ticker, load_period): True for ticker in frames}
+
+            # Concurrent sessions loading the same (ticker, period) share one fetch
+            self._inflight.do_batch([(ticker, load_period) for ticker in group], load)
+
+        with self._lock:
+            return {
+                ticker: slice_period(self._entries[ticker].df, period)
+                for ticker in dict.fromkeys(tickers)
+                if ticker in self._entries
+            }
+
+    def _store(self, ticker: str, df: pd.DataFrame, period: str,
+               covered_from: pd.Timestamp, fetched_at: datetime):
+        entry = self._entries.get(ticker)
+        if entry is not None and entry.covered_from < covered_from:
+            # Keep the older bars the new load did not reach back to
+            older = entry.df.iloc[:entry.df.index.searchsorted(df.index[0])]
+            df = pd.concat([older, df]) if len(older) else df
+            period, covered_from = entry.period, entry.covered_from
+        self._entries[ticker] = _Entry(df, period, covered_from, fetched_at)
+
+    def clear(self):
+        """Drop every cached history."""
+        with self._lock:
+            self._entries.clear()
+
+
+_history_cache = HistoryCache()
+
+
+def get_history_cache() -> HistoryCache:
+    """Process-wide history cache shared by all Streamlit sessions."""
+    return _history_cache
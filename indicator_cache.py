@@ -0,0 +1,81 @@
+"""
+INDICATOR CACHE MODULE
+======================
+Per-DataFrame memo of indicator series.
+
+Strategy signal generators ask the cache for indicators by name and
+parameters, e.g. cache.get('sma', 20); each distinct (name, parameters)
+series is computed once and then shared by every strategy or parameter
+combination that needs it.
+
+Named indicators are nodes of an IndicatorGraph (indicator_graph.py), so
+their intermediates are shared as well: Bollinger Bands read the ('sma',
+period) node, MACD the ('ema', fast) and ('ema', slow) nodes and every RSI
+the close delta. The same graph can back the metric pass of
+indicators.calculate_all_metrics, so strategies and metrics on one frame
+share a single set of intermediates.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+import pandas as pd
+
+from indicator_graph import IndicatorGraph
+
+# name -> IndicatorGraph node
+INDICATORS: Dict[str, str] = {
+    'sma': 'sma',
+    'ema': 'ema',
+    'rsi': 'rsi',
+    'macd': 'macd',
+    'bollinger': 'bollinger',
+    'volume_sma': 'volume_sma',
+}
+
+
+class IndicatorCache:
+    """Computes each (indicator, parameters) series once per DataFrame."""
+
+    def __init__(self, df: pd.DataFrame, graph: Optional[IndicatorGraph] = None):
+        """
+        Args:
+            df: OHLCV DataFrame
+            graph: IndicatorGraph of df to share (e.g. with a MetricContext)
+        """
+        self.df = df
+        self.graph = graph if graph is not None else IndicatorGraph(df)
+        self._memo_computed = 0
+        self._series: Dict[Tuple[Hashable, ...], Any] = {}
+
+    @property
+    def computed(self) -> int:
+        """Number of series computations (graph nodes and memo misses)."""
+        return self.graph.computed + self._memo_computed
+
+    def get(self, name: str, *params) -> Any:
+        """
+        Indicator series for the cached DataFrame.
+
+        Args:
+            name: Key in INDICATORS ('sma', 'ema', 'rsi', 'macd', 'bollinger', 'volume_sma')
+            *params: Indicator parameters, e.g. get('macd', 12, 26, 9)
+
+        Returns:
+            Series (or dict of Series for macd/bollinger)
+        """
+        key = (name,) + params
+        value = self._series.get(key)
+        if value is None:
+            value = self._series[key] = self.graph.get(INDICATORS[name], *params)
+        return value
+
+    def memo(self, key: Tuple[Hashable, ...], compute: Callable[[], Any]) -> Any:
+        """Cached value for key, calling compute() on the first request."""
+        value = self._series.get(key)
+        if value is None:
+            value = self._series[key] = compute()
+            self._memo_computed += 1
+        return value
+
+    def __len__(self) -> int:
+        return len(self._series)
@@ -0,0 +1,160 @@
+"""
+INDICATOR GRAPH MODULE
+======================
+Indicators as a dependency graph whose intermediate series are shared.
+
+Every node is named by a key (name, *params), e.g. ('atr', 14), and lists the
+nodes it reads. Intermediates are nodes too, so a graph computes each of
+them once per frame and hands it to every indicator downstream:
+
+    true_range       -> atr -> adx
+    typical_price    -> cci, mfi, vwap
+    delta (close change) -> rsi, obv, momentum
+    sma, ema         -> bollinger, macd
+
+Node functions are the kernels behind panel_indicators.py, so every value
+is identical to the matching calculate_* / panel_* function.
+
+    graph = IndicatorGraph(df)                      # one ticker's OHLCV bars
+    values = graph.evaluate(['rsi', ('atr', 14), 'adx', 'cci', 'mfi'])
+
+A graph can also run on (dates x tickers) panels, given as a dict of field
+name -> wide DataFrame, and then returns panels.
+"""
+
+from typing import Any, Callable, Dict, Hashable, Iterable, Tuple, Union
+
+import pandas as pd
+
+from panel_indicators import (
+    _adx, _atr, _bollinger_bands, _cci, _macd, _mfi, _obv, _rsi, _true_range, _typical_price, _vwap,
+    panel_roc, panel_stochastic, panel_williams_r
+)
+
+Key = Tuple[Hashable, ...]
+
+REQUIRED = None  # Parameter without a default
+
+# Input nodes: key name -> OHLCV column
+FIELDS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+_HLC = [('high',), ('low',), ('close',)]
+
+# name -> (parameter defaults, inputs(*params) -> node keys, fn(*input values, *params))
+NODES: Dict[str, Tuple[Tuple, Callable[..., list], Callable[..., Any]]] = {
+    # Intermediates
+    'delta': ((1,), lambda n: [('close',)], lambda close, n: close.diff(n)),
+    'true_range': ((), lambda: _HLC, _true_range),
+    'typical_price': ((), lambda: _HLC, _typical_price),
+    'sma': ((REQUIRED,), lambda period: [('close',)], lambda close, period: close.rolling(window=period).mean()),
+    'ema': ((REQUIRED,), lambda period: [('close',)], lambda close, period: close.ewm(span=period, adjust=False).mean()),
+    'volume_sma': ((REQUIRED,), lambda period: [('volume',)],
+                   lambda volume, period: volume.rolling(window=period).mean()),
+
+    # Indicators
+    'rsi': ((14,), lambda period: [('delta', 1)], _rsi),
+    'macd': ((12, 26, 9), lambda fast, slow, signal: [('ema', fast), ('ema', slow)],
+             lambda fast_ema, slow_ema, fast, slow, signal: _macd(fast_ema, slow_ema, signal)),
+    'bollinger': ((20, 2), lambda period, std_dev: [('close',), ('sma', period)], _bollinger_bands),
+    'atr': ((14,), lambda period: [('true_range',)], _atr),
+    'adx': ((14,), lambda period: [('high',), ('low',), ('atr', period)], _adx),
+    'stochastic': ((14, 3), lambda k_period, d_period: _HLC, panel_stochastic),
+    'obv': ((), lambda: [('delta', 1), ('volume',)], _obv),
+    'vwap': ((), lambda: [('typical_price',), ('volume',)], _vwap),
+    'momentum': ((10,), lambda period: [('delta', period)], lambda delta, period: delta),
+    'roc': ((10,), lambda period: [('close',)], panel_roc),
+    'williams_r': ((14,), lambda period: _HLC, panel_williams_r),
+    'cci': ((20,), lambda period: [('typical_price',)], _cci),
+    'mfi': ((14,), lambda period: [('typical_price',), ('volume',)], _mfi),
+}
+
+
+def node_key(name: str, *params) -> Key:
+    """Canonical key of a node, with default parameters filled in."""
+    if name in FIELDS:
+        if params:
+            raise ValueError(f"Input {name!r} takes no parameters")
+        return (name,)
+    if name not in NODES:
+        raise ValueError(f"Unknown indicator {name!r}")
+    defaults = NODES[name][0]
+    if len(params) > len(defaults):
+        raise ValueError(f"{name} takes at most {len(defaults)} parameter(s), got {len(params)}")
+    params = params + defaults[len(params):]
+    if REQUIRED in params:
+        raise ValueError(f"{name} needs {len(defaults)} parameter(s)")
+    return (name,) + params
+
+
+class IndicatorGraph:
+    """Indicator nodes over one set of OHLCV inputs, each computed at most once."""
+
+    def __init__(self, data: Union[pd.DataFrame, Dict[str, pd.DataFrame]]):
+        """
+        Args:
+            data: One ticker's OHLCV DataFrame, or a dict of field ('Close' or
+                'close', ...) -> (dates x tickers) panel
+        """
+        self._single = not isinstance(data, dict)
+        if self._single:
+            self._inputs = {name: data[column] for name, column in FIELDS.items() if column in data}
+        else:
+            self._inputs = {name: data[key] for name, column in FIELDS.items()
+                            for key in (column, name) if key in data}
+        self.values: Dict[Key, Any] = {}
+        self.computed = 0  # Number of node computations (inputs excluded)
+
+    def get(self, name: str, *params) -> Any:
+        """
+        One indicator, e.g. get('macd', 12, 26, 9).
+
+        Returns:
+            Series for a single frame, panel for panel inputs (a dict of
+            them for macd/bollinger/stochastic)
+        """
+        return self._out(self._value(node_key(name, *params)))
+
+    def evaluate(self, indicators: Iterable[Union[str, Key]]) -> Dict[Union[str, Key], Any]:
+        """
+        Evaluate a set of indicators, sharing every common intermediate.
+
+        Args:
+            indicators: Names ('rsi') or (name, *params) tuples (('atr', 20))
+
+        Returns:
+            Dict of each requested item -> its value (as in get())
+        """
+        results = {}
+        for item in indicators:
+            name, params = (item, ()) if isinstance(item, str) else (item[0], tuple(item[1:]))
+            results[item] = self.get(name, *params)
+        return results
+
+    def _value(self, key: Key) -> Any:
+        value = self.values.get(key)
+        if value is not None:
+            return value
+
+        name = key[0]
+        if name in FIELDS:
+            if name not in self._inputs:
+                raise ValueError(f"Input {FIELDS[name]} is missing")
+            value = self._inputs[name]  # A Series for a single frame: the kernels take either
+        else:
+            params = key[1:]
+            _, inputs, fn = NODES[name]
+            value = fn(*[self._value(node) for node in inputs(*params)], *params)
+            self.computed += 1
+        self.values[key] = value
+        return value
+
+    def _out(self, value: Any) -> Any:
+        if isinstance(value, dict):
+            return {part: self._out(panel) for part, panel in value.items()}
+        return value.rename(None) if self._single else value
+
+
+def evaluate_indicators(data: Union[pd.DataFrame, Dict[str, pd.DataFrame]],
+                        indicators: Iterable[Union[str, Key]]) -> Dict[Union[str, Key], Any]:
+    """Evaluate indicators on data in one pass (see IndicatorGraph.evaluate)."""
+    return IndicatorGraph(data).evaluate(indicators)
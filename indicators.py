@@ -4,11 +4,28 @@ TECHNICAL INDICATORS MODULE v7.0
 UPDATES:
 - ✅ Fixed RSI division by zero error
 - ✅ Added safety checks for all division operations
+- ✅ Single-series indicators are thin wrappers over panel_indicators
 """
 
 import pandas as pd
 import numpy as np
-from typing import Dict, Any, Optional
+from typing import Dict, Any, Optional, Sequence
+
+from indicator_graph import IndicatorGraph
+from panel_indicators import (
+    panel_rsi, panel_macd, panel_bollinger_bands, panel_adx, panel_atr, panel_stochastic,
+    panel_obv, panel_vwap, panel_roc, panel_williams_r, panel_rolling_mean_deviation, panel_cci, panel_mfi
+)
+
+
+def _frame(data: pd.Series) -> pd.DataFrame:
+    """One-column panel for the panel_* kernels (same column label for every input)."""
+    return data.to_frame(name=0)
+
+
+def _series(panel: pd.DataFrame, name=None) -> pd.Series:
+    """Single column of a panel_* result as a Series."""
+    return panel.iloc[:, 0].rename(name)
 
 
 def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
@@ -17,112 +34,46 @@ def calculate_rsi(data: pd.Series, period: int = 14) -> pd.Series:
     
     v7.0 FIX: Handles cases where stocks don't move (loss = 0)
     """
-    delta = data.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-    
-    # FIX: Prevent division by zero
-    # When loss is 0 or very small, RSI should be 100 (all gains, no losses)
-    rs = gain / loss.replace(0, np.finfo(float).eps)  # Replace 0 with tiny number
-    rsi = 100 - (100 / (1 + rs))
-    
-    # Handle edge cases
-    rsi = rsi.fillna(50)  # Neutral RSI if calculation fails
-    rsi = rsi.clip(0, 100)  # Ensure RSI stays in 0-100 range
-    
-    return rsi
+    return _series(panel_rsi(_frame(data), period), data.name)
 
 
 def calculate_macd(data: pd.Series, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, pd.Series]:
     """Calculate MACD indicator."""
-    exp1 = data.ewm(span=fast, adjust=False).mean()
-    exp2 = data.ewm(span=slow, adjust=False).mean()
-    macd_line = exp1 - exp2
-    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
-    histogram = macd_line - signal_line
-    return {'macd': macd_line, 'signal': signal_line, 'histogram': histogram}
+    macd = panel_macd(_frame(data), fast, slow, signal)
+    return {key: _series(value, data.name) for key, value in macd.items()}
 
 
 def calculate_bollinger_bands(data: pd.Series, period: int = 20, std_dev: int = 2) -> Dict[str, pd.Series]:
     """Calculate Bollinger Bands with division protection."""
-    sma = data.rolling(window=period).mean()
-    std = data.rolling(window=period).std()
-    upper = sma + (std * std_dev)
-    lower = sma - (std * std_dev)
-    
-    # Protect against division by zero in width calculation
-    width = ((upper - lower) / sma.replace(0, np.finfo(float).eps)) * 100
-    width = width.fillna(0)
-    
-    return {'upper': upper, 'middle': sma, 'lower': lower, 'width': width}
+    bands = panel_bollinger_bands(_frame(data), period, std_dev)
+    return {key: _series(value, data.name) for key, value in bands.items()}
 
 
 def calculate_adx(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
     """Calculate Average Directional Index with safety checks."""
-    plus_dm = high.diff()
-    minus_dm = low.diff()
-    plus_dm[plus_dm < 0] = 0
-    minus_dm[minus_dm > 0] = 0
-    
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    
-    atr = tr.rolling(window=period).mean()
-    
-    # Protect against division by zero
-    atr_safe = atr.replace(0, np.finfo(float).eps)
-    plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr_safe)
-    minus_di = abs(100 * (minus_dm.rolling(window=period).mean() / atr_safe))
-    
-    # Protect against division by zero in DX calculation
-    di_sum = (plus_di + minus_di).replace(0, np.finfo(float).eps)
-    dx = (abs(plus_di - minus_di) / di_sum) * 100
-    adx = dx.rolling(window=period).mean()
-    
-    return adx.fillna(0)
+    return _series(panel_adx(_frame(high), _frame(low), _frame(close), period))
 
 
 def calculate_atr(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
     """Calculate Average True Range."""
-    tr1 = high - low
-    tr2 = abs(high - close.shift())
-    tr3 = abs(low - close.shift())
-    tr = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-    return tr.rolling(window=period).mean()
+    return _series(panel_atr(_frame(high), _frame(low), _frame(close), period))
 
 
 def calculate_stochastic(high: pd.Series, low: pd.Series, close: pd.Series, 
                          k_period: int = 14, d_period: int = 3) -> Dict[str, pd.Series]:
     """Calculate Stochastic Oscillator with division protection."""
-    lowest_low = low.rolling(window=k_period).min()
-    highest_high = high.rolling(window=k_period).max()
-    
-    # Protect against division by zero
-    range_val = (highest_high - lowest_low).replace(0, np.finfo(float).eps)
-    k = 100 * (close - lowest_low) / range_val
-    k = k.fillna(50).clip(0, 100)
-    
-    d = k.rolling(window=d_period).mean()
-    return {'k': k, 'd': d}
+    stoch = panel_stochastic(_frame(high), _frame(low), _frame(close), k_period, d_period)
+    return {key: _series(value) for key, value in stoch.items()}
 
 
 def calculate_obv(close: pd.Series, volume: pd.Series) -> pd.Series:
     """Calculate On-Balance Volume."""
-    obv = (np.sign(close.diff()) * volume).fillna(0).cumsum()
-    return obv
+    return _series(panel_obv(_frame(close), _frame(volume)))
 
 
 def calculate_vwap(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series) -> pd.Series:
     """Calculate Volume Weighted Average Price with safety."""
-    typical_price = (high + low + close) / 3
-    
-    # Protect against zero volume
-    volume_safe = volume.replace(0, np.finfo(float).eps)
-    vwap = (typical_price * volume).cumsum() / volume_safe.cumsum()
-    
-    return vwap.fillna(typical_price)
+    return _series(panel_vwap(_frame(high), _frame(low), _frame(close), _frame(volume)))
 
 
 def calculate_ema(data: pd.Series, period: int) -> pd.Series:
@@ -142,64 +93,260 @@ def calculate_momentum(data: pd.Series, period: int = 10) -> pd.Series:
 
 def calculate_roc(data: pd.Series, period: int = 10) -> pd.Series:
     """Calculate Rate of Change with division protection."""
-    shifted = data.shift(period).replace(0, np.finfo(float).eps)
-    return ((data - data.shift(period)) / shifted) * 100
+    return _series(panel_roc(_frame(data), period), data.name)
 
 
 def calculate_williams_r(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
     """Calculate Williams %R with division protection."""
-    highest_high = high.rolling(window=period).max()
-    lowest_low = low.rolling(window=period).min()
-    
-    range_val = (highest_high - lowest_low).replace(0, np.finfo(float).eps)
-    wr = -100 * (highest_high - close) / range_val
+    return _series(panel_williams_r(_frame(high), _frame(low), _frame(close), period))
+
+
+def rolling_mean_deviation(data: pd.Series, period: int) -> pd.Series:
+    """
+    Rolling mean absolute deviation around each window's mean.
     
-    return wr.fillna(-50).clip(-100, 0)
+    Evaluates all windows at once on a strided view instead of calling back
+    into Python per bar. Windows containing NaN give NaN, like rolling().
+    """
+    return _series(panel_rolling_mean_deviation(_frame(data), period), data.name)
 
 
 def calculate_cci(high: pd.Series, low: pd.Series, close: pd.Series, period: int = 20) -> pd.Series:
     """Calculate Commodity Channel Index with division protection."""
-    typical_price = (high + low + close) / 3
-    sma_tp = typical_price.rolling(window=period).mean()
-    mean_deviation = typical_price.rolling(window=period).apply(lambda x: np.abs(x - x.mean()).mean())
-    
-    # Protect against division by zero
-    mean_deviation_safe = mean_deviation.replace(0, np.finfo(float).eps)
-    cci = (typical_price - sma_tp) / (0.015 * mean_deviation_safe)
-    
-    return cci.fillna(0)
+    return _series(panel_cci(_frame(high), _frame(low), _frame(close), period))
 
 
 def calculate_mfi(high: pd.Series, low: pd.Series, close: pd.Series, volume: pd.Series, period: int = 14) -> pd.Series:
     """Calculate Money Flow Index with division protection."""
-    typical_price = (high + low + close) / 3
-    raw_money_flow = typical_price * volume
-    
-    positive_flow = pd.Series(0.0, index=close.index)
-    negative_flow = pd.Series(0.0, index=close.index)
-    
-    for i in range(1, len(typical_price)):
-        if typical_price.iloc[i] > typical_price.iloc[i-1]:
-            positive_flow.iloc[i] = raw_money_flow.iloc[i]
-        elif typical_price.iloc[i] < typical_price.iloc[i-1]:
-            negative_flow.iloc[i] = raw_money_flow.iloc[i]
-    
-    positive_mf = positive_flow.rolling(window=period).sum()
-    negative_mf = negative_flow.rolling(window=period).sum()
-    
-    # Protect against division by zero
-    negative_mf_safe = negative_mf.replace(0, np.finfo(float).eps)
-    mfi = 100 - (100 / (1 + positive_mf / negative_mf_safe))
-    
-    return mfi.fillna(50).clip(0, 100)
+    return _series(panel_mfi(_frame(high), _frame(low), _frame(close), _frame(volume), period))
+
+
+# Indicator series calculate_all_metrics derives its metrics from (macd/bollinger are dicts),
+# as IndicatorGraph keys: ATR and ADX share one true range, Bollinger reuses SMA(20)
+_METRIC_INDICATORS = {
+    'rsi_14': ('rsi', 14),
+    'macd': ('macd', 12, 26, 9),
+    'sma_20': ('sma', 20),
+    'ema_50': ('ema', 50),
+    'adx_14': ('adx', 14),
+    'atr_14': ('atr', 14),
+    'cci_20': ('cci', 20),
+    'bollinger': ('bollinger', 20, 2),
+}
+
+# Columns the full calculate_all_metrics adds to df: column -> (indicator, part)
+_METRIC_COLUMNS = {
+    'rsi_14': ('rsi_14', None),
+    'macd': ('macd', 'macd'),
+    'macd_signal': ('macd', 'signal'),
+    'macd_histogram': ('macd', 'histogram'),
+    'sma_20': ('sma_20', None),
+    'ema_50': ('ema_50', None),
+    'adx_14': ('adx_14', None),
+    'atr_14': ('atr_14', None),
+    'cci_20': ('cci_20', None),
+    'bb_upper': ('bollinger', 'upper'),
+    'bb_middle': ('bollinger', 'middle'),
+    'bb_lower': ('bollinger', 'lower'),
+}
+
+
+class MetricContext:
+    """
+    Metrics and indicator series of one frame, each computed on first use.
+
+    Passing the same context to several calculate_all_metrics() calls on the
+    frame shares everything computed so far between them.
+    """
+
+    def __init__(self, df: pd.DataFrame, graph: Optional[IndicatorGraph] = None):
+        self.df = df
+        self.graph = graph if graph is not None else IndicatorGraph(df)  # e.g. an IndicatorCache's graph
+        self.indicators: Dict[str, Any] = {}
+        self.values: Dict[str, Any] = {}
+
+    def indicator(self, name: str) -> Any:
+        if name not in self.indicators:
+            self.indicators[name] = self.graph.get(*_METRIC_INDICATORS[name])
+        return self.indicators[name]
+
+    def __getitem__(self, metric: str) -> Any:
+        if metric not in self.values:
+            self.values.update(_GROUP_OF[metric](self))
+        return self.values[metric]
+
+
+def _price_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    close = ctx.df['Close']
+    return {
+        'current_price': float(close.iloc[-1]),
+        'price_change_1d': ((close.iloc[-1] / close.iloc[-2]) - 1) * 100 if len(close) >= 2 else 0,
+        'price_change_5d': ((close.iloc[-1] / close.iloc[-6]) - 1) * 100 if len(close) >= 6 else 0,
+    }
+
+
+def _range_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    # 52-week high/low
+    price = ctx['current_price']
+    high_52w, low_52w = float(ctx.df['High'].max()), float(ctx.df['Low'].min())
+    return {
+        'high_52w': high_52w,
+        'low_52w': low_52w,
+        'pct_from_52w_high': ((price / high_52w) - 1) * 100,
+        'pct_from_52w_low': ((price / low_52w) - 1) * 100,
+    }
+
+
+def _volume_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    # Volume metrics with safety
+    avg_volume = ctx.df['Volume'].iloc[-20:].mean()
+    current_volume = ctx.df['Volume'].iloc[-1]
+    return {'volume_ratio': current_volume / avg_volume if avg_volume > 0 else 1.0}
+
+
+def _rsi_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    try:
+        rsi = float(ctx.indicator('rsi_14').iloc[-1])
+        if rsi < 30:
+            status = 'OVERSOLD'
+        elif rsi > 70:
+            status = 'OVERBOUGHT'
+        else:
+            status = 'NEUTRAL'
+        return {'rsi_14': rsi, 'rsi_status': status}
+    except Exception as e:
+        return {'rsi_14': 50.0, 'rsi_status': 'ERROR'}
+
+
+def _macd_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    try:
+        histogram = ctx.indicator('macd')['histogram']
+        if len(histogram) >= 2:
+            if histogram.iloc[-1] > 0 and histogram.iloc[-2] <= 0:
+                return {'macd_status': 'BULLISH_CROSSOVER'}
+            if histogram.iloc[-1] < 0 and histogram.iloc[-2] >= 0:
+                return {'macd_status': 'BEARISH_CROSSOVER'}
+            return {'macd_status': 'BULLISH' if histogram.iloc[-1] > 0 else 'BEARISH'}
+        return {'macd_status': 'NEUTRAL'}
+    except Exception as e:
+        return {'macd_status': 'ERROR'}
 
 
-def calculate_all_metrics(df: pd.DataFrame, ticker: str) -> Optional[Dict[str, Any]]:
+def _trend_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    # Moving Averages
+    price = ctx['current_price']
+    try:
+        close, sma_20, ema_50 = ctx.df['Close'], ctx.indicator('sma_20'), ctx.indicator('ema_50')
+        metrics = {'price_vs_sma20_pct': ((price / sma_20.iloc[-1]) - 1) * 100}
+        
+        # Trend determination
+        if close.iloc[-1] > sma_20.iloc[-1] > ema_50.iloc[-1]:
+            metrics['trend_short_term'] = 'BULLISH'
+        elif close.iloc[-1] < sma_20.iloc[-1] < ema_50.iloc[-1]:
+            metrics['trend_short_term'] = 'BEARISH'
+        else:
+            metrics['trend_short_term'] = 'NEUTRAL'
+        
+        metrics['trend_medium_term'] = 'BULLISH' if ema_50.iloc[-1] > ema_50.iloc[-10] else 'BEARISH'
+        return metrics
+    except Exception as e:
+        return {'trend_short_term': 'NEUTRAL', 'trend_medium_term': 'NEUTRAL', 'price_vs_sma20_pct': 0}
+
+
+def _adx_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    try:
+        adx = float(ctx.indicator('adx_14').iloc[-1])
+        if adx > 25:
+            strength = 'STRONG'
+        elif adx > 20:
+            strength = 'MODERATE'
+        else:
+            strength = 'WEAK'
+        return {'adx_14': adx, 'trend_strength': strength}
+    except Exception as e:
+        return {'adx_14': 20.0, 'trend_strength': 'UNKNOWN'}
+
+
+def _atr_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    price = ctx['current_price']
+    try:
+        atr_value = float(ctx.indicator('atr_14').iloc[-1])
+        return {'atr_pct': (atr_value / price) * 100 if price > 0 else 0}
+    except Exception as e:
+        return {'atr_pct': 0}
+
+
+def _volatility_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    try:
+        # Only the last 20 returns are read, so only the last 21 closes are needed
+        returns = ctx.df['Close'].iloc[-21:].pct_change()
+        return {'realized_volatility_20d': float(returns.iloc[-20:].std() * np.sqrt(252) * 100)}
+    except Exception as e:
+        return {'realized_volatility_20d': 0}
+
+
+def _cci_metrics(ctx: MetricContext) -> Dict[str, Any]:
+    try:
+        cci = float(ctx.indicator('cci_20').iloc[-1])
+        if cci > 100:
+            status = 'OVERBOUGHT'
+        elif cci < -100:
+            status = 'OVERSOLD'
+        else:
+            status = 'NEUTRAL'
+        return {'cci_20': cci, 'cci_status': status}
+    except Exception as e:
+        return {'cci_20': 0.0, 'cci_status': 'ERROR'}
+
+
+# Metric groups in report order, with the metrics each one produces
+_METRIC_GROUPS = {
+    _price_metrics: ['current_price', 'price_change_1d', 'price_change_5d'],
+    _range_metrics: ['high_52w', 'low_52w', 'pct_from_52w_high', 'pct_from_52w_low'],
+    _volume_metrics: ['volume_ratio'],
+    _rsi_metrics: ['rsi_14', 'rsi_status'],
+    _macd_metrics: ['macd_status'],
+    _trend_metrics: ['price_vs_sma20_pct', 'trend_short_term', 'trend_medium_term'],
+    _adx_metrics: ['adx_14', 'trend_strength'],
+    _atr_metrics: ['atr_pct'],
+    _volatility_metrics: ['realized_volatility_20d'],
+    _cci_metrics: ['cci_20', 'cci_status'],
+}
+_GROUP_OF = {metric: group for group, metrics in _METRIC_GROUPS.items() for metric in metrics}
+
+# Every metric calculate_all_metrics reports
+METRIC_NAMES = list(_GROUP_OF)
+
+
+def calculate_all_metrics(df: pd.DataFrame, ticker: str, metrics: Optional[Sequence[str]] = None,
+                          context: Optional[MetricContext] = None) -> Optional[Dict[str, Any]]:
     """
     Calculate comprehensive technical metrics with error handling.
     
     v7.0: Enhanced error handling for all division operations
+    
+    Args:
+        df: OHLCV DataFrame (at least 30 bars)
+        ticker: Stock ticker symbol (for error messages)
+        metrics: Names from METRIC_NAMES to compute. By default every metric
+            is computed and the indicator series (rsi_14, macd, sma_20, ...,
+            bb_lower) are added to df as columns for charting. With a list,
+            only the indicators those metrics depend on are computed and df
+            is left untouched.
+        context: MetricContext(df) shared across calls, so indicators and
+            metrics computed by an earlier call (e.g. a cheap pre-filter)
+            are reused instead of recomputed
+    
+    Returns:
+        Dict of metric name -> value (None if df is too short or incomplete)
     """
+    if context is not None and context.df is not df:
+        raise ValueError("context belongs to a different DataFrame")
+    if metrics is not None:
+        unknown = [name for name in metrics if name not in _GROUP_OF]
+        if unknown:
+            raise ValueError(f"Unknown metric(s): {', '.join(unknown)}")
+    
     try:
         if df is None or len(df) < 30:
             return None
@@ -209,120 +356,23 @@ def calculate_all_metrics(df: pd.DataFrame, ticker: str) -> Optional[Dict[str, A
         if not all(col in df.columns for col in required_columns):
             return None
         
-        # Calculate indicators with try-except for each
-        metrics = {}
-        
-        # Basic price metrics
-        metrics['current_price'] = float(df['Close'].iloc[-1])
-        metrics['price_change_1d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-2]) - 1) * 100 if len(df) >= 2 else 0
-        metrics['price_change_5d'] = ((df['Close'].iloc[-1] / df['Close'].iloc[-6]) - 1) * 100 if len(df) >= 6 else 0
-        
-        # 52-week high/low
-        metrics['high_52w'] = float(df['High'].max())
-        metrics['low_52w'] = float(df['Low'].min())
-        metrics['pct_from_52w_high'] = ((metrics['current_price'] / metrics['high_52w']) - 1) * 100
-        metrics['pct_from_52w_low'] = ((metrics['current_price'] / metrics['low_52w']) - 1) * 100
-        
-        # Volume metrics with safety
-        avg_volume = df['Volume'].iloc[-20:].mean()
-        current_volume = df['Volume'].iloc[-1]
-        metrics['volume_ratio'] = current_volume / avg_volume if avg_volume > 0 else 1.0
-        
-        # RSI with fix
-        try:
-            df['rsi_14'] = calculate_rsi(df['Close'], 14)
-            metrics['rsi_14'] = float(df['rsi_14'].iloc[-1])
-            
-            if metrics['rsi_14'] < 30:
-                metrics['rsi_status'] = 'OVERSOLD'
-            elif metrics['rsi_14'] > 70:
-                metrics['rsi_status'] = 'OVERBOUGHT'
-            else:
-                metrics['rsi_status'] = 'NEUTRAL'
-        except Exception as e:
-            metrics['rsi_14'] = 50.0
-            metrics['rsi_status'] = 'ERROR'
-        
-        # MACD
-        try:
-            macd_data = calculate_macd(df['Close'])
-            df['macd'] = macd_data['macd']
-            df['macd_signal'] = macd_data['signal']
-            df['macd_histogram'] = macd_data['histogram']
-            
-            if len(df) >= 2:
-                if df['macd_histogram'].iloc[-1] > 0 and df['macd_histogram'].iloc[-2] <= 0:
-                    metrics['macd_status'] = 'BULLISH_CROSSOVER'
-                elif df['macd_histogram'].iloc[-1] < 0 and df['macd_histogram'].iloc[-2] >= 0:
-                    metrics['macd_status'] = 'BEARISH_CROSSOVER'
-                else:
-                    metrics['macd_status'] = 'BULLISH' if df['macd_histogram'].iloc[-1] > 0 else 'BEARISH'
-            else:
-                metrics['macd_status'] = 'NEUTRAL'
-        except Exception as e:
-            metrics['macd_status'] = 'ERROR'
-        
-        # Moving Averages
-        try:
-            df['sma_20'] = calculate_sma(df['Close'], 20)
-            df['ema_50'] = calculate_ema(df['Close'], 50)
-            
-            metrics['price_vs_sma20_pct'] = ((metrics['current_price'] / df['sma_20'].iloc[-1]) - 1) * 100
-            
-            # Trend determination
-            if df['Close'].iloc[-1] > df['sma_20'].iloc[-1] > df['ema_50'].iloc[-1]:
-                metrics['trend_short_term'] = 'BULLISH'
-            elif df['Close'].iloc[-1] < df['sma_20'].iloc[-1] < df['ema_50'].iloc[-1]:
-                metrics['trend_short_term'] = 'BEARISH'
-            else:
-                metrics['trend_short_term'] = 'NEUTRAL'
-            
-            metrics['trend_medium_term'] = 'BULLISH' if df['ema_50'].iloc[-1] > df['ema_50'].iloc[-10] else 'BEARISH'
-        except Exception as e:
-            metrics['trend_short_term'] = 'NEUTRAL'
-            metrics['trend_medium_term'] = 'NEUTRAL'
-            metrics['price_vs_sma20_pct'] = 0
-        
-        # ADX
-        try:
-            df['adx_14'] = calculate_adx(df['High'], df['Low'], df['Close'], 14)
-            metrics['adx_14'] = float(df['adx_14'].iloc[-1])
-            
-            if metrics['adx_14'] > 25:
-                metrics['trend_strength'] = 'STRONG'
-            elif metrics['adx_14'] > 20:
-                metrics['trend_strength'] = 'MODERATE'
-            else:
-                metrics['trend_strength'] = 'WEAK'
-        except Exception as e:
-            metrics['adx_14'] = 20.0
-            metrics['trend_strength'] = 'UNKNOWN'
+        ctx = context if context is not None else MetricContext(df)
+        if metrics is not None:
+            return {name: ctx[name] for name in metrics}
         
-        # ATR
-        try:
-            df['atr_14'] = calculate_atr(df['High'], df['Low'], df['Close'], 14)
-            atr_value = float(df['atr_14'].iloc[-1])
-            metrics['atr_pct'] = (atr_value / metrics['current_price']) * 100 if metrics['current_price'] > 0 else 0
-        except Exception as e:
-            metrics['atr_pct'] = 0
-        
-        # Volatility
-        try:
-            returns = df['Close'].pct_change()
-            metrics['realized_volatility_20d'] = float(returns.iloc[-20:].std() * np.sqrt(252) * 100)
-        except Exception as e:
-            metrics['realized_volatility_20d'] = 0
+        for name in METRIC_NAMES:
+            ctx[name]
         
-        # Bollinger Bands
+        # Bollinger Bands (chart only)
         try:
-            bb = calculate_bollinger_bands(df['Close'], 20, 2)
-            df['bb_upper'] = bb['upper']
-            df['bb_middle'] = bb['middle']
-            df['bb_lower'] = bb['lower']
+            ctx.indicator('bollinger')
         except Exception as e:
             pass
         
-        return metrics
+        for column, (name, part) in _METRIC_COLUMNS.items():
+            if name in ctx.indicators:
+                df[column] = ctx.indicators[name] if part is None else ctx.indicators[name][part]
+        return ctx.values
         
     except Exception as e:
         print(f"Error calculating metrics for {ticker}: {str(e)}")
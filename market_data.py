@@ -0,0 +1,169 @@
+"""
+MARKET DATA MODULE
+==================
+Batched OHLCV download for many tickers at once.
+
+One yf.download() call fetches a whole chunk of tickers (yfinance threads the
+HTTP requests internally), instead of one Ticker().history() round-trip per
+symbol. Large universes are split into chunks so a single failed request
+only loses one chunk.
+"""
+
+import re
+import threading
+from typing import Callable, Dict, List, Optional, Sequence
+
+import pandas as pd
+import yfinance as yf
+
+DEFAULT_CHUNK_SIZE = 100
+OHLCV_COLUMNS = ['Open', 'High', 'Low', 'Close', 'Volume']
+
+# Periods yf.download accepts by name; others (e.g. "3y") are fetched from a start date
+YFINANCE_PERIODS = {'1d', '5d', '1mo', '3mo', '6mo', '1y', '2y', '5y', '10y', 'ytd', 'max'}
+
+# yf.download keeps per-call state in module globals, so concurrent calls
+# from different threads can mix up each other's results.
+_DOWNLOAD_LOCK = threading.Lock()
+
+
+def ticker_filename(ticker: str, extension: str) -> str:
+    """Filesystem-safe file name for a ticker (e.g. '^NSEI' -> '_NSEI.parquet')."""
+    return f"{re.sub(r'[^A-Za-z0-9._-]', '_', ticker)}.{extension}"
+
+
+def chunk_tickers(tickers: Sequence[str], chunk_size: int = DEFAULT_CHUNK_SIZE) -> List[List[str]]:
+    """Split a ticker list into chunks of at most chunk_size."""
+    chunk_size = max(1, chunk_size)
+    return [list(tickers[i:i + chunk_size]) for i in range(0, len(tickers), chunk_size)]
+
+
+def _split_panel(panel: Optional[pd.DataFrame], tickers: Sequence[str]) -> Dict[str, pd.DataFrame]:
+    """Split a yf.download(group_by='ticker') frame into one frame per ticker."""
+    frames = {}
+    if panel is None or panel.empty:
+        return frames
+
+    if not isinstance(panel.columns, pd.MultiIndex):
+        # Single ticker without a ticker level
+        if len(tickers) == 1:
+            frame = panel.dropna(how='all')
+            if not frame.empty:
+                frames[tickers[0]] = frame
+        return frames
+
+    available = set(panel.columns.get_level_values(0))
+    for ticker in tickers:
+        if ticker not in available:
+            continue
+        frame = panel[ticker].dropna(how='all')
+        if frame.empty:
+            continue
+        frame.columns.name = None
+        frames[ticker] = frame
+
+    return frames
+
+
+def fetch_ohlcv_bulk(tickers: Sequence[str], period: str = "6mo", interval: str = "1d",
+                     chunk_size: int = DEFAULT_CHUNK_SIZE,
+                     downloader: Optional[Callable[..., pd.DataFrame]] = None,
+                     start: Optional[pd.Timestamp] = None,
+                     end: Optional[pd.Timestamp] = None) -> Dict[str, pd.DataFrame]:
+    """
+    Fetch OHLCV history for many tickers using batched downloads.
+
+    Args:
+        tickers: Ticker symbols (e.g. ['RELIANCE.NS', 'TCS.NS'])
+        period: Period string ("5d", "3mo", "1y", ...); periods yfinance has
+            no name for ("3y", "4mo", ...) are fetched from period_start()
+        interval: Bar interval
+        chunk_size: Maximum tickers per download request
+        downloader: yf.download-compatible callable (a local stand-in in tests)
+        start: Fetch bars from this date onwards instead of a whole period
+        end: With start, stop before this date (exclusive)
+
+    Returns:
+        Dict of ticker -> DataFrame; tickers without data are left out
+    """
+    downloader = downloader or yf.download
+    tickers = list(dict.fromkeys(tickers))
+    frames = {}
+    if start is not None:
+        window = {'start': pd.Timestamp(start).strftime('%Y-%m-%d')}
+        if end is not None:
+            window['end'] = pd.Timestamp(end).strftime('%Y-%m-%d')
+    elif period.lower() not in YFINANCE_PERIODS:
+        window = {'start': period_start(period).strftime('%Y-%m-%d')}
+    else:
+        window = {'period': period}
+
+    for chunk in chunk_tickers(tickers, chunk_size):
+        try:
+            with _DOWNLOAD_LOCK:
+                panel = downloader(
+                    chunk,
+                    interval=interval,
+                    group_by='ticker',
+                    auto_adjust=True,
+                    threads=True,
+                    progress=False,
+                    **window
+                )
+        except Exception as e:
+            print(f"Error downloading {len(chunk)} tickers: {str(e)}")
+            continue
+        frames.update(_split_panel(panel, chunk))
+
+    return frames
+
+
+def to_wide_panel(frames: Dict[str, pd.DataFrame], field: str = 'Close') -> pd.DataFrame:
+    """Align one field across tickers into a (dates x tickers) DataFrame."""
+    if not frames:
+        return pd.DataFrame()
+    return pd.DataFrame({ticker: df[field] for ticker, df in frames.items() if field in df.columns})
+
+
+def period_start(period: str, end: Optional[pd.Timestamp] = None) -> pd.Timestamp:
+    """
+    Approximate first date covered by a yfinance period string.
+
+    "Nd" periods count trading days, so they are widened to calendar days.
+    """
+    end = pd.Timestamp(end if end is not None else pd.Timestamp.now()).normalize()
+    period = period.lower()
+
+    if period == 'max':
+        return pd.Timestamp.min
+    if period == 'ytd':
+        return pd.Timestamp(year=end.year, month=1, day=1, tz=end.tz)
+    if period.endswith('mo'):
+        return end - pd.DateOffset(months=int(period[:-2]))
+    if period.endswith('y'):
+        return end - pd.DateOffset(years=int(period[:-1]))
+    if period.endswith('wk'):
+        return end - pd.DateOffset(weeks=int(period[:-2]))
+    if period.endswith('d'):
+        days = int(period[:-1])
+        return end - pd.Timedelta(days=days * 7 // 5 + 7)
+    raise ValueError(f"Unsupported period: {period}")
+
+
+def slice_period(df: pd.DataFrame, period: str) -> pd.DataFrame:
+    """
+    Return the trailing part of a history that a period string covers.
+
+    Uses positional slicing, so no data is copied.
+    """
+    if df is None or df.empty:
+        return df
+
+    period = period.lower()
+    if period == 'max':
+        return df
+    if period.endswith('d'):
+        return df.iloc[-int(period[:-1]):]
+
+    start = period_start(period, end=df.index[-1])
+    return df.iloc[df.index.searchsorted(start):]
@@ -0,0 +1,171 @@
+"""
+NSE TRADING CALENDAR
+====================
+Trading days, holidays and session hours for the National Stock Exchange.
+
+Cached market data is refreshed when a new or changed daily bar could exist,
+not after a fixed number of seconds:
+- During the session (plus a short settlement grace after the close), data
+  goes stale after an intraday TTL.
+- Outside the session (nights, weekends, holidays), data fetched after the
+  close stays fresh until the next session opens.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Optional
+from zoneinfo import ZoneInfo
+
+IST = ZoneInfo("Asia/Kolkata")
+
+SESSION_OPEN = time(9, 15)
+SESSION_CLOSE = time(15, 30)
+# Closing prices settle shortly after 15:30; one more refresh picks them up
+CLOSE_GRACE = timedelta(minutes=30)
+
+DEFAULT_INTRADAY_TTL = 60
+
+# NSE equity segment trading holidays (weekday closures only).
+# Update from the exchange circular each December.
+NSE_HOLIDAYS = frozenset([
+    # 2025
+    date(2025, 2, 26),   # Mahashivratri
+    date(2025, 3, 14),   # Holi
+    date(2025, 3, 31),   # Id-Ul-Fitr
+    date(2025, 4, 10),   # Shri Mahavir Jayanti
+    date(2025, 4, 14),   # Dr. Baba Saheb Ambedkar Jayanti
+    date(2025, 4, 18),   # Good Friday
+    date(2025, 5, 1),    # Maharashtra Day
+    date(2025, 8, 15),   # Independence Day
+    date(2025, 8, 27),   # Ganesh Chaturthi
+    date(2025, 10, 2),   # Mahatma Gandhi Jayanti / Dussehra
+    date(2025, 10, 21),  # Diwali Laxmi Pujan
+    date(2025, 10, 22),  # Diwali Balipratipada
+    date(2025, 11, 5),   # Prakash Gurpurb Sri Guru Nanak Dev
+    date(2025, 12, 25),  # Christmas
+    # 2026
+    date(2026, 1, 26),   # Republic Day
+    date(2026, 3, 3),    # Holi
+    date(2026, 3, 26),   # Shri Ram Navami
+    date(2026, 3, 31),   # Shri Mahavir Jayanti
+    date(2026, 4, 3),    # Good Friday
+    date(2026, 4, 14),   # Dr. Baba Saheb Ambedkar Jayanti
+    date(2026, 5, 1),    # Maharashtra Day
+    date(2026, 5, 28),   # Bakri Id
+    date(2026, 6, 26),   # Muharram
+    date(2026, 9, 14),   # Ganesh Chaturthi
+    date(2026, 10, 2),   # Mahatma Gandhi Jayanti
+    date(2026, 10, 20),  # Dussehra
+    date(2026, 11, 10),  # Diwali Balipratipada
+    date(2026, 11, 24),  # Prakash Gurpurb Sri Guru Nanak Dev
+    date(2026, 12, 25),  # Christmas
+])
+
+
+def now_ist() -> datetime:
+    """Current time in IST."""
+    return datetime.now(IST)
+
+
+def _to_ist(ts: Optional[datetime]) -> datetime:
+    if ts is None:
+        return now_ist()
+    if ts.tzinfo is None:
+        return ts.replace(tzinfo=IST)
+    return ts.astimezone(IST)
+
+
+def is_trading_day(day: date) -> bool:
+    """True if NSE holds a regular session on this date."""
+    return day.weekday() < 5 and day not in NSE_HOLIDAYS
+
+
+def next_trading_day(day: date) -> date:
+    """First trading day strictly after day."""
+    day += timedelta(days=1)
+    while not is_trading_day(day):
+        day += timedelta(days=1)
+    return day
+
+
+def previous_trading_day(day: date) -> date:
+    """Last trading day strictly before day."""
+    day -= timedelta(days=1)
+    while not is_trading_day(day):
+        day -= timedelta(days=1)
+    return day
+
+
+def _live_window(day: date):
+    """(open, close + grace) for a trading day, in IST."""
+    start = datetime.combine(day, SESSION_OPEN, tzinfo=IST)
+    end = datetime.combine(day, SESSION_CLOSE, tzinfo=IST) + CLOSE_GRACE
+    return start, end
+
+
+def is_session_open(ts: Optional[datetime] = None) -> bool:
+    """True while the regular session is running."""
+    ts = _to_ist(ts)
+    if not is_trading_day(ts.date()):
+        return False
+    return SESSION_OPEN <= ts.time() < SESSION_CLOSE
+
+
+def next_session_open(ts: Optional[datetime] = None) -> datetime:
+    """Start of the first session opening strictly after ts."""
+    ts = _to_ist(ts)
+    day = ts.date()
+    if is_trading_day(day) and ts < _live_window(day)[0]:
+        return _live_window(day)[0]
+    return _live_window(next_trading_day(day))[0]
+
+
+def last_session_date(ts: Optional[datetime] = None) -> date:
+    """Date of the most recent session that has opened at or before ts."""
+    ts = _to_ist(ts)
+    day = ts.date()
+    if is_trading_day(day) and ts >= _live_window(day)[0]:
+        return day
+    return previous_trading_day(day)
+
+
+def next_refresh_time(fetched_at: datetime, intraday_ttl: float = DEFAULT_INTRADAY_TTL) -> datetime:
+    """
+    Earliest time at which data fetched at fetched_at could be out of date.
+
+    Args:
+        fetched_at: When the data was fetched
+        intraday_ttl: Seconds between refreshes while bars are still changing
+
+    Returns:
+        IST datetime after which a refetch is worthwhile
+    """
+    fetched_at = _to_ist(fetched_at)
+    day = fetched_at.date()
+    if is_trading_day(day):
+        start, end = _live_window(day)
+        if start <= fetched_at < end:
+            return min(fetched_at + timedelta(seconds=intraday_ttl), end)
+    return next_session_open(fetched_at)
+
+
+def is_stale(fetched_at: datetime, now: Optional[datetime] = None,
+             intraday_ttl: float = DEFAULT_INTRADAY_TTL) -> bool:
+    """True if data fetched at fetched_at may have been superseded by now."""
+    return _to_ist(now) >= next_refresh_time(fetched_at, intraday_ttl)
+
+
+def cache_epoch(now: Optional[datetime] = None, intraday_ttl: float = DEFAULT_INTRADAY_TTL) -> str:
+    """
+    Cache key that changes only when a new bar could exist.
+
+    Inside the live window it ticks every intraday_ttl seconds; outside it
+    stays fixed at the last completed session until the next open.
+    """
+    now = _to_ist(now)
+    day = now.date()
+    if is_trading_day(day):
+        start, end = _live_window(day)
+        if start <= now < end:
+            slot = int((now - start).total_seconds() // intraday_ttl)
+            return f"{day.isoformat()}#{slot}"
+    return f"{last_session_date(now).isoformat()}#close"
@@ -0,0 +1,210 @@
+"""
+OHLCV STORE MODULE
+==================
+Persistent on-disk OHLCV history, one Parquet file per ticker.
+
+On refresh only the bars after the last stored date are downloaded and
+appended, so a restart reads the universe from local disk instead of
+re-downloading years of history. Bars fetched after the NSE close are final,
+so nothing is downloaded again until the next session opens.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from typing import Dict, Optional, Sequence, Tuple
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from market_data import period_start, slice_period, ticker_filename, OHLCV_COLUMNS
+from data_providers import MarketDataProvider
+from nse_calendar import is_stale, now_ist
+
+DEFAULT_STORE_DIR = os.environ.get(
+    'OHLCV_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'ohlcv')
+)
+
+_METADATA_KEY = b'ohlcv_store'
+
+
+class OHLCVStore:
+    """
+    Ticker-keyed store of daily OHLCV bars in Parquet files.
+
+    Each file records the earliest date its history was requested from
+    ("covered_from"), so a listing that simply starts later than a requested
+    period is not re-downloaded on every refresh.
+    """
+
+    def __init__(self, root: str = DEFAULT_STORE_DIR):
+        self.root = root
+        self._lock = threading.Lock()
+        os.makedirs(self.root, exist_ok=True)
+
+    def path(self, ticker: str) -> str:
+        """File path for a ticker."""
+        return os.path.join(self.root, ticker_filename(ticker, 'parquet'))
+
+    def _read(self, ticker: str) -> Tuple[Optional[pd.DataFrame], Dict]:
+        """
+        Read a ticker's bars and store metadata.
+
+        Metadata holds 'covered_from' (date the history is complete from) and
+        'fetched_at' (when the newest bars were downloaded, if known).
+        """
+        path = self.path(ticker)
+        if not os.path.exists(path):
+            return None, {}
+
+        try:
+            table = pq.read_table(path)
+        except Exception as e:
+            print(f"Error reading stored history for {ticker}: {str(e)}")
+            return None, {}
+
+        df = table.to_pandas()
+        raw = json.loads((table.schema.metadata or {}).get(_METADATA_KEY, b'{}'))
+        meta = {
+            'covered_from': pd.Timestamp(raw['covered_from']) if raw.get('covered_from') else df.index[0],
+            'fetched_at': pd.Timestamp(raw['fetched_at']) if raw.get('fetched_at') else None,
+        }
+        return df, meta
+
+    def read(self, ticker: str) -> Optional[pd.DataFrame]:
+        """Read all stored bars for a ticker (None if nothing is stored)."""
+        df, _ = self._read(ticker)
+        return df
+
+    def last_date(self, ticker: str) -> Optional[pd.Timestamp]:
+        """Date of the last stored bar for a ticker."""
+        df = self.read(ticker)
+        return df.index[-1] if df is not None and not df.empty else None
+
+    def write(self, ticker: str, df: pd.DataFrame, covered_from: Optional[pd.Timestamp] = None,
+              fetched_at: Optional[pd.Timestamp] = None):
+        """Replace a ticker's stored bars (atomic rename, safe for concurrent readers)."""
+        df = _normalize(df)
+        raw = {'covered_from': str(pd.Timestamp(covered_from if covered_from is not None else df.index[0]))}
+        if fetched_at is not None:
+            raw['fetched_at'] = pd.Timestamp(fetched_at).isoformat()
+
+        table = pa.Table.from_pandas(df, preserve_index=True)
+        metadata = dict(table.schema.metadata or {})
+        metadata[_METADATA_KEY] = json.dumps(raw).encode()
+        table = table.replace_schema_metadata(metadata)
+
+        path = self.path(ticker)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+
+    def append(self, ticker: str, new_bars: Optional[pd.DataFrame],
+               covered_from: Optional[pd.Timestamp] = None,
+               fetched_at: Optional[pd.Timestamp] = None) -> Optional[pd.DataFrame]:
+        """
+        Merge new bars into a ticker's history and persist it.
+
+        Bars already stored for the same date are replaced, since the last
+        stored bar may have been a partial intraday bar. new_bars may be None
+        to only update the metadata.
+        """
+        new_bars = _normalize(new_bars) if new_bars is not None and not new_bars.empty else None
+        with self._lock:
+            existing, meta = self._read(ticker)
+
+            if existing is None or existing.empty:
+                merged = new_bars
+            elif new_bars is None:
+                merged = existing
+            else:
+                merged = pd.concat([existing, new_bars])
+                merged = merged[~merged.index.duplicated(keep='last')].sort_index()
+
+            if merged is None:
+                return None
+
+            starts = [d for d in (meta.get('covered_from'), covered_from) if d is not None]
+            self.write(ticker, merged, min(starts) if starts else None,
+                       fetched_at if fetched_at is not None else meta.get('fetched_at'))
+
+        return merged
+
+    def refresh(self, tickers: Sequence[str], period: str,
+                provider: MarketDataProvider) -> Dict[str, pd.DataFrame]:
+        """
+        Bring stored histories up to date and return them sliced to a period.
+
+        Stored tickers only download bars from their last stored date
+        onwards, and only if the NSE calendar says a newer bar could exist
+        since they were last fetched. If a stored history does not reach back
+        far enough, only the missing older bars are downloaded and prepended.
+        Tickers with nothing stored are downloaded for the whole period.
+
+        Args:
+            tickers: Ticker symbols
+            period: yfinance period string the caller needs
+            provider: Source of new bars
+
+        Returns:
+            Dict of ticker -> DataFrame covering the period
+        """
+        required_from = period_start(period)
+        now = pd.Timestamp(now_ist())
+        histories = {}
+        full_fetch = []
+        backfill = defaultdict(list)
+        incremental = defaultdict(list)
+
+        for ticker in dict.fromkeys(tickers):
+            df, meta = self._read(ticker)
+            if df is None or df.empty or (meta['covered_from'] > required_from and period == 'max'):
+                full_fetch.append(ticker)
+                continue
+
+            histories[ticker] = df
+            if meta['covered_from'] > required_from:
+                backfill[df.index[0]].append(ticker)
+            if meta['fetched_at'] is None or is_stale(meta['fetched_at'], now):
+                incremental[df.index[-1]].append(ticker)
+
+        if full_fetch:
+            for ticker, df in provider.download(full_fetch, period=period).items():
+                histories[ticker] = self.append(ticker, df, covered_from=required_from, fetched_at=now)
+
+        # Extend shallow histories backwards instead of re-downloading them
+        for first_date, group in backfill.items():
+            fetched = provider.download(group, period=period, start=required_from, end=first_date)
+            for ticker in group:
+                histories[ticker] = self.append(ticker, fetched.get(ticker), covered_from=required_from)
+
+        # Tickers sharing a last stored date are updated in one batch
+        for last_date, group in incremental.items():
+            for ticker, df in provider.download(group, period=period, start=last_date).items():
+                histories[ticker] = self.append(ticker, df, fetched_at=now)
+
+        return {ticker: slice_period(df, period) for ticker, df in histories.items()}
+
+
+def _normalize(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep OHLCV columns on a sorted, timezone-naive date index."""
+    df = df[[col for col in OHLCV_COLUMNS if col in df.columns]]
+    if isinstance(df.index, pd.DatetimeIndex) and df.index.tz is not None:
+        df = df.tz_localize(None)
+    return df.rename_axis('Date').sort_index()
+
+
+_default_store = None
+_default_store_lock = threading.Lock()
+
+
+def get_default_store() -> OHLCVStore:
+    """Process-wide store rooted at DEFAULT_STORE_DIR."""
+    global _default_store
+    with _default_store_lock:
+        if _default_store is None:
+            _default_store = OHLCVStore()
+        return _default_store
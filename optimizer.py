@@ -0,0 +1,185 @@
+"""
+STRATEGY OPTIMIZER MODULE
+=========================
+Parameter-grid sweeps over the strategy templates in backtesting.py.
+
+Every distinct indicator series the grid needs (each SMA/EMA/RSI period, ...)
+is computed once up front in an IndicatorCache. Grid points are then
+evaluated in parallel on worker processes that receive the warmed cache
+once, through the pool initializer, so no worker recomputes an indicator.
+"""
+
+import itertools
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence
+
+import pandas as pd
+
+from backtesting import SUMMARY, BacktestEngine, CompactBacktestResult, STRATEGY_TEMPLATES
+from indicator_cache import IndicatorCache
+
+DEFAULT_GRID_CHUNK = 64
+
+METRIC_COLUMNS = [
+    'total_return_pct', 'annualized_return', 'sharpe_ratio', 'sortino_ratio', 'max_drawdown_pct',
+    'total_trades', 'win_rate', 'profit_factor'
+]
+
+
+@dataclass
+class OptimizationResult:
+    """Ranked grid results for one strategy template."""
+    template: str
+    ticker: str
+    params: List[str]
+    table: pd.DataFrame        # One row per grid point, best first
+    rank_by: str
+    indicators_computed: int   # Distinct indicator series computed for the whole grid
+    elapsed: float = 0.0
+
+    @property
+    def best_params(self) -> Dict[str, Any]:
+        """Parameters of the top-ranked grid point."""
+        if self.table.empty:
+            return {}
+        return self.table.loc[[0], self.params].to_dict('records')[0]
+
+    def matrix(self, metric: str = 'sharpe_ratio', rows: Optional[str] = None,
+               columns: Optional[str] = None) -> pd.DataFrame:
+        """
+        Heatmap-ready pivot of a metric over two parameters.
+
+        Defaults to the first two parameters; any further parameters are
+        collapsed by taking the best value of the metric.
+        """
+        rows = rows or self.params[0]
+        columns = columns or (self.params[1] if len(self.params) > 1 else self.params[0])
+        return self.table.pivot_table(index=rows, columns=columns, values=metric, aggfunc='max')
+
+    @property
+    def sharpe_matrix(self) -> pd.DataFrame:
+        return self.matrix('sharpe_ratio')
+
+    @property
+    def return_matrix(self) -> pd.DataFrame:
+        return self.matrix('total_return_pct')
+
+
+def expand_grid(template: str, grid: Dict[str, Iterable[Any]]) -> List[Dict[str, Any]]:
+    """All valid parameter combinations of a grid (unset parameters use the template defaults)."""
+    spec = STRATEGY_TEMPLATES[template]
+    unknown = set(grid) - set(spec.defaults)
+    if unknown:
+        raise ValueError(f"Unknown parameter(s) for {template}: {', '.join(sorted(unknown))}")
+
+    axes = {name: list(grid.get(name, [default])) for name, default in spec.defaults.items()}
+    points = [dict(zip(axes, values)) for values in itertools.product(*axes.values())]
+    return [params for params in points if spec.is_valid(**params)]
+
+
+def _result_row(params: Dict[str, Any], result: CompactBacktestResult) -> Dict[str, Any]:
+    row = dict(params)
+    for column in METRIC_COLUMNS:
+        row[column] = getattr(result, column)
+    return row
+
+
+def _worker_state(engine: BacktestEngine, indicators: IndicatorCache, template: str, ticker: str) -> Dict[str, Any]:
+    return {'engine': engine, 'indicators': indicators, 'template': template, 'ticker': ticker}
+
+
+# Per-process state set by the pool initializer (in-process runs pass their own state instead,
+# so concurrent optimizations in one process never share it)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(*args):
+    _worker.update(_worker_state(*args))
+
+
+def _evaluate_in_worker(points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return _evaluate(_worker, points)
+
+
+def _evaluate(state: Dict[str, Any], points: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Backtest a batch of grid points against the shared indicator cache, scoring them together."""
+    engine, indicators = state['engine'], state['indicators']
+    template, ticker = state['template'], state['ticker']
+    signals = STRATEGY_TEMPLATES[template].signals(indicators, points)
+    results = engine.run_signal_batch(indicators.df, signals, template, ticker, detail=SUMMARY)
+    return [_result_row(params, result) for params, result in zip(points, results)]
+
+
+def optimize_strategy(df: pd.DataFrame, template: str, grid: Optional[Dict[str, Iterable[Any]]] = None,
+                      ticker: str = "UNKNOWN", engine: Optional[BacktestEngine] = None,
+                      rank_by: str = 'sharpe_ratio', workers: Optional[int] = None,
+                      chunk_size: int = DEFAULT_GRID_CHUNK,
+                      indicators: Optional[IndicatorCache] = None) -> OptimizationResult:
+    """
+    Sweep a parameter grid for one strategy template.
+
+    Args:
+        df: DataFrame with OHLCV data
+        template: Key of STRATEGY_TEMPLATES (e.g. "SMA Crossover")
+        grid: Parameter name -> values (defaults to the template's default grid)
+        ticker: Stock ticker symbol
+        engine: BacktestEngine to use (capital/commission)
+        rank_by: Metric column to sort by, descending
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        chunk_size: Grid points per task
+        indicators: IndicatorCache for df to reuse (e.g. across templates)
+
+    Returns:
+        OptimizationResult with the ranked table and heatmap matrices
+    """
+    started = time.perf_counter()
+    spec = STRATEGY_TEMPLATES[template]
+    engine = engine or BacktestEngine()
+    points = expand_grid(template, grid if grid is not None else spec.default_grid)
+
+    # Compute every distinct indicator the grid reads, once (per batch, so each batch's
+    # compiled program is cached for its evaluation)
+    batches = [points[i:i + chunk_size] for i in range(0, len(points), chunk_size)]
+    indicators = indicators if indicators is not None else IndicatorCache(df)
+    computed_before = indicators.computed
+    for batch in batches:
+        for key in spec.indicators(batch):
+            indicators.get(*key)
+
+    workers = min(workers or os.cpu_count() or 1, max(len(batches), 1))
+    init_args = (engine, indicators, template, ticker)
+
+    rows = []
+    if workers <= 1:
+        state = _worker_state(*init_args)
+        for batch in batches:
+            rows.extend(_evaluate(state, batch))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            for batch_rows in pool.map(_evaluate_in_worker, batches):
+                rows.extend(batch_rows)
+
+    params = list(spec.defaults)
+    table = pd.DataFrame(rows, columns=params + METRIC_COLUMNS)
+    table = table.sort_values(rank_by, ascending=False, kind='stable').reset_index(drop=True)
+
+    return OptimizationResult(
+        template=template,
+        ticker=ticker,
+        params=params,
+        table=table,
+        rank_by=rank_by,
+        indicators_computed=indicators.computed - computed_before,
+        elapsed=time.perf_counter() - started
+    )
+
+
+def optimize_strategies(df: pd.DataFrame, templates: Sequence[str], ticker: str = "UNKNOWN",
+                        **kwargs) -> Dict[str, OptimizationResult]:
+    """Sweep the default grid of several templates, sharing one indicator cache."""
+    indicators = IndicatorCache(df)
+    return {template: optimize_strategy(df, template, ticker=ticker, indicators=indicators, **kwargs)
+            for template in templates}
@@ -0,0 +1,252 @@
+"""
+PANEL INDICATORS MODULE
+=======================
+Technical indicators over whole panels of tickers at once.
+
+Every function takes aligned (dates x tickers) inputs, either wide
+DataFrames or 2D NumPy arrays, and computes the indicator for all tickers in
+one vectorized pass. Results come back in the same form as the inputs.
+The single-series functions in indicators.py are thin wrappers over these.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Union
+
+Panel = Union[pd.DataFrame, np.ndarray]
+
+_EPS = np.finfo(float).eps
+
+
+def _frames(*panels: Panel):
+    """Convert inputs to DataFrames; also report whether they were arrays."""
+    as_array = isinstance(panels[0], np.ndarray)
+    frames = []
+    for panel in panels:
+        if isinstance(panel, np.ndarray):
+            panel = pd.DataFrame(panel.reshape(len(panel), -1))
+        frames.append(panel)
+    return frames, as_array
+
+
+def _out(result, as_array: bool):
+    """Return results in the caller's input form."""
+    if isinstance(result, dict):
+        return {key: _out(value, as_array) for key, value in result.items()}
+    return result.to_numpy() if as_array else result
+
+
+def _true_range(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    prev_close = close.shift()
+    # fmax skips NaN like DataFrame.max(axis=1) over the three candidates
+    return np.fmax(np.fmax(high - low, abs(high - prev_close)), abs(low - prev_close))
+
+
+def _typical_price(high: pd.DataFrame, low: pd.DataFrame, close: pd.DataFrame) -> pd.DataFrame:
+    return (high + low + close) / 3
+
+
+# Kernels below take shared intermediates (close change, true range, typical
+# price, moving averages) so indicator_graph.py can compute those once
+
+def _rsi(delta: pd.DataFrame, period: int) -> pd.DataFrame:
+    gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
+    loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
+
+    # When loss is 0, RSI should be 100 (all gains, no losses)
+    rs = gain / loss.replace(0, _EPS)
+    rsi = 100 - (100 / (1 + rs))
+
+    return rsi.fillna(50).clip(0, 100)
+
+
+def _macd(fast_ema: pd.DataFrame, slow_ema: pd.DataFrame, signal: int) -> Dict[str, pd.DataFrame]:
+    macd_line = fast_ema - slow_ema
+    signal_line = macd_line.ewm(span=signal, adjust=False).mean()
+    histogram = macd_line - signal_line
+    return {'macd': macd_line, 'signal': signal_line, 'histogram': histogram}
+
+
+def _bollinger_bands(close: pd.DataFrame, sma: pd.DataFrame, period: int, std_dev: int) -> Dict[str, pd.DataFrame]:
+    std = close.rolling(window=period).std()
+    upper = sma + (std * std_dev)
+    lower = sma - (std * std_dev)
+
+    width = ((upper - lower) / sma.replace(0, _EPS)) * 100
+    width = width.fillna(0)
+    return {'upper': upper, 'middle': sma, 'lower': lower, 'width': width}
+
+
+def _atr(true_range: pd.DataFrame, period: int) -> pd.DataFrame:
+    return true_range.rolling(window=period).mean()
+
+
+def _adx(high: pd.DataFrame, low: pd.DataFrame, atr: pd.DataFrame, period: int) -> pd.DataFrame:
+    plus_dm = high.diff()
+    minus_dm = low.diff()
+    plus_dm = plus_dm.mask(plus_dm < 0, 0)
+    minus_dm = minus_dm.mask(minus_dm > 0, 0)
+
+    atr_safe = atr.replace(0, _EPS)
+    plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr_safe)
+    minus_di = abs(100 * (minus_dm.rolling(window=period).mean() / atr_safe))
+
+    di_sum = (plus_di + minus_di).replace(0, _EPS)
+    dx = (abs(plus_di - minus_di) / di_sum) * 100
+    adx = dx.rolling(window=period).mean()
+    return adx.fillna(0)
+
+
+def _obv(delta: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    return (np.sign(delta) * volume).fillna(0).cumsum()
+
+
+def _vwap(typical_price: pd.DataFrame, volume: pd.DataFrame) -> pd.DataFrame:
+    # Protect against zero volume
+    volume_safe = volume.replace(0, _EPS)
+    vwap = (typical_price * volume).cumsum() / volume_safe.cumsum()
+    return vwap.fillna(typical_price)
+
+
+def _cci(typical_price: pd.DataFrame, period: int) -> pd.DataFrame:
+    sma_tp = typical_price.rolling(window=period).mean()
+    mean_deviation = panel_rolling_mean_deviation(typical_price, period)
+
+    mean_deviation_safe = mean_deviation.replace(0, _EPS)
+    cci = (typical_price - sma_tp) / (0.015 * mean_deviation_safe)
+    return cci.fillna(0)
+
+
+def _mfi(typical_price: pd.DataFrame, volume: pd.DataFrame, period: int) -> pd.DataFrame:
+    raw_money_flow = typical_price * volume
+
+    # Money flow counts as positive/negative when typical price rises/falls
+    prev_typical_price = typical_price.shift(1)
+    positive_flow = raw_money_flow.where(typical_price > prev_typical_price, 0.0)
+    negative_flow = raw_money_flow.where(typical_price < prev_typical_price, 0.0)
+
+    positive_mf = positive_flow.rolling(window=period).sum()
+    negative_mf = negative_flow.rolling(window=period).sum()
+
+    negative_mf_safe = negative_mf.replace(0, _EPS)
+    mfi = 100 - (100 / (1 + positive_mf / negative_mf_safe))
+    return mfi.fillna(50).clip(0, 100)
+
+
+def panel_rsi(close: Panel, period: int = 14) -> Panel:
+    """RSI (simple-average gains/losses) with division-by-zero protection."""
+    (close,), as_array = _frames(close)
+    return _out(_rsi(close.diff(), period), as_array)
+
+
+def panel_macd(close: Panel, fast: int = 12, slow: int = 26, signal: int = 9) -> Dict[str, Panel]:
+    """MACD line, signal line and histogram."""
+    (close,), as_array = _frames(close)
+    exp1 = close.ewm(span=fast, adjust=False).mean()
+    exp2 = close.ewm(span=slow, adjust=False).mean()
+    return _out(_macd(exp1, exp2, signal), as_array)
+
+
+def panel_bollinger_bands(close: Panel, period: int = 20, std_dev: int = 2) -> Dict[str, Panel]:
+    """Bollinger Bands and band width (%)."""
+    (close,), as_array = _frames(close)
+    sma = close.rolling(window=period).mean()
+    return _out(_bollinger_bands(close, sma, period, std_dev), as_array)
+
+
+def panel_atr(high: Panel, low: Panel, close: Panel, period: int = 14) -> Panel:
+    """Average True Range (simple average)."""
+    (high, low, close), as_array = _frames(high, low, close)
+    return _out(_atr(_true_range(high, low, close), period), as_array)
+
+
+def panel_adx(high: Panel, low: Panel, close: Panel, period: int = 14) -> Panel:
+    """Average Directional Index with division protection."""
+    (high, low, close), as_array = _frames(high, low, close)
+    atr = _atr(_true_range(high, low, close), period)
+    return _out(_adx(high, low, atr, period), as_array)
+
+
+def panel_stochastic(high: Panel, low: Panel, close: Panel,
+                     k_period: int = 14, d_period: int = 3) -> Dict[str, Panel]:
+    """Stochastic oscillator %K and %D."""
+    (high, low, close), as_array = _frames(high, low, close)
+    lowest_low = low.rolling(window=k_period).min()
+    highest_high = high.rolling(window=k_period).max()
+
+    range_val = (highest_high - lowest_low).replace(0, _EPS)
+    k = 100 * (close - lowest_low) / range_val
+    k = k.fillna(50).clip(0, 100)
+
+    d = k.rolling(window=d_period).mean()
+    return _out({'k': k, 'd': d}, as_array)
+
+
+def panel_obv(close: Panel, volume: Panel) -> Panel:
+    """On-Balance Volume."""
+    (close, volume), as_array = _frames(close, volume)
+    return _out(_obv(close.diff(), volume), as_array)
+
+
+def panel_vwap(high: Panel, low: Panel, close: Panel, volume: Panel) -> Panel:
+    """Volume Weighted Average Price (cumulative) with zero-volume protection."""
+    (high, low, close, volume), as_array = _frames(high, low, close, volume)
+    return _out(_vwap(_typical_price(high, low, close), volume), as_array)
+
+
+def panel_roc(close: Panel, period: int = 10) -> Panel:
+    """Rate of Change (%) with division protection."""
+    (close,), as_array = _frames(close)
+    shifted = close.shift(period)
+    roc = ((close - shifted) / shifted.replace(0, _EPS)) * 100
+    return _out(roc, as_array)
+
+
+def panel_williams_r(high: Panel, low: Panel, close: Panel, period: int = 14) -> Panel:
+    """Williams %R with division protection."""
+    (high, low, close), as_array = _frames(high, low, close)
+    highest_high = high.rolling(window=period).max()
+    lowest_low = low.rolling(window=period).min()
+
+    range_val = (highest_high - lowest_low).replace(0, _EPS)
+    wr = -100 * (highest_high - close) / range_val
+    return _out(wr.fillna(-50).clip(-100, 0), as_array)
+
+
+def panel_rolling_mean_deviation(data: Panel, period: int) -> Panel:
+    """
+    Rolling mean absolute deviation around each window's mean.
+
+    Evaluates every window of every column at once, one window offset at a
+    time, so working memory stays at a few (bars x tickers) arrays whatever
+    the period. Windows containing NaN give NaN, like rolling().
+    """
+    (data,), as_array = _frames(data)
+    values = data.to_numpy(dtype=float)
+    result = np.full(values.shape, np.nan)
+    if period > 0 and len(values) >= period:
+        # Offset k of every window: values[k:k + count] is bar k of windows 0..count-1
+        count = len(values) - period + 1
+        total = np.zeros((count,) + values.shape[1:])
+        for k in range(period):
+            total += values[k:k + count]
+        means = total / period
+        deviation = np.zeros_like(means)
+        for k in range(period):
+            deviation += np.abs(values[k:k + count] - means)
+        result[period - 1:] = deviation / period
+    if isinstance(data, pd.Series):
+        return pd.Series(result, index=data.index, name=data.name)
+    return _out(pd.DataFrame(result, index=data.index, columns=data.columns), as_array)
+
+
+def panel_cci(high: Panel, low: Panel, close: Panel, period: int = 20) -> Panel:
+    """Commodity Channel Index with division protection."""
+    (high, low, close), as_array = _frames(high, low, close)
+    return _out(_cci(_typical_price(high, low, close), period), as_array)
+
+
+def panel_mfi(high: Panel, low: Panel, close: Panel, volume: Panel, period: int = 14) -> Panel:
+    """Money Flow Index with division protection."""
+    (high, low, close, volume), as_array = _frames(high, low, close, volume)
+    return _out(_mfi(_typical_price(high, low, close), volume, period), as_array)
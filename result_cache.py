@@ -0,0 +1,246 @@
+"""
+RESULT CACHE MODULE
+===================
+Content-addressed cache of backtest results.
+
+A result is keyed by a hash of everything that determines it: the OHLCV
+bars it ran on, the strategy definition (its long/short expressions, not
+just its name), initial capital, commission and the requested detail
+level. New or revised bars change the data hash, so stale results are
+never served and nothing has to be invalidated by hand; an edited strategy
+likewise gets a new key.
+
+Results live in an in-memory LRU of their pickled bytes in front of an
+on-disk tier of the same bytes as files, so a backtest already run by another session or before a restart
+returns without recomputing. Both tiers are shared process-wide through
+get_result_cache(). Every lookup unpickles a fresh copy, so a caller
+mutating its result does not change what later lookups return.
+
+Files are unpickled only if they start with this cache's header, which
+skips stray or outdated files but is no defence against a crafted one:
+like any pickle store, RESULT_CACHE_DIR must only be writable by trusted
+users.
+"""
+
+import dataclasses
+import hashlib
+import os
+import pickle
+import threading
+from collections import OrderedDict
+from typing import Any, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from market_data import OHLCV_COLUMNS
+from strategy_registry import STRATEGY_REGISTRY, StrategySpec
+
+DEFAULT_RESULT_CACHE_DIR = os.environ.get(
+    'RESULT_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), 'data', 'results')
+)
+DEFAULT_MAX_ENTRIES = 256
+DEFAULT_MAX_DISK_ENTRIES = 4096
+
+# Bump when simulation or metrics change, so results cached by older code are not served
+CACHE_VERSION = 1
+
+# Start of every result file; anything else in the directory is never unpickled
+_HEADER = f"stockscreener-result:{CACHE_VERSION}\n".encode()
+
+
+def data_fingerprint(df: pd.DataFrame) -> str:
+    """Hash of a frame's dates and OHLCV values (changes with every new or revised bar)."""
+    digest = hashlib.blake2b(digest_size=16)
+    index = pd.DatetimeIndex(df.index)
+    digest.update(f"{index.unit}|{index.tz}|{len(index)}".encode())
+    digest.update(index.asi8.tobytes())
+    for column in OHLCV_COLUMNS:
+        if column in df:
+            digest.update(column.encode())
+            digest.update(np.ascontiguousarray(df[column].to_numpy(dtype=float)).tobytes())
+    return digest.hexdigest()
+
+
+def strategy_fingerprint(strategy: Union[str, StrategySpec]) -> str:
+    """Definition of a strategy as it is evaluated (unknown names evaluate as-is)."""
+    spec = STRATEGY_REGISTRY.get(strategy, strategy) if isinstance(strategy, str) else strategy
+    if isinstance(spec, StrategySpec):
+        return repr((spec.name, spec.long, spec.short))
+    return repr(spec)
+
+
+def result_key(df: pd.DataFrame, strategy: Union[str, StrategySpec], initial_capital: float,
+               commission: float, detail: str, curve_points: Optional[int] = None) -> str:
+    """
+    Cache key of one backtest.
+
+    Args:
+        df: OHLCV bars the backtest runs on
+        strategy: Strategy name or StrategySpec
+        initial_capital: Starting capital
+        commission: Commission per trade
+        detail: Result detail level (FULL, COMPACT or SUMMARY)
+        curve_points: Downsampled COMPACT curve length
+
+    Returns:
+        Hex digest
+    """
+    parts = (CACHE_VERSION, data_fingerprint(df), strategy_fingerprint(strategy),
+             float(initial_capital), float(commission), detail, curve_points)
+    return hashlib.blake2b(repr(parts).encode(), digest_size=16).hexdigest()
+
+
+class ResultCache:
+    """Two-tier (memory LRU, then disk) store of backtest results by key."""
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES, root: Optional[str] = DEFAULT_RESULT_CACHE_DIR,
+                 max_disk_entries: int = DEFAULT_MAX_DISK_ENTRIES):
+        """
+        Args:
+            max_entries: Results kept in memory
+            root: Directory of the disk tier (None for memory only)
+            max_disk_entries: Result files kept on disk; the least recently
+                used are removed beyond this (checked every
+                max_disk_entries // 16 writes, so it can briefly overshoot)
+        """
+        self.max_entries = max_entries
+        self.root = root
+        self.max_disk_entries = max_disk_entries
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self._writes = 0
+        self._prune_every = max(1, max_disk_entries // 16)
+        self._entries: "OrderedDict[str, bytes]" = OrderedDict()  # key -> pickled result
+        self._lock = threading.Lock()
+        if root is not None:
+            os.makedirs(root, exist_ok=True)
+
+    def path(self, key: str) -> str:
+        """File path of a key in the disk tier."""
+        return os.path.join(self.root, f"{key}.pkl")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Copy of the cached result for key, or None."""
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+        if data is not None:
+            return pickle.loads(data)
+
+        data = self._read(key)
+        result = None
+        if data is not None:
+            try:
+                result = pickle.loads(data)
+            except Exception as e:
+                print(f"Error reading cached result {key}: {str(e)}")
+        with self._lock:
+            if result is None:
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(key, data)
+        return result
+
+    def put(self, key: str, result: Any):
+        """Store a copy of a result in both tiers."""
+        data = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._remember(key, data)
+        self._write(key, data)
+
+    def clear(self):
+        """Drop every cached result, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        if self.root is not None:
+            for name in os.listdir(self.root):
+                if name.endswith('.pkl'):
+                    os.remove(os.path.join(self.root, name))
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __getstate__(self):
+        # Pool workers get the configuration and share only the disk tier
+        return {'max_entries': self.max_entries, 'root': self.root, 'max_disk_entries': self.max_disk_entries}
+
+    def __setstate__(self, state):
+        self.__init__(**state)
+
+    def _remember(self, key: str, data: bytes):
+        self._entries[key] = data
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _read(self, key: str) -> Optional[bytes]:
+        if self.root is None:
+            return None
+        path = self.path(key)
+        try:
+            with open(path, 'rb') as f:
+                if f.read(len(_HEADER)) != _HEADER:
+                    return None
+                data = f.read()
+            os.utime(path)  # Recently used files survive pruning
+            return data
+        except FileNotFoundError:
+            return None
+        except Exception as e:
+            print(f"Error reading cached result {key}: {str(e)}")
+            return None
+
+    def _write(self, key: str, data: bytes):
+        if self.root is None:
+            return
+        path = self.path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(_HEADER)
+                f.write(data)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            print(f"Error writing cached result {key}: {str(e)}")
+            return
+        with self._lock:
+            self._writes += 1
+            prune = self._writes % self._prune_every == 1 or self._prune_every == 1
+        if prune:
+            self._prune()
+
+    def _prune(self):
+        """Remove the least recently used files beyond max_disk_entries."""
+        try:
+            files = [os.path.join(self.root, name) for name in os.listdir(self.root) if name.endswith('.pkl')]
+            if len(files) <= self.max_disk_entries:
+                return
+            files.sort(key=os.path.getmtime)
+            for path in files[:len(files) - self.max_disk_entries]:
+                os.remove(path)
+        except OSError:
+            pass  # Another process pruned the same files
+
+
+def with_ticker(result: Any, ticker: str) -> Any:
+    """A cached result relabelled for the ticker it is served to (identical bars, other symbol)."""
+    return result if result.ticker == ticker else dataclasses.replace(result, ticker=ticker)
+
+
+_result_cache: Optional[ResultCache] = None
+_result_cache_lock = threading.Lock()
+
+
+def get_result_cache() -> ResultCache:
+    """Process-wide result cache shared by all Streamlit sessions."""
+    global _result_cache
+    with _result_cache_lock:
+        if _result_cache is None:
+            _result_cache = ResultCache()
+        return _result_cache
@@ -0,0 +1,272 @@
+"""
+RESUMABLE BACKTEST MODULE
+=========================
+Backtests that keep their end state, so new bars extend a run instead of
+re-simulating the whole history.
+
+A ResumableBacktest holds everything the simulation needs to carry on: the
+open position, its entry price and date, capital, the last signal, the
+streaming indicator state behind the strategy's signals and the equity
+curve and closed trades so far. update() only consumes bars after the last
+one it has seen, so re-evaluating every strategy on every ticker each night
+costs O(new bars) in indicators, signals and simulation. result() scores
+the run exactly as BacktestEngine.run_backtest scores the full history.
+
+The bar dates and equity curve live in growable numpy buffers (capacity
+doubles when full), so appending bars is amortized O(new bars) too. A
+snapshot still holds the whole curve, since result() scores it: to_dict()
+is O(history), which is what saving it costs anyway.
+
+State round-trips through to_dict()/from_dict() (JSON-friendly) and pickle.
+"""
+
+import math
+from typing import Any, Dict, List, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from backtesting import FULL, SUMMARY, TRADE_DTYPE, BacktestEngine, _bar_dates
+from strategy_registry import STRATEGY_REGISTRY, StrategySpec, StreamingStrategies
+
+BUY_AND_HOLD = "Buy and Hold"
+
+
+def _timestamp(value: Optional[str], tz: Optional[str]) -> Optional[pd.Timestamp]:
+    """Timestamp from its ISO string, back in the history's own timezone."""
+    if value is None:
+        return None
+    ts = pd.Timestamp(value)
+    return ts.tz_convert(tz) if tz else ts
+
+
+def _dates(values: np.ndarray, unit: str, tz: Optional[str], name: Any) -> pd.DatetimeIndex:
+    """Bar dates from integers in their unit (UTC for tz-aware indexes)."""
+    dates = pd.DatetimeIndex(values.astype(f"datetime64[{unit}]"), name=name)
+    return dates.tz_localize('UTC').tz_convert(tz) if tz else dates
+
+
+def _grow(buffer: np.ndarray, size: int) -> np.ndarray:
+    """buffer with room for size items, doubling its capacity when full."""
+    if size <= len(buffer):
+        return buffer
+    grown = np.empty(max(size, 2 * len(buffer)), dtype=buffer.dtype)
+    grown[:len(buffer)] = buffer
+    return grown
+
+
+class ResumableBacktest:
+    """One strategy on one ticker, advanced bar by bar."""
+
+    def __init__(self, strategy: Union[str, StrategySpec], ticker: str = "UNKNOWN",
+                 engine: Optional[BacktestEngine] = None):
+        """
+        Args:
+            strategy: Registered strategy name, "Buy and Hold" or a StrategySpec
+            ticker: Stock ticker symbol
+            engine: BacktestEngine whose capital/commission to use
+        """
+        engine = engine or BacktestEngine()
+        if isinstance(strategy, str) and strategy != BUY_AND_HOLD and strategy not in STRATEGY_REGISTRY:
+            raise ValueError(f"Unknown strategy {strategy!r}")
+        self.strategy = strategy.name if isinstance(strategy, StrategySpec) else strategy
+        self.ticker = ticker
+        self.initial_capital = engine.initial_capital
+        self.commission = engine.commission
+        self.signals = None if strategy == BUY_AND_HOLD else StreamingStrategies([strategy])
+
+        self.capital = float(engine.initial_capital)
+        self.position = 0  # 1 = long, -1 = short, 0 = flat
+        self.entry_price = 0.0
+        self.entry_date: Optional[pd.Timestamp] = None
+        self.prev_signal = 0
+        self.first_close = math.nan
+        self.last_close = math.nan
+        self.bars = 0
+        self.unit, self.tz, self.index_name = 'ns', None, None  # Of the bar dates
+        self._stamps = np.empty(0, dtype=np.int64)  # Bar dates as integers (see _dates); bars used
+        self._equity = np.empty(0, dtype=float)
+        self.trades: List[tuple] = []  # Closed trades, unrounded, in TRADE_DTYPE field order
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, strategy: Union[str, StrategySpec], ticker: str = "UNKNOWN",
+                     engine: Optional[BacktestEngine] = None) -> 'ResumableBacktest':
+        """Run a strategy over an OHLCV history, keeping the state to resume from."""
+        state = cls(strategy, ticker, engine)
+        state.update(df)
+        return state
+
+    @property
+    def dates(self) -> pd.DatetimeIndex:
+        return _dates(self._stamps[:self.bars], self.unit, self.tz, self.index_name)
+
+    @property
+    def equity(self) -> np.ndarray:
+        return self._equity[:self.bars]
+
+    @property
+    def last_date(self) -> Optional[pd.Timestamp]:
+        if not self.bars:
+            return None
+        return _dates(self._stamps[self.bars - 1:self.bars], self.unit, self.tz, self.index_name)[0]
+
+    def update(self, df: pd.DataFrame) -> int:
+        """
+        Advance over the bars of df that are newer than the last bar seen.
+
+        df may be just the new bars or the whole refreshed history. If it
+        still contains the last bar seen with a different close (a revised
+        or re-adjusted history), the state is stale and ValueError is raised;
+        rebuild it with from_history().
+
+        Returns:
+            Number of new bars consumed
+        """
+        last = self.last_date
+        if last is not None:
+            start = df.index.searchsorted(last)
+            if start < len(df) and df.index[start] == last:
+                close = float(df['Close'].iloc[start])
+                if close != self.last_close and not (math.isnan(close) and math.isnan(self.last_close)):
+                    raise ValueError(f"{self.ticker}: bar {last} changed since the backtest state was saved")
+                start += 1
+            df = df.iloc[start:]
+        if df.empty:
+            return 0
+
+        index = pd.DatetimeIndex(df.index)
+        if not self.bars:
+            self.unit, self.tz, self.index_name = index.unit, None if index.tz is None else str(index.tz), index.name
+        self._stamps = _grow(self._stamps, self.bars + len(df))
+        self._stamps[self.bars:self.bars + len(df)] = index.as_unit(self.unit).asi8
+        self._equity = _grow(self._equity, self.bars + len(df))
+
+        columns = [column for column in ('Open', 'High', 'Low', 'Close', 'Volume') if column in df]
+        for date, values in zip(df.index, np.column_stack([df[column].to_numpy(dtype=float) for column in columns]).tolist()):
+            self._step(date, dict(zip(columns, values)))
+        return len(df)
+
+    def _step(self, date: pd.Timestamp, bar: Dict[str, float]):
+        """One bar of BacktestEngine._simulate_loop (or the Buy and Hold curve)."""
+        price = float(bar['Close'])
+        signal = 1 if self.signals is None else self.signals.update(bar)[self.strategy]
+
+        if not self.bars:
+            self.first_close = price
+            equity = self.capital
+        elif self.signals is None:
+            equity = self._equity[self.bars - 1] * (price / self.last_close)
+        else:
+            if signal != self.prev_signal and signal != 0:
+                # Close the open position, then open one in the signal's direction
+                if self.position != 0:
+                    exit_price = price * (1 - self.commission if self.position == 1 else 1 + self.commission)
+                    pnl = self._pnl(exit_price)
+                    self.trades.append((self.entry_date, date, self.entry_price, exit_price, self.position,
+                                        pnl, (pnl / self.capital) * 100, (date - self.entry_date).days))
+                    self.capital += pnl
+                    self.position = 0
+                if signal == 1:
+                    self.position, self.entry_price, self.entry_date = 1, price * (1 + self.commission), date
+                elif signal == -1:
+                    self.position, self.entry_price, self.entry_date = -1, price * (1 - self.commission), date
+            equity = self.capital + self._pnl(price) if self.position != 0 else self.capital
+
+        self.prev_signal = signal
+        self.last_close = price
+        self._equity[self.bars] = equity
+        self.bars += 1
+
+    def _pnl(self, price: float) -> float:
+        """PnL of the open position if it were closed at price."""
+        if self.position == 1:
+            return (price - self.entry_price) * (self.capital / self.entry_price)
+        return (self.entry_price - price) * (self.capital / self.entry_price)
+
+    def result(self, detail: str = FULL, curve_points: Optional[int] = None):
+        """
+        Score the run so far, closing any open position at the last close.
+
+        Args:
+            detail: FULL, COMPACT or SUMMARY (see BacktestEngine.run_backtest)
+            curve_points: Downsample a COMPACT equity curve to this many points
+
+        Returns:
+            The result run_backtest gives on the full history
+        """
+        if not self.bars:
+            raise ValueError(f"{self.ticker}: no bars to score")
+        engine = BacktestEngine(initial_capital=self.initial_capital, commission=self.commission)
+        index = self.dates
+        close = (self.first_close, self.last_close)
+
+        if self.signals is None:
+            result = engine._buy_and_hold_result(index, close, self.equity.copy(), self.ticker)
+            return result if detail == FULL else result.compact(curve_points, detail == SUMMARY)
+
+        capital, trades = self.capital, list(self.trades)
+        if self.position != 0:
+            exit_price = self.last_close
+            pnl = self._pnl(exit_price)
+            capital += pnl
+            # The final close is measured against capital after it, like _simulate_loop
+            trades.append((self.entry_date, self.dates[-1], self.entry_price, exit_price, self.position,
+                           pnl, (pnl / capital) * 100, (self.dates[-1] - self.entry_date).days))
+
+        ledger = np.empty(len(trades), dtype=TRADE_DTYPE)
+        if trades:
+            columns = list(zip(*trades))
+            ledger['entry_date'] = _bar_dates(pd.DatetimeIndex(columns[0]))
+            ledger['exit_date'] = _bar_dates(pd.DatetimeIndex(columns[1]))
+            for name, values in zip(('entry_price', 'exit_price', 'pnl', 'pnl_pct'), columns[2:4] + columns[5:7]):
+                ledger[name] = np.round(np.array(values, dtype=float), 2)
+            ledger['position'] = columns[4]
+            ledger['holding_days'] = columns[7]
+
+        run = (capital, ledger, self.equity.copy())
+        return engine._summarize(index, close, [self.strategy], self.ticker, [run], detail, curve_points)[0]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable snapshot of the backtest state."""
+        iso = lambda ts: None if ts is None else ts.isoformat()
+        return {
+            'strategy': self.strategy,
+            'ticker': self.ticker,
+            'initial_capital': self.initial_capital,
+            'commission': self.commission,
+            'signals': None if self.signals is None else self.signals.to_dict(),
+            'capital': self.capital,
+            'position': self.position,
+            'entry_price': self.entry_price,
+            'entry_date': iso(self.entry_date),
+            'prev_signal': self.prev_signal,
+            'first_close': self.first_close,
+            'last_close': self.last_close,
+            'dates': {'values': self._stamps[:self.bars].tolist(), 'unit': self.unit, 'tz': self.tz,
+                      'name': self.index_name},
+            'equity': self.equity.tolist(),
+            'trades': [[iso(t[0]), iso(t[1])] + list(t[2:]) for t in self.trades],
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'ResumableBacktest':
+        """Rebuild a backtest from to_dict() output."""
+        obj = cls.__new__(cls)
+        for name in ('strategy', 'ticker', 'initial_capital', 'commission', 'capital', 'position',
+                     'entry_price', 'prev_signal', 'first_close', 'last_close'):
+            setattr(obj, name, state[name])
+        obj.signals = None if state['signals'] is None else StreamingStrategies.from_dict(state['signals'])
+        dates = state['dates']
+        obj.unit, obj.tz, obj.index_name = dates['unit'], dates['tz'], dates['name']
+        obj._stamps = np.array(dates['values'], dtype=np.int64)
+        obj._equity = np.array(state['equity'], dtype=float)
+        obj.bars = len(obj._equity)
+        obj.entry_date = _timestamp(state['entry_date'], obj.tz)
+        obj.trades = [(_timestamp(t[0], obj.tz), _timestamp(t[1], obj.tz)) + tuple(t[2:]) for t in state['trades']]
+        return obj
+
+    def __getstate__(self):
+        # Pickle without the unused capacity of the buffers
+        state = self.__dict__.copy()
+        state['_stamps'], state['_equity'] = self._stamps[:self.bars].copy(), self.equity.copy()
+        return state
@@ -0,0 +1,120 @@
+"""
+SCREENER PIPELINE ENGINE
+========================
+Two-stage fetch -> score pipeline used by the universe screener.
+
+- Stage 1 (I/O bound): market data is fetched on a bounded worker pool,
+  either one ticker per task or one batch of tickers per task.
+- Stage 2 (CPU bound): each frame is scored on the calling thread as soon as
+  its fetch completes, while the remaining fetches are still in flight.
+
+Scoring stays on the calling thread so Streamlit widgets (progress bar,
+status text) can be updated safely from the progress callback.
+"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+DEFAULT_FETCH_WORKERS = 16
+DEFAULT_MAX_IN_FLIGHT = 64
+
+
+@dataclass
+class PipelineStats:
+    """Counters collected during a pipeline run."""
+    total: int = 0
+    fetched: int = 0
+    scored: int = 0
+    fetch_errors: int = 0
+    score_errors: int = 0
+    elapsed: float = 0.0
+
+
+def run_pipeline(tickers: Sequence[str],
+                 fetch_fn: Callable[[str], Any],
+                 score_fn: Callable[[str, Any], Optional[Dict]],
+                 fetch_workers: int = DEFAULT_FETCH_WORKERS,
+                 max_in_flight: int = DEFAULT_MAX_IN_FLIGHT,
+                 progress_callback: Optional[Callable[[int, int, str], None]] = None,
+                 stats: Optional[PipelineStats] = None,
+                 batch_size: Optional[int] = None) -> List[Dict]:
+    """
+    Fetch and score a list of tickers with bounded concurrency.
+
+    Args:
+        tickers: Tickers to screen
+        fetch_fn: Returns market data for a ticker (None to skip it). With
+            batch_size set, takes a list of tickers and returns a dict of
+            ticker -> data instead
+        score_fn: Turns (ticker, data) into a result row (None to drop it)
+        fetch_workers: Size of the fetch thread pool
+        max_in_flight: Maximum fetch tasks submitted but not yet scored
+        progress_callback: Called as (done, total, ticker) after each ticker
+        stats: Optional PipelineStats filled in during the run
+        batch_size: Tickers per fetch task (None for one ticker per task)
+
+    Returns:
+        Result rows in completion order
+    """
+    stats = stats if stats is not None else PipelineStats()
+    stats.total = len(tickers)
+    started = time.perf_counter()
+
+    results = []
+    if not tickers:
+        return results
+
+    if batch_size:
+        units = [list(tickers[i:i + batch_size]) for i in range(0, len(tickers), batch_size)]
+    else:
+        units = [[ticker] for ticker in tickers]
+
+    def fetch_unit(unit: List[str]) -> Dict[str, Any]:
+        if batch_size:
+            return fetch_fn(unit) or {}
+        return {unit[0]: fetch_fn(unit[0])}
+
+    max_in_flight = max(1, max_in_flight)
+    pending = {}
+    next_idx = 0
+    done_count = 0
+
+    with ThreadPoolExecutor(max_workers=max(1, fetch_workers)) as pool:
+        while next_idx < len(units) or pending:
+            # Keep the fetch stage topped up without exceeding the window
+            while next_idx < len(units) and len(pending) < max_in_flight:
+                unit = units[next_idx]
+                pending[pool.submit(fetch_unit, unit)] = unit
+                next_idx += 1
+
+            completed, _ = wait(pending, return_when=FIRST_COMPLETED)
+            for future in completed:
+                unit = pending.pop(future)
+
+                try:
+                    fetched = future.result()
+                except Exception:
+                    fetched = {}
+                    stats.fetch_errors += len(unit)
+
+                for ticker in unit:
+                    done_count += 1
+                    data = fetched.get(ticker)
+
+                    if data is not None:
+                        stats.fetched += 1
+                        try:
+                            row = score_fn(ticker, data)
+                            if row is not None:
+                                results.append(row)
+                                stats.scored += 1
+                        except Exception:
+                            stats.score_errors += 1
+
+                    if progress_callback is not None:
+                        progress_callback(done_count, len(tickers), ticker)
+
+    stats.elapsed = time.perf_counter() - started
+    return results
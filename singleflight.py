@@ -0,0 +1,120 @@
+"""
+SINGLE-FLIGHT MODULE
+====================
+Process-wide request coalescing.
+
+When several Streamlit sessions ask for the same data at the same moment,
+the first caller (the leader) runs the fetch and every concurrent caller
+with the same key waits for that result instead of issuing its own request.
+"""
+
+import threading
+from typing import Any, Callable, Dict, Hashable, List, Sequence
+
+
+class _Call:
+    """One in-flight call shared by all callers with the same key."""
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn() once for all concurrent callers with the same key.
+
+        Args:
+            key: Identifies the request (e.g. ('regime', epoch))
+            fn: Performs the request
+
+        Returns:
+            fn's result; if fn raised, every waiting caller gets the exception
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+            call.done.set()
+        return call.result
+
+    def do_batch(self, keys: Sequence[Hashable], fn: Callable[[List[Hashable]], Dict[Hashable, Any]]) -> Dict[Hashable, Any]:
+        """
+        Coalesce a batch request key by key.
+
+        Keys nobody else is fetching are passed to fn in one call; keys that
+        are already in flight are awaited instead of fetched again.
+
+        Args:
+            keys: Keys needed by this caller
+            fn: Fetches a list of keys and returns a dict of key -> result
+
+        Returns:
+            Dict of key -> result (None for keys fn did not return)
+        """
+        owned, waiting = [], []
+        with self._lock:
+            for key in dict.fromkeys(keys):
+                call = self._calls.get(key)
+                if call is None:
+                    call = self._calls[key] = _Call()
+                    owned.append((key, call))
+                else:
+                    waiting.append((key, call))
+
+        results = {}
+        if owned:
+            try:
+                fetched = fn([key for key, _ in owned]) or {}
+                for key, call in owned:
+                    call.result = results[key] = fetched.get(key)
+            except BaseException as e:
+                for _, call in owned:
+                    call.error = e
+                raise
+            finally:
+                with self._lock:
+                    for key, _ in owned:
+                        del self._calls[key]
+                for _, call in owned:
+                    call.done.set()
+
+        for key, call in waiting:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            results[key] = call.result
+
+        return results
+
+
+_default_group = SingleFlight()
+
+
+def get_default_group() -> SingleFlight:
+    """Process-wide single-flight group shared by all Streamlit sessions."""
+    return _default_group
@@ -0,0 +1,527 @@
+"""
+STRATEGY REGISTRY MODULE
+========================
+Strategies declared as expressions over named indicators, e.g.
+
+    register_strategy("Fast SMA Trend", long="sma(close, 10) > sma(close, 30) and rsi(close) < 70",
+                      short="sma(close, 10) < sma(close, 30)")
+
+Expressions are parsed once (Python syntax, but only the whitelisted nodes
+below are accepted; nothing is eval'd) and compiled into a flat program of
+vectorized NumPy steps. Compiling several strategies together merges
+identical subexpressions, so a batch of hundreds of strategies evaluates
+every distinct indicator, comparison and combination exactly once.
+
+A strategy's signal is 1 where `long` holds and -1 where `short` holds,
+else 0. Without `short`, every bar that is not long is short (-1), like the
+built-in crossover strategies.
+
+Strategy families the optimizer tunes are expression patterns with named
+parameters (STRATEGY_TEMPLATES), and the built-in strategies are
+registered as parameterizations of them (NAMED_STRATEGIES), so a built-in
+and its template cannot drift apart.
+"""
+
+import ast
+import inspect
+import operator
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+import streaming_indicators as streaming
+from indicator_cache import IndicatorCache
+from indicators import (
+    calculate_sma, calculate_ema, calculate_rsi, calculate_macd, calculate_bollinger_bands, calculate_roc
+)
+
+COLUMNS = {'open': 'Open', 'high': 'High', 'low': 'Low', 'close': 'Close', 'volume': 'Volume'}
+
+# name -> fn(series, *constant params); params after the series must be literals
+FUNCTIONS: Dict[str, Callable[..., pd.Series]] = {
+    'sma': lambda s, period: calculate_sma(s, period),
+    'ema': lambda s, period: calculate_ema(s, period),
+    'rsi': lambda s, period=14: calculate_rsi(s, period),
+    'roc': lambda s, period=10: calculate_roc(s, period),
+    'macd': lambda s, fast=12, slow=26, signal=9: calculate_macd(s, fast, slow, signal)['macd'],
+    'macd_signal': lambda s, fast=12, slow=26, signal=9: calculate_macd(s, fast, slow, signal)['signal'],
+    'macd_hist': lambda s, fast=12, slow=26, signal=9: calculate_macd(s, fast, slow, signal)['histogram'],
+    'bb_upper': lambda s, period=20, std_dev=2: calculate_bollinger_bands(s, period, std_dev)['upper'],
+    'bb_middle': lambda s, period=20, std_dev=2: calculate_bollinger_bands(s, period, std_dev)['middle'],
+    'bb_lower': lambda s, period=20, std_dev=2: calculate_bollinger_bands(s, period, std_dev)['lower'],
+    'highest': lambda s, period: s.rolling(period).max(),
+    'lowest': lambda s, period: s.rolling(period).min(),
+    'shift': lambda s, periods=1: s.shift(periods),
+}
+
+# name -> (fn(*constant params) -> streaming indicator, part of a dict-valued indicator)
+_STREAMING: Dict[str, Tuple[Callable[..., Any], Optional[str]]] = {
+    'sma': (streaming.RollingMean, None),
+    'ema': (streaming.EMA, None),
+    'rsi': (streaming.RSI, None),
+    'roc': (streaming.ROC, None),
+    'macd': (streaming.MACD, 'macd'),
+    'macd_signal': (streaming.MACD, 'signal'),
+    'macd_hist': (streaming.MACD, 'histogram'),
+    'bb_upper': (streaming.Bollinger, 'upper'),
+    'bb_middle': (streaming.Bollinger, 'middle'),
+    'bb_lower': (streaming.Bollinger, 'lower'),
+    'highest': (lambda period: streaming.RollingExtreme(period, highest=True), None),
+    'lowest': (lambda period: streaming.RollingExtreme(period, highest=False), None),
+    'shift': (streaming.Lag, None),
+}
+
+# Calls on a raw column that map onto IndicatorCache entries, so expression
+# strategies share series with the template strategies and the optimizer
+_CACHE_KEYS: Dict[Tuple[str, str], Callable[..., Tuple[Tuple, Optional[str]]]] = {
+    ('sma', 'Close'): lambda period: (('sma', period), None),
+    ('ema', 'Close'): lambda period: (('ema', period), None),
+    ('rsi', 'Close'): lambda period: (('rsi', period), None),
+    ('sma', 'Volume'): lambda period: (('volume_sma', period), None),
+    ('macd', 'Close'): lambda *p: (('macd',) + p, 'macd'),
+    ('macd_signal', 'Close'): lambda *p: (('macd',) + p, 'signal'),
+    ('macd_hist', 'Close'): lambda *p: (('macd',) + p, 'histogram'),
+    ('bb_upper', 'Close'): lambda *p: (('bollinger',) + p, 'upper'),
+    ('bb_middle', 'Close'): lambda *p: (('bollinger',) + p, 'middle'),
+    ('bb_lower', 'Close'): lambda *p: (('bollinger',) + p, 'lower'),
+}
+
+_BINARY = {
+    ast.Add: ('+', operator.add), ast.Sub: ('-', operator.sub), ast.Mult: ('*', operator.mul),
+    ast.Div: ('/', operator.truediv), ast.BitAnd: ('&', operator.and_), ast.BitOr: ('|', operator.or_),
+}
+_COMPARE = {
+    ast.Gt: ('>', operator.gt), ast.GtE: ('>=', operator.ge), ast.Lt: ('<', operator.lt),
+    ast.LtE: ('<=', operator.le), ast.Eq: ('==', operator.eq), ast.NotEq: ('!=', operator.ne),
+}
+_OPS: Dict[str, Callable] = {symbol: fn for symbol, fn in list(_BINARY.values()) + list(_COMPARE.values())}
+_COMMUTATIVE = {'+', '*', '&', '|', '==', '!='}
+
+# Expression nodes are nested tuples, so equal subexpressions are equal keys:
+#   ('col', 'Close') | ('const', 20) | ('call', 'sma', (arg, 20)) | ('op', '>', a, b)
+#   | ('not', a) | ('neg', a)
+Node = Tuple
+
+
+@dataclass(frozen=True)
+class StrategySpec:
+    """A strategy declared as long/short expressions."""
+    name: str
+    long: str
+    short: Optional[str] = None
+    description: str = ""
+
+
+@lru_cache(maxsize=None)
+def _signature(fn: Callable) -> inspect.Signature:
+    return inspect.signature(fn)
+
+
+def _parse(expression: str) -> Node:
+    """Parse an expression string into a canonical node tuple."""
+    try:
+        tree = ast.parse(expression.strip(), mode='eval')
+    except SyntaxError as e:
+        raise ValueError(f"Invalid strategy expression {expression!r}: {e.msg}") from None
+    return _node(tree.body, expression)
+
+
+def _node(tree: ast.AST, source: str) -> Node:
+    if isinstance(tree, ast.Name):
+        if tree.id.lower() not in COLUMNS:
+            raise ValueError(f"Unknown name {tree.id!r} in {source!r}; use one of {', '.join(COLUMNS)}")
+        return ('col', COLUMNS[tree.id.lower()])
+
+    if isinstance(tree, ast.Constant) and isinstance(tree.value, (int, float)) and not isinstance(tree.value, bool):
+        return ('const', tree.value)
+
+    if isinstance(tree, ast.Call) and isinstance(tree.func, ast.Name) and not tree.keywords:
+        name = tree.func.id.lower()
+        if name == 'abs' and len(tree.args) == 1:
+            return ('abs', _node(tree.args[0], source))
+        if name not in FUNCTIONS:
+            raise ValueError(f"Unknown function {name!r} in {source!r}; use one of {', '.join(FUNCTIONS)}")
+        if not tree.args:
+            raise ValueError(f"{name}() needs a series argument in {source!r}")
+        params = []
+        for arg in tree.args[1:]:
+            param = _node(arg, source)
+            if param[0] != 'const':
+                raise ValueError(f"Parameters of {name}() must be numbers in {source!r}")
+            params.append(param[1])
+        try:
+            bound = _signature(FUNCTIONS[name]).bind(None, *params)
+        except TypeError as e:
+            raise ValueError(f"Bad arguments to {name}() in {source!r}: {e}") from None
+        bound.apply_defaults()
+        if name == 'shift' and bound.arguments['periods'] < 0:
+            # A negative shift reads future bars (look-ahead)
+            raise ValueError(f"shift() periods must be >= 0 in {source!r}")
+        return ('call', name, (_node(tree.args[0], source),) + tuple(bound.args[1:]))
+
+    if isinstance(tree, ast.BinOp) and type(tree.op) in _BINARY:
+        return _op(_BINARY[type(tree.op)][0], _node(tree.left, source), _node(tree.right, source))
+
+    if isinstance(tree, ast.BoolOp):
+        symbol = '&' if isinstance(tree.op, ast.And) else '|'
+        result = _node(tree.values[0], source)
+        for value in tree.values[1:]:
+            result = _op(symbol, result, _node(value, source))
+        return result
+
+    if isinstance(tree, ast.Compare) and all(type(op) in _COMPARE for op in tree.ops):
+        # a < b < c means (a < b) & (b < c)
+        operands = [_node(tree.left, source)] + [_node(c, source) for c in tree.comparators]
+        result = None
+        for op, left, right in zip(tree.ops, operands, operands[1:]):
+            term = _op(_COMPARE[type(op)][0], left, right)
+            result = term if result is None else _op('&', result, term)
+        return result
+
+    if isinstance(tree, ast.UnaryOp):
+        operand = _node(tree.operand, source)
+        if isinstance(tree.op, (ast.Not, ast.Invert)):
+            return ('not', operand)
+        if isinstance(tree.op, ast.USub):
+            return ('const', -operand[1]) if operand[0] == 'const' else ('neg', operand)
+        if isinstance(tree.op, ast.UAdd):
+            return operand
+
+    raise ValueError(f"Unsupported syntax {ast.dump(tree)[:60]!r} in {source!r}")
+
+
+def _children(node: Node) -> Tuple[Node, ...]:
+    kind = node[0]
+    if kind == 'call':
+        return (node[2][0],)
+    if kind == 'op':
+        return node[2], node[3]
+    if kind in ('not', 'neg', 'abs'):
+        return (node[1],)
+    return ()
+
+
+def _size(node: Node) -> int:
+    return 1 + sum(_size(child) for child in _children(node))
+
+
+def _op(symbol: str, left: Node, right: Node) -> Node:
+    if symbol in _COMMUTATIVE and repr(right) < repr(left):
+        left, right = right, left
+    return ('op', symbol, left, right)
+
+
+class CompiledStrategies:
+    """
+    A batch of strategies compiled into one straight-line program.
+
+    Every distinct subexpression of every strategy becomes one step, so
+    shared parts (the same SMA, the same crossover test) are evaluated once.
+    """
+
+    def __init__(self, specs: Sequence[StrategySpec]):
+        self.specs = list(specs)
+        self.steps: List[Node] = []
+        self._slots: Dict[Node, int] = {}
+        self.outputs: Dict[str, Tuple[int, Optional[int]]] = {}
+        self.total_nodes = 0  # Nodes before merging common subexpressions
+
+        for spec in self.specs:
+            for expression in (spec.long, spec.short):
+                if expression:
+                    self.total_nodes += _size(_parse(expression))
+            long_slot = self._emit(_parse(spec.long))
+            short_slot = self._emit(_parse(spec.short)) if spec.short else None
+            self.outputs[spec.name] = (long_slot, short_slot)
+
+    def _emit(self, node: Node) -> int:
+        """Slot holding node's value, adding steps for unseen subexpressions."""
+        slot = self._slots.get(node)
+        if slot is not None:
+            return slot
+        for child in _children(node):
+            self._emit(child)
+        slot = self._slots[node] = len(self.steps)
+        self.steps.append(node)
+        return slot
+
+    def cache_keys(self) -> List[Tuple]:
+        """IndicatorCache keys the program reads, in step order."""
+        keys = []
+        for node in self.steps:
+            if node[0] == 'call':
+                name, (source, *params) = node[1], node[2]
+                if source[0] == 'col' and (name, source[1]) in _CACHE_KEYS:
+                    key = _CACHE_KEYS[(name, source[1])](*params)[0]
+                    if key not in keys:
+                        keys.append(key)
+        return keys
+
+    def evaluate(self, df: pd.DataFrame, indicators: Optional[IndicatorCache] = None) -> Dict[str, np.ndarray]:
+        """
+        Signals for every strategy in the batch.
+
+        Args:
+            df: DataFrame with OHLCV data
+            indicators: IndicatorCache for df to draw indicator series from
+
+        Returns:
+            Dict of strategy name -> int array of 1 / -1 / 0 per bar
+        """
+        indicators = indicators if indicators is not None else IndicatorCache(df)
+        values: List[Any] = []
+        for node in self.steps:
+            values.append(self._step(node, values, df, indicators))
+
+        signals = {}
+        for name, (long_slot, short_slot) in self.outputs.items():
+            long = values[long_slot]
+            if short_slot is None:
+                signals[name] = np.where(long, 1, -1)
+            else:
+                signals[name] = np.where(long, 1, np.where(values[short_slot], -1, 0))
+        return signals
+
+    def _step(self, node: Node, values: List[Any], df: pd.DataFrame, indicators: IndicatorCache) -> Any:
+        value = lambda child: values[self._slots[child]]
+        kind = node[0]
+        if kind == 'col':
+            return df[node[1]].to_numpy()
+        if kind == 'const':
+            return node[1]
+        if kind == 'op':
+            return _OPS[node[1]](value(node[2]), value(node[3]))
+        if kind == 'not':
+            return ~np.asarray(value(node[1]), dtype=bool)
+        if kind == 'neg':
+            return -value(node[1])
+        if kind == 'abs':
+            return np.abs(value(node[1]))
+
+        # Indicator call: reuse IndicatorCache entries for calls on raw columns
+        name, (source, *params) = node[1], node[2]
+        if source[0] == 'col' and (name, source[1]) in _CACHE_KEYS:
+            key, part = _CACHE_KEYS[(name, source[1])](*params)
+            series = indicators.get(*key)
+            series = series[part] if part else series
+        else:
+            series = indicators.memo(('expr', node), lambda: FUNCTIONS[name](
+                pd.Series(value(source), index=df.index), *params))
+        return series.to_numpy()
+
+
+class StreamingStrategies:
+    """
+    Bar-by-bar evaluation of a compiled strategy batch.
+
+    Every indicator call of the program keeps streaming state (see
+    streaming_indicators.py), so each new bar costs O(1) per step and yields
+    the same signal the batch evaluate() gives for that bar. Lookahead
+    (negative shift) cannot be streamed and raises ValueError.
+    """
+
+    def __init__(self, strategies: Sequence[Union[str, StrategySpec]]):
+        self.program = compile_strategies(strategies)
+        self.states: List[Any] = [
+            _STREAMING[node[1]][0](*node[2][1:]) if node[0] == 'call' else None
+            for node in self.program.steps
+        ]
+        self.bars = 0
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame, strategies: Sequence[Union[str, StrategySpec]]) -> 'StreamingStrategies':
+        """Seed the state by replaying an OHLCV history."""
+        state = cls(strategies)
+        columns = [column for column in COLUMNS.values() if column in df]
+        for bar in df[columns].itertuples(index=False, name=None):
+            state.update(dict(zip(columns, bar)))
+        return state
+
+    def update(self, bar: Dict[str, float]) -> Dict[str, int]:
+        """
+        Advance by one bar.
+
+        Args:
+            bar: Mapping (or row) with Open, High, Low, Close and Volume
+
+        Returns:
+            Dict of strategy name -> signal (1 / -1 / 0) on this bar
+        """
+        program = self.program
+        values: List[Any] = []
+        value = lambda child: values[program._slots[child]]
+        with np.errstate(all='ignore'):
+            for node, state in zip(program.steps, self.states):
+                kind = node[0]
+                if kind == 'col':
+                    result = np.float64(bar[node[1]])
+                elif kind == 'const':
+                    result = node[1]
+                elif kind == 'op':
+                    result = _OPS[node[1]](value(node[2]), value(node[3]))
+                elif kind == 'not':
+                    result = not bool(value(node[1]))
+                elif kind == 'neg':
+                    result = -value(node[1])
+                elif kind == 'abs':
+                    result = np.abs(value(node[1]))
+                else:
+                    result = state.update(value(node[2][0]))
+                    part = _STREAMING[node[1]][1]
+                    result = np.float64(result[part] if part else result)
+                values.append(result)
+        self.bars += 1
+
+        signals = {}
+        for name, (long_slot, short_slot) in program.outputs.items():
+            if values[long_slot]:
+                signals[name] = 1
+            else:
+                signals[name] = -1 if short_slot is None or values[short_slot] else 0
+        return signals
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable snapshot: the strategy specs and every indicator's state."""
+        return {
+            'specs': [[spec.name, spec.long, spec.short, spec.description] for spec in self.program.specs],
+            'states': [state.to_dict() if state is not None else None for state in self.states],
+            'bars': self.bars,
+        }
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]) -> 'StreamingStrategies':
+        """Rebuild from to_dict() output."""
+        obj = cls([StrategySpec(*spec) for spec in state['specs']])
+        obj.states = [streaming._TYPES[s['type']].from_dict(s) if s is not None else None
+                      for s in state['states']]
+        obj.bars = state['bars']
+        return obj
+
+
+@lru_cache(maxsize=256)
+def _compile(specs: Tuple[StrategySpec, ...]) -> CompiledStrategies:
+    return CompiledStrategies(specs)
+
+
+def compile_strategies(strategies: Sequence[Union[str, StrategySpec]]) -> CompiledStrategies:
+    """Compile registered strategy names and/or specs into one program."""
+    specs = tuple(spec if isinstance(spec, StrategySpec) else STRATEGY_REGISTRY[spec] for spec in strategies)
+    return _compile(specs)
+
+
+def evaluate_strategies(df: pd.DataFrame, strategies: Sequence[Union[str, StrategySpec]],
+                        indicators: Optional[IndicatorCache] = None) -> Dict[str, np.ndarray]:
+    """Batch-evaluate strategy signals on one DataFrame."""
+    return compile_strategies(strategies).evaluate(df, indicators)
+
+
+STRATEGY_REGISTRY: Dict[str, StrategySpec] = {}
+
+
+def register_strategy(name: str, long: str, short: Optional[str] = None, description: str = "",
+                      replace: bool = False) -> StrategySpec:
+    """
+    Declare a strategy.
+
+    Args:
+        name: Strategy name (shown in the app and used by run_backtest)
+        long: Expression that is true on bars to be long
+        short: Expression that is true on bars to be short (default: not long)
+        description: Free text
+        replace: Allow redefining an existing name
+
+    Returns:
+        The registered StrategySpec (raises ValueError on a bad expression)
+    """
+    if name in STRATEGY_REGISTRY and not replace:
+        raise ValueError(f"Strategy {name!r} is already registered")
+    spec = StrategySpec(name, long, short, description)
+    CompiledStrategies([spec])  # Validate both expressions now
+    STRATEGY_REGISTRY[name] = spec
+    return spec
+
+
+@dataclass
+class StrategyTemplate:
+    """A strategy family with tunable parameters, as long/short expression patterns."""
+    long: str                                       # e.g. "sma(close, {fast}) > sma(close, {slow})"
+    short: Optional[str]
+    defaults: Dict[str, Any]
+    default_grid: Dict[str, List[Any]]
+    is_valid: Callable[..., bool] = lambda **params: True
+
+    def spec(self, name: str, **params) -> StrategySpec:
+        """The strategy for one set of parameters."""
+        return StrategySpec(name, self.long.format(**params), self.short.format(**params) if self.short else None)
+
+    def compile(self, points: Sequence[Dict[str, Any]]) -> CompiledStrategies:
+        """One program for many parameter sets; strategy i is named str(i)."""
+        return compile_strategies([self.spec(str(i), **params) for i, params in enumerate(points)])
+
+    def signals(self, indicators: IndicatorCache, points: Sequence[Dict[str, Any]]) -> List[np.ndarray]:
+        """Per-bar signal of every parameter set, evaluated as one batch."""
+        signals = self.compile(points).evaluate(indicators.df, indicators)
+        return [signals[str(i)] for i in range(len(points))]
+
+    def indicators(self, points: Sequence[Dict[str, Any]]) -> List[Tuple]:
+        """IndicatorCache keys any of the parameter sets reads."""
+        return self.compile(points).cache_keys()
+
+
+# Parameterized strategy families
+STRATEGY_TEMPLATES: Dict[str, StrategyTemplate] = {
+    "SMA Crossover": StrategyTemplate(
+        "sma(close, {fast}) > sma(close, {slow})", None,
+        defaults={'fast': 20, 'slow': 50},
+        default_grid={'fast': list(range(5, 51, 5)), 'slow': list(range(20, 251, 10))},
+        is_valid=lambda fast, slow: fast < slow),
+    "EMA Crossover": StrategyTemplate(
+        "ema(close, {fast}) > ema(close, {slow})", None,
+        defaults={'fast': 12, 'slow': 26},
+        default_grid={'fast': list(range(5, 51, 5)), 'slow': list(range(20, 251, 10))},
+        is_valid=lambda fast, slow: fast < slow),
+    "RSI Mean Reversion": StrategyTemplate(
+        "rsi(close, {period}) < {oversold}", "rsi(close, {period}) > {overbought}",
+        defaults={'period': 14, 'oversold': 30, 'overbought': 70},
+        default_grid={'period': [7, 10, 14, 21], 'oversold': [20, 25, 30, 35], 'overbought': [65, 70, 75, 80]},
+        is_valid=lambda period, oversold, overbought: oversold < overbought),
+    "MACD Signal": StrategyTemplate(
+        "macd_hist(close, {fast}, {slow}, {signal}) > 0", None,
+        defaults={'fast': 12, 'slow': 26, 'signal': 9},
+        default_grid={'fast': [8, 10, 12, 15], 'slow': [21, 26, 30, 35], 'signal': [5, 7, 9, 12]},
+        is_valid=lambda fast, slow, signal: fast < slow),
+    "Bollinger Band Bounce": StrategyTemplate(
+        "close < bb_lower(close, {period}, {std_dev})", "close > bb_upper(close, {period}, {std_dev})",
+        defaults={'period': 20, 'std_dev': 2},
+        default_grid={'period': [10, 15, 20, 25, 30], 'std_dev': [1.5, 2, 2.5, 3]}),
+    "Triple EMA": StrategyTemplate(
+        "ema(close, {fast}) > ema(close, {mid}) and ema(close, {mid}) > ema(close, {slow})",
+        "ema(close, {fast}) < ema(close, {mid}) and ema(close, {mid}) < ema(close, {slow})",
+        defaults={'fast': 5, 'mid': 13, 'slow': 26},
+        default_grid={'fast': [3, 5, 8], 'mid': [10, 13, 17, 21], 'slow': [26, 34, 50]},
+        is_valid=lambda fast, mid, slow: fast < mid < slow),
+    "Volume Breakout": StrategyTemplate(
+        "close > sma(close, {period}) and volume > {multiplier} * sma(volume, {period})",
+        "close < sma(close, {period}) and volume > {multiplier} * sma(volume, {period})",
+        defaults={'period': 20, 'multiplier': 1.5},
+        default_grid={'period': [10, 15, 20, 30, 50], 'multiplier': [1.25, 1.5, 2, 2.5, 3]}),
+}
+
+# Built-in strategies: template parameterizations, registered below
+NAMED_STRATEGIES: Dict[str, Tuple[str, Dict[str, Any]]] = {
+    "SMA Crossover (20/50)": ("SMA Crossover", {'fast': 20, 'slow': 50}),
+    "EMA Crossover (12/26)": ("EMA Crossover", {'fast': 12, 'slow': 26}),
+    "RSI Mean Reversion": ("RSI Mean Reversion", {'period': 14, 'oversold': 30, 'overbought': 70}),
+    "MACD Signal": ("MACD Signal", {'fast': 12, 'slow': 26, 'signal': 9}),
+    "Bollinger Band Bounce": ("Bollinger Band Bounce", {'period': 20, 'std_dev': 2}),
+    "Golden Cross (50/200)": ("SMA Crossover", {'fast': 50, 'slow': 200}),
+    "Triple EMA (5/13/26)": ("Triple EMA", {'fast': 5, 'mid': 13, 'slow': 26}),
+    "Volume Breakout": ("Volume Breakout", {'period': 20, 'multiplier': 1.5}),
+}
+
+for _name, (_template, _params) in NAMED_STRATEGIES.items():
+    _spec = STRATEGY_TEMPLATES[_template].spec(_name, **_params)
+    register_strategy(_name, _spec.long, _spec.short)
@@ -0,0 +1,483 @@
+"""
+STREAMING INDICATORS MODULE
+===========================
+Incremental indicator state updated in O(1) per new bar.
+
+Each indicator is seeded once from history and then fed one bar at a time,
+so an intraday refresh or an end-of-day update costs a few arithmetic
+operations per ticker instead of recomputing the whole series. The running
+sums use the same compensated summation as pandas' rolling mean and the
+EMAs the same recurrence as ewm(adjust=False), so the streamed values track
+the batch functions in indicators.py.
+
+State round-trips through to_dict()/from_dict() (JSON-friendly) and pickle.
+"""
+
+import math
+from collections import deque
+from typing import Any, Dict, Optional
+
+import pandas as pd
+
+_EPS = 2.220446049250313e-16  # np.finfo(float).eps
+_NAN = float('nan')
+
+
+def _isnan(value: float) -> bool:
+    return value != value
+
+
+class _StreamingIndicator:
+    """Base class: subclasses list their state attributes in _fields."""
+
+    _fields = ()
+    _children = ()
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Serializable snapshot of the indicator state."""
+        state = {'type': type(self).__name__}
+        for name in self._fields:
+            value = getattr(self, name)
+            state[name] = list(value) if isinstance(value, deque) else value
+        for name in self._children:
+            state[name] = getattr(self, name).to_dict()
+        return state
+
+    @classmethod
+    def from_dict(cls, state: Dict[str, Any]):
+        """Rebuild an indicator from to_dict() output."""
+        obj = cls.__new__(cls)
+        for name in cls._fields:
+            value = state[name]
+            setattr(obj, name, deque(value) if isinstance(value, list) else value)
+        for name in cls._children:
+            child = state[name]
+            setattr(obj, name, _TYPES[child['type']].from_dict(child))
+        return obj
+
+
+class RollingMean(_StreamingIndicator):
+    """Fixed-window mean, matching Series.rolling(period).mean()."""
+
+    _fields = ('period', 'window', 'nobs', 'neg_ct', 'sum_x', 'comp_add', 'comp_remove',
+               'same_count', 'prev_value', 'value')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.nobs = 0
+        self.neg_ct = 0
+        self.sum_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = _NAN
+        self.value = _NAN
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if self.period == 1:
+            # pandas restarts the sum for every window of length one
+            self.__init__(1)
+        elif len(self.window) == self.period:
+            old = self.window.popleft()
+            if not _isnan(old):
+                self.nobs -= 1
+                y = -old - self.comp_remove
+                t = self.sum_x + y
+                self.comp_remove = t - self.sum_x - y
+                self.sum_x = t
+                if math.copysign(1.0, old) < 0:
+                    self.neg_ct -= 1
+
+        self.window.append(x)
+        if not _isnan(x):
+            self.nobs += 1
+            y = x - self.comp_add
+            t = self.sum_x + y
+            self.comp_add = t - self.sum_x - y
+            self.sum_x = t
+            if math.copysign(1.0, x) < 0:
+                self.neg_ct += 1
+            self.same_count = self.same_count + 1 if x == self.prev_value else 1
+            self.prev_value = x
+
+        if self.nobs >= self.period and self.nobs > 0:
+            result = self.sum_x / self.nobs
+            if self.same_count >= self.nobs:
+                result = self.prev_value
+            elif self.neg_ct == 0 and result < 0:
+                result = 0.0
+            elif self.neg_ct == self.nobs and result > 0:
+                result = 0.0
+        else:
+            result = _NAN
+        self.value = result
+        return result
+
+
+class EMA(_StreamingIndicator):
+    """Exponential moving average, matching Series.ewm(span, adjust=False).mean()."""
+
+    _fields = ('period', 'alpha', 'old_wt', 'value')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.alpha = 2.0 / (period + 1.0)
+        self.old_wt = 1.0
+        self.value = _NAN
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if _isnan(self.value):
+            self.value = x
+        else:
+            self.old_wt *= 1.0 - self.alpha
+            if not _isnan(x):
+                if self.value != x:
+                    self.value = (self.old_wt * self.value + self.alpha * x) / (self.old_wt + self.alpha)
+                self.old_wt = 1.0
+        return self.value
+
+
+class RSI(_StreamingIndicator):
+    """Simple-average RSI, matching indicators.calculate_rsi."""
+
+    _fields = ('prev_close', 'value')
+    _children = ('gain', 'loss')
+
+    def __init__(self, period: int = 14):
+        self.gain = RollingMean(period)
+        self.loss = RollingMean(period)
+        self.prev_close = _NAN
+        self.value = _NAN
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        delta = close - self.prev_close
+        self.prev_close = close
+        # where() turns the NaN first delta into a zero gain and loss
+        gain = self.gain.update(delta if delta > 0 else 0.0)
+        loss = self.loss.update(-delta if delta < 0 else -0.0)
+
+        rsi = 100 - (100 / (1 + gain / (loss if loss != 0 else _EPS)))
+        self.value = 50.0 if _isnan(rsi) else min(max(rsi, 0.0), 100.0)
+        return self.value
+
+
+class MACD(_StreamingIndicator):
+    """MACD line, signal line and histogram, matching indicators.calculate_macd."""
+
+    _fields = ('value',)
+    _children = ('fast', 'slow', 'signal')
+
+    def __init__(self, fast: int = 12, slow: int = 26, signal: int = 9):
+        self.fast = EMA(fast)
+        self.slow = EMA(slow)
+        self.signal = EMA(signal)
+        self.value = {'macd': _NAN, 'signal': _NAN, 'histogram': _NAN}
+
+    def update(self, close: float) -> Dict[str, float]:
+        macd_line = self.fast.update(close) - self.slow.update(close)
+        signal_line = self.signal.update(macd_line)
+        self.value = {'macd': macd_line, 'signal': signal_line, 'histogram': macd_line - signal_line}
+        return self.value
+
+
+class RollingStd(_StreamingIndicator):
+    """
+    Fixed-window sample standard deviation, matching Series.rolling(period).std().
+
+    Exact while every window holds at least two observations; a window that
+    falls to a single observation (period 2 around a NaN) can differ from
+    pandas in the last few bits.
+    """
+
+    _fields = ('period', 'window', 'nobs', 'mean_x', 'ssqdm_x', 'comp_add', 'comp_remove',
+               'same_count', 'prev_value', 'value')
+
+    def __init__(self, period: int):
+        self.period = period
+        self.window = deque()
+        self.nobs = 0
+        self.mean_x = 0.0
+        self.ssqdm_x = 0.0
+        self.comp_add = 0.0
+        self.comp_remove = 0.0
+        self.same_count = 0
+        self.prev_value = _NAN
+        self.value = _NAN
+
+    def update(self, x: float) -> float:
+        x = float(x)
+        if self.period == 1:
+            # pandas restarts the accumulators for every window of length one
+            self.__init__(1)
+        elif len(self.window) == self.period:
+            # Welford removal with Kahan-compensated mean, as in pandas' roll_var
+            old = self.window.popleft()
+            if not _isnan(old):
+                self.nobs -= 1
+                if self.nobs:
+                    prev_mean = self.mean_x - self.comp_remove
+                    y = old - self.comp_remove
+                    t = y - self.mean_x
+                    self.comp_remove = t + self.mean_x - y
+                    self.mean_x -= t / self.nobs
+                    self.ssqdm_x -= (old - prev_mean) * (old - self.mean_x)
+                else:
+                    self.mean_x = 0.0
+                    self.ssqdm_x = 0.0
+
+        self.window.append(x)
+        if not _isnan(x):
+            self.nobs += 1
+            self.same_count = self.same_count + 1 if x == self.prev_value else 1
+            self.prev_value = x
+            prev_mean = self.mean_x - self.comp_add
+            y = x - self.comp_add
+            t = y - self.mean_x
+            self.comp_add = t + self.mean_x - y
+            self.mean_x += t / self.nobs
+            self.ssqdm_x += (x - prev_mean) * (x - self.mean_x)
+
+        if self.nobs >= self.period and self.nobs > 1:
+            variance = 0.0 if self.same_count >= self.nobs else self.ssqdm_x / (self.nobs - 1)
+            result = math.sqrt(variance) if variance >= 0 else 0.0
+        else:
+            result = _NAN
+        self.value = result
+        return result
+
+
+class Bollinger(_StreamingIndicator):
+    """Upper, middle and lower Bollinger Bands, matching indicators.calculate_bollinger_bands."""
+
+    _fields = ('std_dev', 'value')
+    _children = ('mean', 'std')
+
+    def __init__(self, period: int = 20, std_dev: float = 2):
+        self.mean = RollingMean(period)
+        self.std = RollingStd(period)
+        self.std_dev = std_dev
+        self.value = {'upper': _NAN, 'middle': _NAN, 'lower': _NAN}
+
+    def update(self, close: float) -> Dict[str, float]:
+        sma = self.mean.update(close)
+        std = self.std.update(close)
+        self.value = {'upper': sma + std * self.std_dev, 'middle': sma, 'lower': sma - std * self.std_dev}
+        return self.value
+
+
+class RollingExtreme(_StreamingIndicator):
+    """Fixed-window max or min, matching Series.rolling(period).max() / .min()."""
+
+    _fields = ('period', 'highest', 'window', 'value')
+
+    def __init__(self, period: int, highest: bool = True):
+        self.period = period
+        self.highest = highest
+        self.window = deque()
+        self.value = _NAN
+
+    def update(self, x: float) -> float:
+        self.window.append(float(x))
+        if len(self.window) > self.period:
+            self.window.popleft()
+        if len(self.window) < self.period or any(_isnan(v) for v in self.window):
+            self.value = _NAN
+        else:
+            self.value = max(self.window) if self.highest else min(self.window)
+        return self.value
+
+
+class Lag(_StreamingIndicator):
+    """The value from `periods` bars ago, matching Series.shift(periods) for periods >= 0."""
+
+    _fields = ('periods', 'window', 'value')
+
+    def __init__(self, periods: int = 1):
+        if periods < 0:
+            raise ValueError(f"shift({periods}) looks ahead and cannot be streamed")
+        self.periods = periods
+        self.window = deque()
+        self.value = _NAN
+
+    def update(self, x: float) -> float:
+        self.window.append(float(x))
+        self.value = self.window.popleft() if len(self.window) > self.periods else _NAN
+        return self.value
+
+
+class ROC(_StreamingIndicator):
+    """Rate of change (%), matching indicators.calculate_roc."""
+
+    _fields = ('value',)
+    _children = ('lag',)
+
+    def __init__(self, period: int = 10):
+        self.lag = Lag(period)
+        self.value = _NAN
+
+    def update(self, close: float) -> float:
+        close = float(close)
+        shifted = self.lag.update(close)
+        self.value = ((close - shifted) / (shifted if shifted != 0 else _EPS)) * 100
+        return self.value
+
+
+def _true_range(high: float, low: float, prev_close: float) -> float:
+    # Largest of the three candidates, skipping NaN like DataFrame.max(axis=1)
+    candidates = [c for c in (high - low, abs(high - prev_close), abs(low - prev_close)) if not _isnan(c)]
+    return max(candidates) if candidates else _NAN
+
+
+class ATR(_StreamingIndicator):
+    """Average True Range, matching indicators.calculate_atr."""
+
+    _fields = ('prev_close', 'value')
+    _children = ('tr',)
+
+    def __init__(self, period: int = 14):
+        self.tr = RollingMean(period)
+        self.prev_close = _NAN
+        self.value = _NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        self.value = self.tr.update(_true_range(high, low, self.prev_close))
+        self.prev_close = close
+        return self.value
+
+
+class ADX(_StreamingIndicator):
+    """Average Directional Index, matching indicators.calculate_adx."""
+
+    _fields = ('prev_high', 'prev_low', 'prev_close', 'value')
+    _children = ('plus_dm', 'minus_dm', 'tr', 'dx')
+
+    def __init__(self, period: int = 14):
+        self.plus_dm = RollingMean(period)
+        self.minus_dm = RollingMean(period)
+        self.tr = RollingMean(period)
+        self.dx = RollingMean(period)
+        self.prev_high = self.prev_low = self.prev_close = _NAN
+        self.value = _NAN
+
+    def update(self, high: float, low: float, close: float) -> float:
+        high, low, close = float(high), float(low), float(close)
+        plus_dm = high - self.prev_high
+        minus_dm = low - self.prev_low
+        plus_dm = 0.0 if plus_dm < 0 else plus_dm
+        minus_dm = 0.0 if minus_dm > 0 else minus_dm
+
+        atr = self.tr.update(_true_range(high, low, self.prev_close))
+        self.prev_high, self.prev_low, self.prev_close = high, low, close
+
+        atr_safe = atr if atr != 0 else _EPS
+        plus_di = 100 * (self.plus_dm.update(plus_dm) / atr_safe)
+        minus_di = abs(100 * (self.minus_dm.update(minus_dm) / atr_safe))
+
+        di_sum = plus_di + minus_di
+        dx = (abs(plus_di - minus_di) / (di_sum if di_sum != 0 else _EPS)) * 100
+        adx = self.dx.update(dx)
+        self.value = 0.0 if _isnan(adx) else adx
+        return self.value
+
+
+_TYPES = {cls.__name__: cls for cls in (RollingMean, RollingStd, EMA, RSI, MACD, Bollinger,
+                                      RollingExtreme, Lag, ROC, ATR, ADX)}
+
+
+class StreamingMetrics(_StreamingIndicator):
+    """
+    The indicators calculate_all_metrics reads, kept current bar by bar:
+    RSI(14), MACD(12/26/9), SMA(20), EMA(50), ADX(14) and ATR(14).
+
+    The state before the last bar is kept as a checkpoint, so an intraday
+    refresh can replace today's partial bar (an update with the same date)
+    and rollback() can undo the last bar.
+    """
+
+    _fields = ('last_date', 'bars', 'checkpoint')
+    _children = ('rsi_14', 'macd', 'sma_20', 'ema_50', 'adx_14', 'atr_14')
+
+    def __init__(self):
+        self.rsi_14 = RSI(14)
+        self.macd = MACD()
+        self.sma_20 = RollingMean(20)
+        self.ema_50 = EMA(50)
+        self.adx_14 = ADX(14)
+        self.atr_14 = ATR(14)
+        self.last_date: Optional[str] = None
+        self.bars = 0
+        self.checkpoint: Optional[Dict[str, Any]] = None  # State before the last bar
+
+    @classmethod
+    def from_history(cls, df: pd.DataFrame) -> 'StreamingMetrics':
+        """Seed the state by replaying an OHLCV history."""
+        state = cls()
+        for date, high, low, close in zip(df.index, df['High'].to_numpy(), df['Low'].to_numpy(),
+                                          df['Close'].to_numpy()):
+            state._step(high, low, close, date)
+        return state
+
+    def update(self, bar: pd.Series) -> Dict[str, float]:
+        """
+        Advance by one new bar, or revise the last bar.
+
+        A bar dated like the last bar replaces it (e.g. a refreshed partial
+        intraday bar); a bar dated before it raises ValueError.
+
+        Args:
+            bar: Row with High, Low and Close; its name is the bar date
+
+        Returns:
+            Latest indicator values
+        """
+        if self.last_date is not None and bar.name is not None:
+            if str(bar.name) == self.last_date:
+                self.rollback()
+            elif str(bar.name) < self.last_date:
+                raise ValueError(f"Bar {bar.name} is not after the last bar {self.last_date}")
+        self.checkpoint = self._snapshot()
+        self._step(bar['High'], bar['Low'], bar['Close'], bar.name)
+        return self.values()
+
+    def rollback(self):
+        """Return to the state before the last bar (one bar deep)."""
+        if self.checkpoint is None:
+            raise ValueError("No bar to roll back")
+        state = self.checkpoint
+        for name in self._children:
+            setattr(self, name, _TYPES[state[name]['type']].from_dict(state[name]))
+        self.last_date, self.bars, self.checkpoint = state['last_date'], state['bars'], None
+
+    def _snapshot(self) -> Dict[str, Any]:
+        state = {name: getattr(self, name).to_dict() for name in self._children}
+        state['last_date'], state['bars'] = self.last_date, self.bars
+        return state
+
+    def _step(self, high: float, low: float, close: float, date=None):
+        self.rsi_14.update(close)
+        self.macd.update(close)
+        self.sma_20.update(close)
+        self.ema_50.update(close)
+        self.adx_14.update(high, low, close)
+        self.atr_14.update(high, low, close)
+        self.last_date = None if date is None else str(date)
+        self.bars += 1
+
+    def values(self) -> Dict[str, float]:
+        """Latest value of every indicator."""
+        macd = self.macd.value
+        return {
+            'rsi_14': self.rsi_14.value,
+            'macd': macd['macd'],
+            'macd_signal': macd['signal'],
+            'macd_histogram': macd['histogram'],
+            'sma_20': self.sma_20.value,
+            'ema_50': self.ema_50.value,
+            'adx_14': self.adx_14.value,
+            'atr_14': self.atr_14.value,
+        }
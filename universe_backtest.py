@@ -0,0 +1,232 @@
+"""
+UNIVERSE BACKTEST MODULE
+========================
+Runs strategies across many tickers (a sector, or the whole Nifty 500) on a
+pool of worker processes.
+
+Work is split into chunks of tickers. Each worker loads its chunk's history
+itself (through the on-disk OHLCV store for remote providers, so only new
+bars are downloaded), backtests every strategy, and sends
+back only a compact summary row per (ticker, strategy) plus the chunk's
+summed equity curves, so full frames and trade lists never cross process
+boundaries.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional, Sequence, Tuple
+
+import pandas as pd
+
+from analytics import equity_metrics
+from backtesting import COMPACT, BacktestEngine, CompactBacktestResult
+from data_providers import MarketDataProvider, get_provider
+from ohlcv_store import OHLCVStore, get_default_store
+
+DEFAULT_UNIVERSE_CHUNK = 25
+
+SUMMARY_COLUMNS = [
+    'ticker', 'strategy', 'final_capital', 'total_return_pct', 'annualized_return',
+    'total_trades', 'win_rate', 'max_drawdown_pct', 'sharpe_ratio', 'sortino_ratio',
+    'profit_factor', 'benchmark_return'
+]
+
+
+@dataclass
+class UniverseBacktestResult:
+    """Per-ticker summary table and equal-weight portfolio equity."""
+    summary: pd.DataFrame             # One row per (ticker, strategy), SUMMARY_COLUMNS
+    portfolio_equity: pd.DataFrame    # Dates x strategies, equal-weight portfolio value
+    initial_capital: float
+    failed: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+
+    def strategy_summary(self) -> pd.DataFrame:
+        """Aggregate statistics per strategy across the universe."""
+        if self.summary.empty:
+            return pd.DataFrame()
+        grouped = self.summary.groupby('strategy', sort=False)
+        table = pd.DataFrame({
+            'tickers': grouped['ticker'].count(),
+            'median_return_pct': grouped['total_return_pct'].median(),
+            'pct_profitable': grouped['total_return_pct'].apply(lambda r: (r > 0).mean() * 100),
+            'avg_sharpe': grouped['sharpe_ratio'].mean(),
+            'avg_trades': grouped['total_trades'].mean(),
+        })
+
+        equity = self.portfolio_equity
+        portfolio = equity_metrics(equity)
+        table['portfolio_return_pct'] = (equity.iloc[-1] / self.initial_capital - 1) * 100
+        table['portfolio_max_drawdown_pct'] = portfolio['max_drawdown_pct']
+        table['portfolio_sharpe'] = portfolio['sharpe_ratio']
+        return table.round(2)
+
+
+def _summary_row(result: CompactBacktestResult) -> Tuple:
+    return (
+        result.ticker, result.strategy_name, float(result.final_capital),
+        float(result.total_return_pct), float(result.annualized_return), int(result.total_trades),
+        float(result.win_rate), float(result.max_drawdown_pct), float(result.sharpe_ratio),
+        float(result.sortino_ratio), float(result.profit_factor), float(result.benchmark_return)
+    )
+
+
+def _sum_curves(curves: List[pd.Series]) -> pd.Series:
+    """Sum of growth-of-1 curves; a ticker counts as 1.0 (cash) before its first bar."""
+    panel = pd.concat(curves, axis=1).ffill().fillna(1.0)
+    return panel.sum(axis=1)
+
+
+def _worker_state(provider: MarketDataProvider, store_root: Optional[str], initial_capital: float,
+                  commission: float) -> Dict[str, object]:
+    return {
+        'provider': provider,
+        # Each process opens the store itself; its files are replaced atomically
+        'store': OHLCVStore(store_root) if store_root is not None else None,
+        'engine': BacktestEngine(initial_capital=initial_capital, commission=commission),
+    }
+
+
+# Per-process state set by the pool initializer (in-process runs pass their own state instead,
+# so concurrent universe backtests in one process never share it)
+_worker: Dict[str, object] = {}
+
+
+def _init_worker(*args):
+    _worker.update(_worker_state(*args))
+
+
+def _run_chunk_in_worker(tickers: List[str], strategies: List[str], period: str):
+    return _run_chunk(_worker, tickers, strategies, period)
+
+
+def _run_chunk(state: Dict[str, object], tickers: List[str], strategies: List[str], period: str):
+    """
+    Backtest every strategy on one chunk of tickers.
+
+    Returns:
+        (summary rows, {strategy: (summed equity, ticker count)}, failed tickers)
+    """
+    provider = state['provider']
+    store = state['store']
+    engine = state['engine']
+
+    if store is not None:
+        frames = store.refresh(tickers, period, provider)
+    else:
+        frames = provider.download(tickers, period=period)
+    failed = [ticker for ticker in tickers if ticker not in frames or len(frames[ticker]) < 2]
+
+    rows = []
+    curves: Dict[str, List[pd.Series]] = {strategy: [] for strategy in strategies}
+    for ticker, df in frames.items():
+        if ticker in failed:
+            continue
+        try:
+            results = engine.compare_strategies(df, strategies, ticker, detail=COMPACT)
+        except Exception as e:
+            print(f"Universe backtest failed for {ticker}: {str(e)}")
+            failed.append(ticker)
+            continue
+        for result in results:
+            rows.append(_summary_row(result))
+            curves[result.strategy_name].append(result.equity_curve / engine.initial_capital)
+
+    equity = {strategy: (_sum_curves(c), len(c)) for strategy, c in curves.items() if c}
+    return rows, equity, failed
+
+
+def _combine_equity(parts: List[Dict[str, Tuple[pd.Series, int]]], strategies: Sequence[str],
+                    initial_capital: float) -> pd.DataFrame:
+    """Merge per-chunk equity sums into one equal-weight portfolio per strategy."""
+    portfolio = {}
+    for strategy in strategies:
+        sums = [part[strategy] for part in parts if strategy in part]
+        if not sums:
+            continue
+        counts = [count for _, count in sums]
+        panel = pd.concat([curve for curve, _ in sums], axis=1, ignore_index=True).ffill()
+        # Before a chunk's first bar all of its tickers are still in cash
+        panel = panel.fillna(pd.Series(counts, index=panel.columns))
+        portfolio[strategy] = panel.sum(axis=1) / sum(counts) * initial_capital
+    return pd.DataFrame(portfolio)
+
+
+def run_universe_backtest(tickers: Sequence[str], strategies: Sequence[str], period: str = "5y",
+                          initial_capital: float = 100000, commission: float = 0.001,
+                          provider: Optional[MarketDataProvider] = None,
+                          store: Optional[OHLCVStore] = None,
+                          workers: Optional[int] = None,
+                          chunk_size: int = DEFAULT_UNIVERSE_CHUNK,
+                          progress_callback: Optional[Callable[[int, int], None]] = None
+                          ) -> UniverseBacktestResult:
+    """
+    Backtest strategies across a list of tickers on worker processes.
+
+    Args:
+        tickers: Ticker symbols (e.g. get_stocks_by_sector("IT"))
+        strategies: Strategy names from AVAILABLE_STRATEGIES
+        period: History to backtest over
+        initial_capital: Capital per ticker, and of the equal-weight portfolio
+        commission: Commission per trade
+        provider: Market data provider (must be picklable); defaults to get_provider()
+        store: OHLCV store the workers read and extend; defaults to the
+            process-wide store for remote providers, none for local ones
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+        chunk_size: Tickers per task
+        progress_callback: Called as (tickers done, total) after each chunk
+
+    Returns:
+        UniverseBacktestResult with the summary table and portfolio equity
+    """
+    started = time.perf_counter()
+    provider = provider if provider is not None else get_provider()
+    if store is None and provider.remote:
+        store = get_default_store()
+    tickers = list(dict.fromkeys(tickers))
+    strategies = list(strategies)
+    chunks = [tickers[i:i + chunk_size] for i in range(0, len(tickers), chunk_size)]
+    workers = min(workers or os.cpu_count() or 1, max(len(chunks), 1))
+
+    rows, parts, failed = [], [], []
+    done = 0
+
+    def collect(chunk: List[str], outcome):
+        nonlocal done
+        chunk_rows, equity, chunk_failed = outcome
+        rows.extend(chunk_rows)
+        parts.append(equity)
+        failed.extend(chunk_failed)
+        done += len(chunk)
+        if progress_callback:
+            progress_callback(done, len(tickers))
+
+    init_args = (provider, store.root if store is not None else None, initial_capital, commission)
+    if workers <= 1:
+        state = _worker_state(*init_args)
+        for chunk in chunks:
+            collect(chunk, _run_chunk(state, chunk, strategies, period))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            futures = {pool.submit(_run_chunk_in_worker, chunk, strategies, period): chunk for chunk in chunks}
+            for future in as_completed(futures):
+                chunk = futures[future]
+                try:
+                    collect(chunk, future.result())
+                except Exception as e:
+                    print(f"Universe backtest chunk failed: {str(e)}")
+                    collect(chunk, ([], {}, chunk))
+
+    summary = pd.DataFrame(rows, columns=SUMMARY_COLUMNS)
+    order = {ticker: i for i, ticker in enumerate(tickers)}
+    summary = summary.sort_values('ticker', key=lambda col: col.map(order), kind='stable').reset_index(drop=True)
+
+    return UniverseBacktestResult(
+        summary=summary,
+        portfolio_equity=_combine_equity(parts, strategies, initial_capital),
+        initial_capital=initial_capital,
+        failed=failed,
+        elapsed=time.perf_counter() - started
+    )
@@ -0,0 +1,206 @@
+"""
+WALK-FORWARD MODULE
+===================
+Rolling walk-forward optimization and out-of-sample evaluation.
+
+The history is cut into folds: parameters are optimized on a training
+window, then traded unchanged on the window that follows, and the
+out-of-sample pieces are stitched into one equity curve.
+
+Indicators are computed once over the full history and every fold slices
+them, so overlapping training windows never recompute an SMA or EMA (it
+also means each window starts with fully warmed-up indicators). Folds are
+independent and run concurrently on a process pool.
+"""
+
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from backtesting import COMPACT, BacktestEngine, CompactBacktestResult, STRATEGY_TEMPLATES
+from indicator_cache import IndicatorCache
+from optimizer import expand_grid
+
+DEFAULT_TRAIN_BARS = 504   # ~2 years of daily bars
+DEFAULT_TEST_BARS = 126    # ~6 months
+
+
+@dataclass
+class WalkForwardResult:
+    """Per-fold choices and the stitched out-of-sample equity."""
+    template: str
+    ticker: str
+    folds: pd.DataFrame           # One row per fold: windows, chosen params, IS/OOS metrics
+    oos_equity: pd.Series         # Stitched out-of-sample equity curve
+    initial_capital: float
+    rank_by: str
+    elapsed: float = 0.0
+
+    @property
+    def oos_return_pct(self) -> float:
+        """Compounded out-of-sample return across all folds."""
+        if self.folds.empty:
+            return 0.0
+        return round((np.prod(1 + self.folds['oos_return_pct'] / 100) - 1) * 100, 2)
+
+    @property
+    def efficiency(self) -> float:
+        """Mean OOS annualized return over mean in-sample annualized return."""
+        if self.folds.empty:
+            return 0.0
+        in_sample = self.folds['is_annualized_return'].mean()
+        return round(self.folds['oos_annualized_return'].mean() / in_sample, 2) if in_sample else 0.0
+
+
+def make_folds(n_bars: int, train_bars: int = DEFAULT_TRAIN_BARS, test_bars: int = DEFAULT_TEST_BARS,
+               step: Optional[int] = None, anchored: bool = False) -> List[Tuple[int, int, int, int]]:
+    """
+    Fold boundaries as (train_start, train_end, test_start, test_end) bar positions.
+
+    Windows are half-open; each test window immediately follows its training
+    window. The last test window may be shorter than test_bars.
+    """
+    step = step or test_bars
+    folds = []
+    start = 0
+    while start + train_bars + 2 <= n_bars:
+        train_end = start + train_bars
+        test_end = min(train_end + test_bars, n_bars)
+        folds.append((0 if anchored else start, train_end, train_end, test_end))
+        start += step
+    return folds
+
+
+def _worker_state(engine: BacktestEngine, indicators: IndicatorCache, template: str,
+                  points: List[Dict[str, Any]], rank_by: str, ticker: str) -> Dict[str, Any]:
+    return {'engine': engine, 'indicators': indicators, 'template': template, 'points': points,
+            'rank_by': rank_by, 'ticker': ticker, 'signals': {}}
+
+
+# Per-process state set by the pool initializer (in-process runs pass their own state instead,
+# so concurrent walk-forwards in one process never share it)
+_worker: Dict[str, Any] = {}
+
+
+def _init_worker(*args):
+    _worker.update(_worker_state(*args))
+
+
+def _run_fold_in_worker(bounds: Tuple[int, int, int, int]) -> Dict[str, Any]:
+    return _run_fold(_worker, bounds)
+
+
+def _signal(state: Dict[str, Any], index: int) -> np.ndarray:
+    """Full-history signal of grid point index; the whole grid is evaluated once per state."""
+    if not state['signals']:
+        spec = STRATEGY_TEMPLATES[state['template']]
+        state['signals'] = dict(enumerate(spec.signals(state['indicators'], state['points'])))
+    return state['signals'][index]
+
+
+def _backtest_window(state: Dict[str, Any], index: int, start: int, end: int) -> CompactBacktestResult:
+    df = state['indicators'].df
+    return state['engine'].run_signals(df.iloc[start:end], _signal(state, index)[start:end],
+                                       state['template'], state['ticker'], detail=COMPACT)
+
+
+def _run_fold(state: Dict[str, Any], bounds: Tuple[int, int, int, int]) -> Dict[str, Any]:
+    """Optimize on the training window, then trade the winner on the test window."""
+    train_start, train_end, test_start, test_end = bounds
+    rank_by = state['rank_by']
+
+    # Every grid point on the training window, scored as one batch
+    df = state['indicators'].df
+    signals = [_signal(state, index)[train_start:train_end] for index in range(len(state['points']))]
+    results = state['engine'].run_signal_batch(df.iloc[train_start:train_end], signals,
+                                               state['template'], state['ticker'])
+
+    best_index, best_result = None, None
+    for index, result in enumerate(results):
+        if best_result is None or getattr(result, rank_by) > getattr(best_result, rank_by):
+            best_index, best_result = index, result
+
+    oos = _backtest_window(state, best_index, test_start, test_end)
+    row = {
+        'train_start': df.index[train_start], 'train_end': df.index[train_end - 1],
+        'test_start': df.index[test_start], 'test_end': df.index[test_end - 1],
+    }
+    row.update(state['points'][best_index])
+    row.update({
+        f'is_{rank_by}': getattr(best_result, rank_by),
+        'is_annualized_return': best_result.annualized_return,
+        'oos_return_pct': oos.total_return_pct,
+        'oos_annualized_return': oos.annualized_return,
+        'oos_sharpe_ratio': oos.sharpe_ratio,
+        'oos_max_drawdown_pct': oos.max_drawdown_pct,
+        'oos_trades': oos.total_trades,
+    })
+    return {'row': row, 'equity': oos.equity_curve, 'final_capital': oos.final_capital}
+
+
+def walk_forward(df: pd.DataFrame, template: str, grid: Optional[Dict[str, Iterable[Any]]] = None,
+                 ticker: str = "UNKNOWN", engine: Optional[BacktestEngine] = None,
+                 train_bars: int = DEFAULT_TRAIN_BARS, test_bars: int = DEFAULT_TEST_BARS,
+                 step: Optional[int] = None, anchored: bool = False,
+                 rank_by: str = 'sharpe_ratio', workers: Optional[int] = None) -> WalkForwardResult:
+    """
+    Walk-forward optimize a strategy template.
+
+    Args:
+        df: DataFrame with OHLCV data
+        template: Key of STRATEGY_TEMPLATES (e.g. "SMA Crossover")
+        grid: Parameter name -> values (defaults to the template's default grid)
+        ticker: Stock ticker symbol
+        engine: BacktestEngine to use (capital/commission)
+        train_bars: Bars per optimization window
+        test_bars: Bars per out-of-sample window
+        step: Bars between fold starts (default: test_bars)
+        anchored: Grow the training window from the first bar instead of rolling it
+        rank_by: BacktestResult metric maximized on each training window
+        workers: Worker processes (default: CPU count; 1 runs in-process)
+
+    Returns:
+        WalkForwardResult with the fold table and stitched OOS equity
+    """
+    started = time.perf_counter()
+    spec = STRATEGY_TEMPLATES[template]
+    engine = engine or BacktestEngine()
+    points = expand_grid(template, grid if grid is not None else spec.default_grid)
+    folds = make_folds(len(df), train_bars, test_bars, step, anchored)
+
+    # Full-history indicators, sliced by every fold
+    indicators = IndicatorCache(df)
+    for key in spec.indicators(points):
+        indicators.get(*key)
+
+    workers = min(workers or os.cpu_count() or 1, max(len(folds), 1))
+    init_args = (engine, indicators, template, points, rank_by, ticker)
+    if workers <= 1:
+        state = _worker_state(*init_args)
+        outcomes = [_run_fold(state, bounds) for bounds in folds]
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=init_args) as pool:
+            outcomes = list(pool.map(_run_fold_in_worker, folds))
+
+    # Chain each fold's OOS equity onto the capital the previous fold ended with
+    pieces = []
+    capital = engine.initial_capital
+    for outcome in outcomes:
+        pieces.append(outcome['equity'] / engine.initial_capital * capital)
+        capital *= outcome['final_capital'] / engine.initial_capital
+    oos_equity = pd.concat(pieces) if pieces else pd.Series(dtype=float)
+
+    return WalkForwardResult(
+        template=template,
+        ticker=ticker,
+        folds=pd.DataFrame([outcome['row'] for outcome in outcomes]),
+        oos_equity=oos_equity,
+        initial_capital=engine.initial_capital,
+        rank_by=rank_by,
+        elapsed=time.perf_counter() - started
+    )